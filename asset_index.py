@@ -0,0 +1,362 @@
+# asset_index.py
+"""
+In-memory index of the frontend's static files.
+
+Every servable asset is read once at startup and kept in memory together with
+its gzip (and, when the ``brotli`` package is installed, brotli) variants and a
+content hash used as its ETag. A watcher thread keeps the index current:
+inotify on Linux, mtime polling elsewhere. Only the files that changed are
+re-read and re-compressed.
+"""
+
+import os
+import gzip
+import errno
+import ctypes
+import ctypes.util
+import select
+import struct
+import hashlib
+import mimetypes
+import threading
+from typing import Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Only these file types are ever served; anything else in the tree (Python sources,
+# credentials, tokens, recordings) stays private.
+SERVED_EXTENSIONS = {
+    '.html', '.css', '.js', '.ico', '.png', '.jpg', '.jpeg', '.gif', '.svg',
+    '.webp', '.woff', '.woff2', '.pdf', '.map',
+}
+COMPRESSIBLE_TYPES = {'application/javascript', 'text/javascript', 'image/svg+xml', 'application/json'}
+SKIP_DIRS = {'.git', '__pycache__', 'node_modules', 'venv', '.venv', 'recordings', 'reports'}
+
+# Files larger than this stay on disk and are streamed with sendfile instead.
+MAX_INDEXED_BYTES = int(os.getenv('FRONTEND_MAX_INDEXED_BYTES', str(4 * 1024 * 1024)))
+MIN_COMPRESS_BYTES = 256
+
+
+class Asset:
+    """A single static file plus its precompressed variants"""
+
+    __slots__ = ('path', 'full_path', 'content_type', 'mtime', 'size', 'digest', 'variants')
+
+    def __init__(self, path, full_path, content_type, mtime, size, digest, variants):
+        self.path = path
+        self.full_path = full_path
+        self.content_type = content_type
+        self.mtime = mtime
+        self.size = size
+        self.digest = digest
+        # encoding -> bytes; 'identity' is None for assets left on disk
+        self.variants = variants
+
+    @property
+    def in_memory(self):
+        return self.variants.get('identity') is not None
+
+    def etag(self, encoding='identity'):
+        suffix = '' if encoding == 'identity' else f'-{encoding}'
+        return f'"{self.digest}{suffix}"'
+
+    def etags(self):
+        return [self.etag(encoding) for encoding in self.variants]
+
+
+def _is_compressible(content_type):
+    return content_type.startswith('text/') or content_type in COMPRESSIBLE_TYPES
+
+
+def load_asset(root, rel_path):
+    """Read and precompress one file; returns None if it is not servable"""
+    if os.path.splitext(rel_path)[1].lower() not in SERVED_EXTENSIONS:
+        return None
+
+    full_path = os.path.join(root, rel_path)
+    try:
+        stat_result = os.stat(full_path)
+    except OSError:
+        return None
+    if not os.path.isfile(full_path):
+        return None
+
+    content_type = mimetypes.guess_type(rel_path)[0] or 'application/octet-stream'
+
+    if stat_result.st_size > MAX_INDEXED_BYTES:
+        digest = f'{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}'
+        return Asset(rel_path, full_path, content_type, stat_result.st_mtime,
+                     stat_result.st_size, digest, {'identity': None})
+
+    try:
+        with open(full_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    variants = {'identity': data}
+    if _is_compressible(content_type) and len(data) >= MIN_COMPRESS_BYTES:
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(gz) < len(data):
+            variants['gzip'] = gz
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            if len(br) < len(data):
+                variants['br'] = br
+
+    digest = hashlib.sha256(data).hexdigest()[:20]
+    return Asset(rel_path, full_path, content_type, stat_result.st_mtime, len(data), digest, variants)
+
+
+def choose_encoding(accept_encoding, available):
+    """Pick the best available content-coding for an Accept-Encoding header"""
+    if not accept_encoding:
+        return 'identity'
+
+    weights = {}
+    for part in accept_encoding.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    best, best_q = 'identity', 0.0
+    for encoding in ('br', 'gzip'):
+        if encoding not in available:
+            continue
+        q = weights.get(encoding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class AssetIndex:
+    """Path -> Asset map for a static tree"""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self._assets: Dict[str, Asset] = {}
+        self._lock = threading.Lock()
+
+    def build(self):
+        """Index every servable file under the root"""
+        assets = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.')]
+            for filename in filenames:
+                rel_path = os.path.relpath(os.path.join(dirpath, filename), self.root).replace(os.sep, '/')
+                asset = load_asset(self.root, rel_path)
+                if asset is not None:
+                    assets[rel_path] = asset
+        with self._lock:
+            self._assets = assets
+        return self
+
+    def get(self, path) -> Optional[Asset]:
+        return self._assets.get(path)
+
+    def refresh(self, rel_path):
+        """Re-read a single file (or drop it if it has gone away)"""
+        asset = load_asset(self.root, rel_path)
+        with self._lock:
+            if asset is None:
+                self._assets.pop(rel_path, None)
+            else:
+                self._assets[rel_path] = asset
+        return asset
+
+    def refresh_tree(self, rel_dir):
+        """Index a newly created (or moved-in) directory"""
+        base = os.path.join(self.root, rel_dir)
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.')]
+            for filename in filenames:
+                self.refresh(os.path.relpath(os.path.join(dirpath, filename), self.root).replace(os.sep, '/'))
+
+    def remove_tree(self, rel_dir):
+        prefix = rel_dir.rstrip('/') + '/'
+        with self._lock:
+            for key in [k for k in self._assets if k.startswith(prefix)]:
+                del self._assets[key]
+
+    def paths(self) -> List[str]:
+        return sorted(self._assets)
+
+
+# inotify constants from <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Keeps an AssetIndex current using Linux inotify (via libc, no extra packages)"""
+
+    def __init__(self, index: AssetIndex):
+        self.index = index
+        self._stop = threading.Event()
+        self._thread = None
+        self._watches: Dict[int, str] = {}
+
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def _add_watch(self, rel_dir):
+        path = os.path.join(self.index.root, rel_dir) if rel_dir else self.index.root
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = rel_dir
+
+    def _add_tree(self, rel_dir):
+        base = os.path.join(self.index.root, rel_dir) if rel_dir else self.index.root
+        for dirpath, dirnames, _ in os.walk(base):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.')]
+            rel = os.path.relpath(dirpath, self.index.root)
+            self._add_watch('' if rel == '.' else rel.replace(os.sep, '/'))
+
+    def start(self):
+        self._add_tree('')
+        self._thread = threading.Thread(target=self._run, name='asset-index-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([self._fd], [], [], 0.5)
+            except (OSError, ValueError):
+                return
+            if not ready:
+                continue
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except OSError as e:
+                if e.errno == errno.EAGAIN:
+                    continue
+                return
+            self._handle(buf)
+
+    def _handle(self, buf):
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(buf):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(buf, offset)
+            offset += EVENT_HEADER.size
+            name = buf[offset:offset + length].split(b'\0', 1)[0].decode(errors='surrogateescape')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Directories created while events were being dropped have no watch yet.
+                # Re-adding an existing watch returns the same descriptor, so re-walk everything,
+                # then rebuild so nothing changed in between is missed.
+                self._add_tree('')
+                self.index.build()
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            rel_dir = self._watches.get(wd)
+            if rel_dir is None or not name:
+                continue
+            rel_path = f'{rel_dir}/{name}' if rel_dir else name
+
+            if mask & IN_ISDIR:
+                if name in SKIP_DIRS or name.startswith('.'):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(rel_path)
+                    self.index.refresh_tree(rel_path)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self.index.remove_tree(rel_path)
+                continue
+
+            # IN_CREATE alone is followed by IN_CLOSE_WRITE once the writer finishes
+            if mask & (IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE):
+                self.index.refresh(rel_path)
+
+
+class PollingWatcher:
+    """Portable fallback that re-indexes files whose mtime or size changed"""
+
+    def __init__(self, index: AssetIndex, interval: float = 2.0):
+        self.index = index
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='asset-index-poller', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            seen = set()
+            for dirpath, dirnames, filenames in os.walk(self.index.root):
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.')]
+                for filename in filenames:
+                    rel_path = os.path.relpath(os.path.join(dirpath, filename), self.index.root).replace(os.sep, '/')
+                    if os.path.splitext(filename)[1].lower() not in SERVED_EXTENSIONS:
+                        continue
+                    seen.add(rel_path)
+                    asset = self.index.get(rel_path)
+                    try:
+                        stat_result = os.stat(os.path.join(dirpath, filename))
+                    except OSError:
+                        continue
+                    if asset is None or asset.mtime != stat_result.st_mtime or asset.size != stat_result.st_size:
+                        self.index.refresh(rel_path)
+            for rel_path in set(self.index.paths()) - seen:
+                self.index.refresh(rel_path)
+
+
+def start_watcher(index: AssetIndex):
+    """Start the best available watcher for this platform"""
+    if hasattr(ctypes, 'CDLL') and os.name == 'posix' and os.uname().sysname == 'Linux':
+        try:
+            return InotifyWatcher(index).start()
+        except (OSError, AttributeError) as e:
+            print(f"⚠️ inotify unavailable ({e}); falling back to polling")
+    return PollingWatcher(index).start()
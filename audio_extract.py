@@ -0,0 +1,259 @@
+# audio_extract.py
+"""
+Audio extraction from recordings straight into NumPy buffers.
+
+ffmpeg decodes (or, when the source is already suitable PCM, stream-copies)
+the audio track and writes raw little-endian 16-bit PCM to a pipe. The pipe
+is read with ``readinto`` through a memoryview directly into a preallocated
+array, so there are no intermediate WAV files, no sleeps, and no extra copies.
+``iter_pcm_chunks`` reuses one fixed-size buffer so memory stays bounded no
+matter how long the meeting was.
+"""
+
+import json
+import shutil
+import subprocess
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2
+
+# Containers ffmpeg can write a stream-copied audio track into, keyed by codec
+DEMUX_FORMATS = {
+    "aac": "adts",
+    "mp3": "mp3",
+    "opus": "ogg",
+    "vorbis": "ogg",
+    "flac": "flac",
+    "pcm_s16le": "wav",
+}
+
+
+class AudioExtractionError(Exception):
+    """Raised when ffmpeg/ffprobe fail or the input has no audio."""
+
+
+def _ffmpeg() -> str:
+    return shutil.which("ffmpeg") or "ffmpeg"
+
+
+def _ffprobe() -> str:
+    return shutil.which("ffprobe") or "ffprobe"
+
+
+def probe_audio(path: str) -> Dict[str, Any]:
+    """Codec, sample rate, channels and duration of the first audio stream."""
+    cmd = [
+        _ffprobe(), "-v", "error",
+        "-select_streams", "a:0",
+        "-show_entries", "stream=codec_name,sample_rate,channels,bit_rate:format=duration,bit_rate",
+        "-of", "json", path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise AudioExtractionError(f"ffprobe failed for {path}: {result.stderr.strip()}")
+    info = json.loads(result.stdout or "{}")
+    streams = info.get("streams") or []
+    if not streams:
+        raise AudioExtractionError(f"No audio stream in {path}")
+    stream = streams[0]
+    fmt = info.get("format") or {}
+    return {
+        "codec": stream.get("codec_name"),
+        "sample_rate": int(stream.get("sample_rate") or 0),
+        "channels": int(stream.get("channels") or 0),
+        "bit_rate": int(stream.get("bit_rate") or fmt.get("bit_rate") or 0),
+        "duration": float(fmt.get("duration") or 0.0),
+    }
+
+
+def can_stream_copy(info: Dict[str, Any], sample_rate: int = SAMPLE_RATE, channels: int = 1) -> bool:
+    """True when the source is already the PCM layout we want, so no decode/resample is needed."""
+    return (
+        info.get("codec") == "pcm_s16le"
+        and info.get("sample_rate") == sample_rate
+        and info.get("channels") == channels
+    )
+
+
+def pcm_command(
+    path: str,
+    sample_rate: int = SAMPLE_RATE,
+    channels: int = 1,
+    stream_copy: bool = False,
+    start: Optional[float] = None,
+    duration: Optional[float] = None,
+) -> list:
+    cmd = [_ffmpeg(), "-nostdin", "-v", "error"]
+    if start:
+        cmd += ["-ss", f"{start:.3f}"]
+    cmd += ["-i", path, "-vn", "-sn", "-dn"]
+    if duration:
+        cmd += ["-t", f"{duration:.3f}"]
+    if stream_copy:
+        cmd += ["-c:a", "copy"]
+    else:
+        cmd += ["-c:a", "pcm_s16le", "-ac", str(channels), "-ar", str(sample_rate)]
+    cmd += ["-f", "s16le", "pipe:1"]
+    return cmd
+
+
+def _open_pipe(cmd: list) -> subprocess.Popen:
+    # bufsize=0 gives a raw FileIO, so readinto() is a read(2) straight into our buffer
+    try:
+        return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+    except FileNotFoundError as exc:
+        raise AudioExtractionError(f"{cmd[0]} not found; install ffmpeg") from exc
+
+
+def _finish(proc: subprocess.Popen) -> None:
+    proc.stdout.close()
+    stderr = proc.stderr.read().decode(errors="replace")
+    proc.stderr.close()
+    if proc.wait() != 0:
+        raise AudioExtractionError(f"ffmpeg exited with {proc.returncode}: {stderr.strip()}")
+
+
+def _fill(stream, view: memoryview) -> int:
+    """readinto() until ``view`` is full or EOF; returns bytes read."""
+    filled = 0
+    total = len(view)
+    while filled < total:
+        n = stream.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    return filled
+
+
+def read_pcm_command(cmd: list, expected_samples: int = 0, channels: int = 1) -> np.ndarray:
+    """Run ``cmd`` and read its s16le stdout into a preallocated int16 array."""
+    capacity = max(int(expected_samples * 1.02) + 4096, 4096) * channels
+    buf = np.empty(capacity, dtype="<i2")
+    used = 0
+
+    proc = _open_pipe(cmd)
+    try:
+        while True:
+            view = memoryview(buf).cast("B")
+            n = _fill(proc.stdout, view[used:])
+            used += n
+            if used < len(view):
+                break
+            # Duration estimate was short; grow geometrically and keep reading after the data
+            buf = np.resize(buf, len(buf) * 2)
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        raise
+    _finish(proc)
+
+    samples = used // BYTES_PER_SAMPLE
+    samples -= samples % channels
+    out = buf[:samples]
+    return out.reshape(-1, channels) if channels > 1 else out
+
+
+def read_pcm(
+    path: str,
+    sample_rate: int = SAMPLE_RATE,
+    channels: int = 1,
+    start: Optional[float] = None,
+    duration: Optional[float] = None,
+) -> np.ndarray:
+    """Decode a recording's audio into an int16 array (shape (n,) or (n, channels))."""
+    info = probe_audio(path)
+    length = duration or max(info["duration"] - (start or 0.0), 0.0)
+    cmd = pcm_command(
+        path, sample_rate, channels,
+        stream_copy=can_stream_copy(info, sample_rate, channels),
+        start=start, duration=duration,
+    )
+    return read_pcm_command(cmd, int(length * sample_rate), channels)
+
+
+def iter_pcm_chunks(
+    path: str,
+    chunk_seconds: float = 30.0,
+    sample_rate: int = SAMPLE_RATE,
+    channels: int = 1,
+    copy: bool = False,
+) -> Iterator[Tuple[float, np.ndarray]]:
+    """Yield ``(start_seconds, samples)`` chunks from one ffmpeg process.
+
+    A single buffer of ``chunk_seconds`` is reused for every chunk, so memory is
+    bounded regardless of recording length. The yielded array is only valid
+    until the next iteration unless ``copy=True``.
+    """
+    try:
+        info = probe_audio(path)
+        stream_copy = can_stream_copy(info, sample_rate, channels)
+    except AudioExtractionError:
+        stream_copy = False
+    cmd = pcm_command(path, sample_rate, channels, stream_copy=stream_copy)
+
+    frame = channels
+    buf = np.empty(int(chunk_seconds * sample_rate) * frame, dtype="<i2")
+    view = memoryview(buf).cast("B")
+    carry = 0  # odd trailing byte from a short read, kept at the buffer start
+    position = 0
+
+    proc = _open_pipe(cmd)
+    try:
+        while True:
+            filled = carry + _fill(proc.stdout, view[carry:])
+            if filled == 0:
+                break
+            samples = filled // (BYTES_PER_SAMPLE * frame)
+            usable = samples * BYTES_PER_SAMPLE * frame
+            if samples:
+                chunk = buf[:samples * frame]
+                chunk = chunk.reshape(-1, channels) if channels > 1 else chunk
+                yield position / sample_rate, (chunk.copy() if copy else chunk)
+                position += samples
+            carry = filled - usable
+            if carry:
+                view[:carry] = view[usable:filled]
+            if filled < len(view):
+                break
+    except BaseException:
+        # Includes GeneratorExit when the consumer stops early
+        proc.kill()
+        proc.wait()
+        raise
+    _finish(proc)
+
+
+def demux_audio(path: str) -> Tuple[bytearray, str]:
+    """Stream-copy the audio track (no re-encode) into memory.
+
+    Returns ``(data, container)``, e.g. ADTS for AAC recordings from FFmpegRecorder.
+    """
+    info = probe_audio(path)
+    container = DEMUX_FORMATS.get(info["codec"])
+    if container is None:
+        raise AudioExtractionError(f"Cannot stream-copy {info['codec']!r} audio; decode with read_pcm instead")
+
+    cmd = [_ffmpeg(), "-nostdin", "-v", "error", "-i", path, "-vn", "-sn", "-dn",
+           "-c:a", "copy", "-f", container, "pipe:1"]
+    estimate = int(info["bit_rate"] / 8 * info["duration"]) if info["bit_rate"] else 0
+    buf = bytearray(max(int(estimate * 1.05), 64 * 1024))
+    used = 0
+
+    proc = _open_pipe(cmd)
+    try:
+        while True:
+            n = _fill(proc.stdout, memoryview(buf)[used:])
+            used += n
+            if used < len(buf):
+                break
+            buf.extend(bytes(len(buf)))
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        raise
+    _finish(proc)
+    del buf[used:]
+    return buf, container
@@ -11,11 +11,12 @@ import smtplib
 from datetime import datetime, timedelta
 from email.message import EmailMessage
 from typing import List, Dict, Any, Optional
+from collections import OrderedDict
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, Response, Request
+from fastapi import FastAPI, HTTPException, Response, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, HTMLResponse
+from fastapi.responses import RedirectResponse, HTMLResponse, StreamingResponse
 from pydantic import BaseModel
 
 from google.auth.transport.requests import Request as GoogleRequest
@@ -29,7 +30,9 @@ import time
 import json
 import shutil
 import asyncio
+import functools
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, Dict, Any
 from pathlib import Path
@@ -61,6 +64,29 @@ if str(BACKEND_ROOT) not in sys.path:
     sys.path.insert(0, str(BACKEND_ROOT))
 
 from recorder import FFmpegRecorder  # noqa: E402
+from report_renderer import ReportRenderer  # noqa: E402
+from session_events import SessionEventBus  # noqa: E402
+from transcoder import ArchiveTranscoder  # noqa: E402
+from browser_capture import BROWSER_CAPTURE_CHROME_ARGS, BrowserRecorder, recorder_for  # noqa: E402
+from participant_audio import AUDIO_TAP_HOOK_SCRIPT, ParticipantAudioSink, sink_for  # noqa: E402
+from meeting_supervisor import REASON_REQUESTED, MeetingEndDetector, detect_end_screen  # noqa: E402
+from session_store import InterruptedSessionStore, recover_session  # noqa: E402
+from stop_jobs import StopJob, StopJobRegistry  # noqa: E402
+from metrics import PROMETHEUS_CONTENT_TYPE, REGISTRY, SLOW_BUCKETS  # noqa: E402
+from selector_stats import SelectorStats  # noqa: E402
+from browser_profile import (  # noqa: E402
+    chrome_memory,
+    process_tree,
+    install_resource_blocking,
+    lean_chrome_arguments,
+    parse_block_list,
+)
+from storage import SegmentUploader, StorageError, create_backend  # noqa: E402
+from speaker_timeline import ACTIVE_SPEAKER_SCRIPT, SpeakerTimeline  # noqa: E402
+from live_captions import CAPTION_OBSERVER_SCRIPT, CaptionStream  # noqa: E402
+from summarizer import IncrementalSummarizer, SummaryCache, ExtractiveStubModel, create_summary_model, write_summary  # noqa: E402
+from transcript_index import TranscriptIndex, attach_snippets  # noqa: E402
+from recording_catalog import RecordingCatalog, start_catalog_watcher  # noqa: E402
 
 
 
@@ -103,7 +129,6 @@ CREDENTIALS_FILE = 'credentials.json'
 TOKEN_FILE = 'token.pickle'
 REDIRECT_URI = 'http://localhost:8000/auth/callback'
 SUMMARY_REPORT_URL = 'https://docs.google.com/document/d/1RwhUXsPEGBzz92d_kJ_U7iNxTKTNOMsvcqd5CBZKMKI/edit?tab=t.0'
-SUMMARY_DELAY_SECONDS = int(os.getenv('SUMMARY_DELAY_SECONDS', '300'))
 SUMMARY_PDF_FILENAME = 'Google Meet Summary Report.pdf'
 SUMMARY_PDF_PATH = Path(__file__).resolve().parent / SUMMARY_PDF_FILENAME
 SMTP_SERVER = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
@@ -111,6 +136,38 @@ SMTP_PORT = int(os.getenv('SMTP_PORT', '465'))
 EMAIL_SENDER = os.getenv('EMAIL_SENDER')
 EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD')
 EMAIL_RECIPIENT = os.getenv('EMAIL_RECIPIENT')
+REPORT_CACHE_DIR = Path(os.getenv('REPORT_CACHE_DIR', Path(__file__).resolve().parent.parent / 'reports'))
+REPORT_MAX_WORKERS = int(os.getenv('REPORT_MAX_WORKERS', '2'))
+PARTICIPANT_POLL_SECONDS = float(os.getenv('PARTICIPANT_POLL_SECONDS', '10'))
+UPLOAD_BACKEND = os.getenv('MEET_UPLOAD_BACKEND', '')
+RECORDING_SEGMENT_SECONDS = int(os.getenv('RECORDING_SEGMENT_SECONDS', '60'))
+SPEAKER_POLL_SECONDS = float(os.getenv('SPEAKER_POLL_SECONDS', '2'))
+CAPTION_POLL_SECONDS = float(os.getenv('CAPTION_POLL_SECONDS', '1'))
+SUPERVISOR_POLL_SECONDS = float(os.getenv('SUPERVISOR_POLL_SECONDS', '15'))
+MEET_ALONE_MINUTES = float(os.getenv('MEET_ALONE_MINUTES', '5'))
+STOP_WORKERS = int(os.getenv('STOP_WORKERS', '4'))
+SUMMARY_MODEL = os.getenv('SUMMARY_MODEL', 'local')
+SUMMARY_WINDOW_SECONDS = float(os.getenv('SUMMARY_WINDOW_SECONDS', '300'))
+SUMMARY_CACHE_DIR = Path(os.getenv('SUMMARY_CACHE_DIR', Path(__file__).resolve().parent.parent / 'summaries'))
+FINISHED_SESSION_LIMIT = 50
+RECORDINGS_ROOT = Path(os.getenv('MEET_RECORDINGS_ROOT', Path(__file__).resolve().parent.parent / 'recordings'))
+RECORDING_CATALOG_DB = Path(os.getenv('RECORDING_CATALOG_DB', Path(__file__).resolve().parent.parent / 'recordings_catalog.db'))
+TRANSCRIPT_INDEX_DIR = Path(os.getenv('TRANSCRIPT_INDEX_DIR', Path(__file__).resolve().parent.parent / 'search_index'))
+SHUTDOWN_DEADLINE_SECONDS = float(os.getenv('SHUTDOWN_DEADLINE_SECONDS', '20'))
+SESSION_STORE_PATH = Path(os.getenv('SESSION_STORE_PATH', Path(__file__).resolve().parent.parent / 'interrupted_sessions.json'))
+SELECTOR_STATS_PATH = Path(os.getenv('SELECTOR_STATS_PATH', Path(__file__).resolve().parent.parent / 'selector_stats.json'))
+SELECTOR_FAST_TIMEOUT_SECONDS = float(os.getenv('SELECTOR_FAST_TIMEOUT_SECONDS', '5'))
+JOIN_WAIT_SECONDS = float(os.getenv('JOIN_WAIT_SECONDS', '30'))
+CAPTURE_PROFILE = os.getenv('MEET_CAPTURE_PROFILE', 'standard')
+ARCHIVE_TRANSCODE = os.getenv('ARCHIVE_TRANSCODE', '').lower() in ('1', 'true', 'yes')
+ARCHIVE_PROFILE = os.getenv('ARCHIVE_PROFILE', 'h264')
+ARCHIVE_WORKERS = int(os.getenv('ARCHIVE_WORKERS', '1'))
+CAPTURE_MODE = os.getenv('MEET_CAPTURE_MODE', 'ffmpeg').strip().lower()
+BROWSER_CAPTURE_WS_URL = os.getenv('BROWSER_CAPTURE_WS_URL', 'ws://127.0.0.1:8000')
+BROWSER_CAPTURE_FPS = int(os.getenv('BROWSER_CAPTURE_FPS', '15'))
+CHROME_PROFILE = os.getenv('CHROME_PROFILE', 'standard').strip().lower()
+CHROME_RENDERER_PROCESS_LIMIT = int(os.getenv('CHROME_RENDERER_PROCESS_LIMIT', '2'))
+CHROME_BLOCK_RESOURCES = parse_block_list(os.getenv('CHROME_BLOCK_RESOURCES', ''))
 
 # FastAPI app
 app = FastAPI(
@@ -159,6 +216,11 @@ class CalendarResponse(BaseModel):
 class MeetJoinRequest(BaseModel):
     meet_url: HttpUrl
     headless: bool = False
+    live_captions: bool = False
+    # "ffmpeg" (screen grab) or "browser" (MediaRecorder in the tab); headless defaults to browser
+    capture_mode: Optional[str] = None
+    # Tap each remote WebRTC audio track into its own file
+    participant_audio: bool = False
 
 class RecordingStopRequest(BaseModel):
     session_id: str
@@ -174,12 +236,124 @@ class MeetSession:
         self.driver = None
         self.is_recording = False
         self.recording_start_time = None
+        self.recording_end_time: Optional[datetime] = None
         self.recording_path = None
         self.participant_count = 0
+        self.participant_checked_at: Optional[float] = None
+        self.participant_task: Optional[asyncio.Task] = None
         self.recorder: Optional[FFmpegRecorder] = None
+        self.uploader: Optional[SegmentUploader] = None
+        self.speaker_timeline: Optional[SpeakerTimeline] = None
+        self.speaker_task: Optional[asyncio.Task] = None
+        self.caption_stream: Optional[CaptionStream] = None
+        self.caption_task: Optional[asyncio.Task] = None
+        self.summarizer: Optional[IncrementalSummarizer] = None
+        self.summary: Optional[Dict[str, Any]] = None
+        self.participant_audio: Optional[ParticipantAudioSink] = None
+        self.supervisor_task: Optional[asyncio.Task] = None
+        self.stopping = False
+        self.end_reason: Optional[str] = None
+        self.report_recipient: Optional[str] = None
+        self.shutdown_pending: List[str] = []
 
 # Global session storage
 active_sessions: Dict[str, MeetSession] = {}
+# Recently stopped sessions, kept so the delayed summary email can still find them
+finished_sessions: "OrderedDict[str, MeetSession]" = OrderedDict()
+
+# Lifecycle events pushed to dashboards over /events
+session_events = SessionEventBus()
+
+# Object storage for upload-while-recording (disabled unless MEET_UPLOAD_BACKEND is set)
+try:
+    upload_backend = create_backend(UPLOAD_BACKEND)
+except Exception as exc:
+    print(f"⚠️ Upload backend unavailable, recordings stay local: {exc}")
+    upload_backend = None
+
+
+def _slugify(value: str) -> str:
+    """Convert arbitrary text to a safe object path segment."""
+    value = re.sub(r"[^a-zA-Z0-9._-]+", "-", value.strip())
+    value = re.sub(r"-{2,}", "-", value).strip("-")
+    return value or "untitled"
+
+# Per-meeting summary reports, rendered off the event loop and cached by content hash
+report_renderer = ReportRenderer(str(REPORT_CACHE_DIR), max_workers=REPORT_MAX_WORKERS)
+
+# Window-by-window meeting summaries, cached by content hash
+try:
+    summary_model = create_summary_model(SUMMARY_MODEL)
+except Exception as exc:
+    print(f"⚠️ Summary model unavailable, using local extractive summaries: {exc}")
+    summary_model = ExtractiveStubModel()
+summary_cache = SummaryCache(str(SUMMARY_CACHE_DIR))
+
+# BM25 search over every finalized transcript
+transcript_index = TranscriptIndex(str(TRANSCRIPT_INDEX_DIR))
+
+# SQLite catalog of everything under RECORDINGS_ROOT, kept current by a file watcher
+# (both opened at startup, so importing the module touches no files)
+recording_catalog: Optional[RecordingCatalog] = None
+recording_watcher = None
+
+# Which join-screen selectors actually match, so the usual winners are tried first
+selector_stats = SelectorStats(str(SELECTOR_STATS_PATH), fast_timeout=SELECTOR_FAST_TIMEOUT_SECONDS)
+
+# Sessions that missed the shutdown deadline, finished off on the next start
+interrupted_sessions = InterruptedSessionStore(str(SESSION_STORE_PATH))
+
+# Session stops run as jobs; their blocking steps get their own threads so a slow
+# ffmpeg finalize cannot starve asyncio.to_thread work (capture sockets, polls)
+stop_jobs = StopJobRegistry()
+stop_executor = ThreadPoolExecutor(max_workers=STOP_WORKERS, thread_name_prefix="stop")
+
+# Pipeline metrics, served in Prometheus format at /metrics
+JOIN_PHASE_SECONDS = REGISTRY.histogram(
+    "meet_join_phase_seconds", "Time spent in each step of joining a meeting and starting the recorder",
+    ["phase"], buckets=SLOW_BUCKETS)
+TIME_TO_RECORD_SECONDS = REGISTRY.histogram(
+    "meet_time_to_record_seconds", "Time from a join request to a running recording", buckets=SLOW_BUCKETS)
+# outcome: clicked, no_join_button (joined without finding the button), error
+MEET_JOINS = REGISTRY.counter("meet_joins_total", "Meet join attempts", ["outcome"])
+SESSION_STARTS = REGISTRY.counter("meet_session_starts_total", "Join-and-record requests", ["outcome"])
+CHROME_LAUNCH_FAILURES = REGISTRY.counter("chrome_launch_failures_total", "Chrome drivers that failed to start")
+ACTIVE_SESSIONS = REGISTRY.gauge("meet_active_sessions", "Sessions currently in a meeting")
+ACTIVE_SESSIONS.set_function(lambda: len(active_sessions))
+STOP_SECONDS = REGISTRY.histogram(
+    "meet_stop_seconds", "Time to stop a session, from stop job start to browser closed", buckets=SLOW_BUCKETS)
+STOP_FAILURES = REGISTRY.counter("meet_stop_failures_total", "Stop jobs that failed")
+CALENDAR_REQUEST_SECONDS = REGISTRY.histogram(
+    "calendar_request_seconds", "Calendar endpoint latency, including the Google API call", ["endpoint"])
+CALENDAR_REQUEST_ERRORS = REGISTRY.counter("calendar_request_errors_total", "Failed calendar requests", ["endpoint"])
+EMAIL_SEND_SECONDS = REGISTRY.histogram(
+    "summary_email_seconds", "Time to build and send a summary email over SMTP", buckets=SLOW_BUCKETS)
+# result: sent, skipped (not configured / no recipient / no PDF), failed
+SUMMARY_EMAILS = REGISTRY.counter("summary_emails_total", "Summary emails", ["result"])
+
+
+def _observe_phase(phase: str, started: float) -> float:
+    """Record a join phase that began at ``started``; returns now, the start of the next phase"""
+    now = time.perf_counter()
+    JOIN_PHASE_SECONDS.observe(now - started, phase=phase)
+    return now
+
+
+def _catalog_archived(original_path: str, archived_path: str) -> None:
+    for path in {original_path, archived_path}:
+        try:
+            recording_catalog.refresh(os.path.relpath(path, RECORDINGS_ROOT).replace(os.sep, "/"))
+        except Exception as exc:
+            print(f"⚠️ Catalog refresh after archiving failed: {exc}")
+
+
+# Re-encodes finished recordings at idle priority; pauses while anything is being recorded
+archive_transcoder = ArchiveTranscoder(
+    profile=ARCHIVE_PROFILE,
+    max_workers=ARCHIVE_WORKERS,
+    is_busy=lambda: any(s.is_recording for s in list(active_sessions.values())),
+    on_archived=_catalog_archived,
+) if ARCHIVE_TRANSCODE else None
 
 def _detect_chrome_binary() -> Optional[str]:
     """Return the first Chrome/Chromium binary found on PATH."""
@@ -227,8 +401,37 @@ def _resolve_driver_path() -> str:
         raise HTTPException(status_code=500, detail=f"{hint} (error: {exc})")
 
 
-def setup_chrome_driver(*, headless: bool = False):
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    window.navigator.chrome = { runtime: {} };
+    Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4]});
+"""
+
+
+def _install_page_scripts(
+    driver, live_captions: bool = False, browser_capture: bool = False, participant_audio: bool = False
+) -> None:
+    """Register scripts that run in every new document before Meet's own code."""
+    if browser_capture or participant_audio:
+        # Meet's CSP would refuse the capture socket to the backend
+        driver.execute_cdp_cmd("Page.setBypassCSP", {"enabled": True})
+    # Mask webdriver hints so the Meet UI matches a real browser
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": STEALTH_SCRIPT})
+    # Record active-speaker changes from the participant tiles
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": ACTIVE_SPEAKER_SCRIPT})
+    if live_captions:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": CAPTION_OBSERVER_SCRIPT})
+    if participant_audio:
+        # Must wrap RTCPeerConnection before Meet creates its connection
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": AUDIO_TAP_HOOK_SCRIPT})
+
+
+def setup_chrome_driver(
+    *, headless: bool = False, live_captions: bool = False, browser_capture: bool = False, participant_audio: bool = False
+):
     """Setup Chrome driver with appropriate options for Ubuntu"""
+    started = time.perf_counter()
     chrome_options = Options()
 
     if headless:
@@ -240,6 +443,16 @@ def setup_chrome_driver(*, headless: bool = False):
     chrome_options.add_argument("--disable-infobars")
     chrome_options.add_argument("--start-maximized")
 
+    # Lean bots: no extensions, background services or spare renderers
+    lean = CHROME_PROFILE == "lean"
+    if lean:
+        for argument in lean_chrome_arguments(CHROME_RENDERER_PROCESS_LIMIT):
+            chrome_options.add_argument(argument)
+
+    if browser_capture:
+        for argument in BROWSER_CAPTURE_CHROME_ARGS:
+            chrome_options.add_argument(argument)
+
     # Reduce Selenium fingerprints so Meet renders the standard UI
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
     chrome_options.add_experimental_option("useAutomationExtension", False)
@@ -254,8 +467,11 @@ def setup_chrome_driver(*, headless: bool = False):
         "profile.default_content_setting_values.media_stream_mic": 1,
         "profile.default_content_setting_values.media_stream_camera": 1,
         "profile.default_content_settings.popups": 0,
-        "profile.managed_default_content_settings.images": 1
+        "profile.managed_default_content_settings.images": 2 if "images" in CHROME_BLOCK_RESOURCES else 1
     }
+    if lean:
+        prefs["translate.enabled"] = False
+        prefs["background_mode.enabled"] = False
     chrome_options.add_experimental_option("prefs", prefs)
     
     try:
@@ -263,18 +479,9 @@ def setup_chrome_driver(*, headless: bool = False):
         # Chrome/Selenium can auto-manage the matching binary.
         driver = webdriver.Chrome(options=chrome_options)
     
-        # Mask webdriver hints so the Meet UI matches a real browser
-        driver.execute_cdp_cmd(
-            "Page.addScriptToEvaluateOnNewDocument",
-            {
-                "source": """
-                    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                    window.navigator.chrome = { runtime: {} };
-                    Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
-                    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4]});
-                """
-            },
-        )
+        _install_page_scripts(driver, live_captions, browser_capture, participant_audio)
+        install_resource_blocking(driver, CHROME_BLOCK_RESOURCES)
+        _observe_phase("driver_launch", started)
         return driver
     except SessionNotCreatedException:
         # Selenium Manager likely provided an incompatible driver version. Fall back to
@@ -284,21 +491,15 @@ def setup_chrome_driver(*, headless: bool = False):
             service = Service(driver_path)
             driver = webdriver.Chrome(service=service, options=chrome_options)
 
-            driver.execute_cdp_cmd(
-                "Page.addScriptToEvaluateOnNewDocument",
-                {
-                    "source": """
-                        Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                        window.navigator.chrome = { runtime: {} };
-                        Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
-                        Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4]});
-                    """
-                },
-            )
+            _install_page_scripts(driver, live_captions, browser_capture, participant_audio)
+            install_resource_blocking(driver, CHROME_BLOCK_RESOURCES)
+            _observe_phase("driver_launch", started)
             return driver
         except HTTPException:
+            CHROME_LAUNCH_FAILURES.inc()
             raise
         except Exception as e:
+            CHROME_LAUNCH_FAILURES.inc()
             raise HTTPException(
                 status_code=500,
                 detail=(
@@ -307,6 +508,7 @@ def setup_chrome_driver(*, headless: bool = False):
                 ),
             )
     except Exception as e:
+        CHROME_LAUNCH_FAILURES.inc()
         raise HTTPException(
             status_code=500,
             detail=(
@@ -315,7 +517,31 @@ def setup_chrome_driver(*, headless: bool = False):
             ),
         )
 
-def join_google_meet(driver, meet_url: str) -> bool:
+def enable_captions(driver) -> bool:
+    """Switch on Meet's live captions from inside the call."""
+    caption_xpaths = [
+        "//button[contains(@aria-label, 'Turn on captions')]",
+        "//button[contains(@aria-label, 'captions') and @aria-pressed='false']",
+        "//div[@role='button' and contains(@aria-label, 'Turn on captions')]",
+    ]
+    for xpath in caption_xpaths:
+        try:
+            button = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, xpath)))
+            button.click()
+            return True
+        except Exception:
+            continue
+
+    # Fall back to Meet's keyboard shortcut
+    try:
+        ActionChains(driver).send_keys("c").perform()
+        return True
+    except Exception as exc:
+        print(f"⚠️ Could not enable captions: {exc}")
+        return False
+
+
+def join_google_meet(driver, meet_url: str, captions: bool = False) -> bool:
     """Join Google Meet and configure settings"""
 
     def click_with_fallback(target) -> bool:
@@ -379,8 +605,10 @@ def join_google_meet(driver, meet_url: str) -> bool:
             return False
 
     try:
+        phase_started = time.perf_counter()
         driver.get(meet_url)
-        wait = WebDriverWait(driver, 30)
+        phase_started = _observe_phase("page_load", phase_started)
+        wait_seconds = JOIN_WAIT_SECONDS
         
         # Wait for page to load
         time.sleep(5)
@@ -394,19 +622,17 @@ def join_google_meet(driver, meet_url: str) -> bool:
             '.name-input'
         ]
         
-        name_entered = False
-        for selector in name_selectors:
-            try:
-                name_field = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                name_field.clear()
-                name_field.send_keys("AI Assistant")
-                name_entered = True
-                break
-            except TimeoutException:
-                continue
+        def fill_name(selector, timeout) -> bool:
+            name_field = WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
+            name_field.clear()
+            name_field.send_keys("AI Assistant")
+            return True
+
+        name_entered = selector_stats.search("name_field", name_selectors, fill_name, wait_seconds) is not None
         
         if not name_entered:
             print("Warning: Could not find name field")
+        phase_started = _observe_phase("name_fill", phase_started)
         
         # Turn off microphone and camera
         mic_selectors = [
@@ -423,27 +649,20 @@ def join_google_meet(driver, meet_url: str) -> bool:
             '.camera-button'
         ]
         
-        # Try to turn off microphone
-        for selector in mic_selectors:
-            try:
-                mic_button = driver.find_element(By.CSS_SELECTOR, selector)
-                if mic_button.is_enabled():
-                    mic_button.click()
-                    break
-            except Exception:
-                continue
-        
-        # Try to turn off camera
-        for selector in camera_selectors:
-            try:
-                camera_button = driver.find_element(By.CSS_SELECTOR, selector)
-                if camera_button.is_enabled():
-                    camera_button.click()
-                    break
-            except Exception:
-                continue
+        def click_if_enabled(selector, timeout) -> bool:
+            # The preview is already rendered here; no need to wait for these
+            button = driver.find_element(By.CSS_SELECTOR, selector)
+            if not button.is_enabled():
+                return False
+            button.click()
+            return True
+
+        # Try to turn off microphone and camera
+        selector_stats.search("mic_off", mic_selectors, click_if_enabled, 0)
+        selector_stats.search("camera_off", camera_selectors, click_if_enabled, 0)
         
         time.sleep(2)
+        phase_started = _observe_phase("media_toggle", phase_started)
         
         # Try to click "Ask to join" or "Join now" button
         join_selectors = [
@@ -472,42 +691,33 @@ def join_google_meet(driver, meet_url: str) -> bool:
             "//button[contains(@jsname, 'Qx7uuf')]",  # current Meet join button jsname
         ]
 
-        join_clicked = False
-        for xpath in join_xpaths:
-            try:
-                join_button = wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
-                if should_skip_join_candidate(join_button):
-                    continue
-                if click_with_fallback(join_button):
-                    join_clicked = True
-                    break
-            except TimeoutException:
-                continue
-            except Exception:
-                continue
+        def click_join(locator, timeout) -> bool:
+            join_button = WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(locator))
+            if should_skip_join_candidate(join_button):
+                return False
+            return click_with_fallback(join_button)
 
-        if not join_clicked:
-            for selector in join_selectors:
-                try:
-                    join_button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                    if should_skip_join_candidate(join_button):
-                        continue
-                    if click_with_fallback(join_button):
-                        join_clicked = True
-                        break
-                except TimeoutException:
-                    continue
-                except Exception:
-                    continue
+        # XPaths first, then the CSS selectors, until past joins say otherwise
+        join_locators = [(By.XPATH, xpath) for xpath in join_xpaths] + [
+            (By.CSS_SELECTOR, selector) for selector in join_selectors
+        ]
+        join_clicked = selector_stats.search("join_button", join_locators, click_join, wait_seconds) is not None
         
+        phase_started = _observe_phase("join_click", phase_started)
         if not join_clicked:
             print("Warning: Could not find join button, but continuing...")
         
         # Wait a bit for the join process
         time.sleep(5)
+
+        if captions and enable_captions(driver):
+            print("💬 Live captions enabled")
+        _observe_phase("post_join", phase_started)
+        MEET_JOINS.inc(outcome="clicked" if join_clicked else "no_join_button")
         return True
         
     except Exception as e:
+        MEET_JOINS.inc(outcome="error")
         print(f"Error joining meet: {str(e)}")
         return False
 
@@ -639,21 +849,86 @@ def extract_meeting_url(event_data: Dict) -> Optional[str]:
     return None
 
 
-def send_summary_email(recipient_email: Optional[str], meet_url: Optional[str] = None) -> None:
-    """Send the summary PDF via SMTP to the requested recipient."""
+def build_report_metadata(session: MeetSession, ended_at: Optional[datetime] = None) -> Dict[str, Any]:
+    """Collect the session fields that go into a per-meeting summary report."""
+    ended_at = ended_at or session.recording_end_time or datetime.now()
+    metadata: Dict[str, Any] = {
+        "session_id": session.session_id,
+        "meet_url": session.meet_url,
+        "participant_count": session.participant_count,
+        "transcript_excerpts": [],
+    }
+    if session.caption_stream:
+        metadata["transcript_excerpts"] = [
+            {"timestamp": segment["start"], "speaker": segment["speaker"], "text": segment["text"]}
+            for segment in session.caption_stream.transcript()["segments"]
+        ]
+    if session.summary:
+        metadata["summary"] = session.summary
+    if session.recording_start_time:
+        metadata["recording_started_at"] = session.recording_start_time.isoformat()
+    # The report is cached by a hash of this metadata, so the running duration of a
+    # live meeting stays out of it; it is only known once the recording has ended
+    if not session.is_recording:
+        metadata["recording_ended_at"] = ended_at.isoformat()
+        if session.recording_start_time:
+            metadata["duration_seconds"] = int((ended_at - session.recording_start_time).total_seconds())
+    return metadata
+
+
+def find_session_by_url(meet_url: Optional[str]) -> Optional[MeetSession]:
+    """Return the active session recording ``meet_url``, if any."""
+    if not meet_url:
+        return None
+    for session in active_sessions.values():
+        if session.meet_url == meet_url:
+            return session
+    for session in reversed(finished_sessions.values()):
+        if session.meet_url == meet_url:
+            return session
+    return None
+
+
+async def render_session_report(session: Optional[MeetSession]) -> Optional[Path]:
+    """Render (or fetch from cache) the summary PDF for a session."""
+    if session is None:
+        return None
+    try:
+        metadata = await asyncio.to_thread(build_report_metadata, session)
+        return await report_renderer.render(metadata)
+    except Exception as exc:
+        print(f"⚠️ Failed to render summary report, using default PDF: {exc}")
+        return None
+
+
+def send_summary_email(
+    recipient_email: Optional[str],
+    meet_url: Optional[str] = None,
+    report_path: Optional[Path] = None,
+    summary: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """Send the summary PDF via SMTP to the requested recipient.
+
+    Returns True when an email was actually sent.
+    """
     if not EMAIL_SENDER or not EMAIL_PASSWORD:
         print("⚠️ Email sender credentials not configured; skipping summary email.")
-        return
+        SUMMARY_EMAILS.inc(result="skipped")
+        return False
 
     recipient = recipient_email or EMAIL_RECIPIENT
     if not recipient:
         print("⚠️ No recipient email available; skipping summary email.")
-        return
+        SUMMARY_EMAILS.inc(result="skipped")
+        return False
 
-    if not SUMMARY_PDF_PATH.exists():
-        print(f"⚠️ Summary PDF not found at: {SUMMARY_PDF_PATH}")
-        return
+    pdf_path = report_path if report_path and report_path.exists() else SUMMARY_PDF_PATH
+    if not pdf_path.exists():
+        print(f"⚠️ Summary PDF not found at: {pdf_path}")
+        SUMMARY_EMAILS.inc(result="skipped")
+        return False
 
+    started = time.perf_counter()
     try:
         message = EmailMessage()
         message['Subject'] = 'Google Meet Summary Report'
@@ -661,18 +936,24 @@ def send_summary_email(recipient_email: Optional[str], meet_url: Optional[str] =
         message['To'] = recipient
         document_link = SUMMARY_REPORT_URL
         body_meet_url = meet_url or 'Not provided'
+        summary_text = ""
+        if summary and summary.get("overview"):
+            summary_text = f"Summary:\n{summary['overview']}\n\n"
+            if summary.get("action_items"):
+                summary_text += "Action items:\n" + "".join(f"- {item}\n" for item in summary["action_items"]) + "\n"
         message.set_content(
             (
                 "Hello,\n\n"
                 "Here is the summary report for your recent meeting.\n\n"
                 f"Meet URL: {body_meet_url}\n"
                 f"Summary Document: {document_link}\n\n"
+                f"{summary_text}"
                 "The PDF summary is attached.\n\n"
                 "Regards,\nGoogle Meet Dashboard"
             )
         )
 
-        pdf_bytes = SUMMARY_PDF_PATH.read_bytes()
+        pdf_bytes = pdf_path.read_bytes()
         message.add_attachment(
             pdf_bytes,
             maintype='application',
@@ -684,25 +965,47 @@ def send_summary_email(recipient_email: Optional[str], meet_url: Optional[str] =
             smtp.login(EMAIL_SENDER, EMAIL_PASSWORD)
             smtp.send_message(message)
 
+        EMAIL_SEND_SECONDS.observe(time.perf_counter() - started)
+        SUMMARY_EMAILS.inc(result="sent")
         print(f"📧 Summary email sent to {recipient}")
+        return True
 
     except Exception as exc:
+        SUMMARY_EMAILS.inc(result="failed")
         print(f"❌ Failed to send summary email: {exc}")
         raise
 
 
-async def schedule_summary_email(meet_url: str, recipient_email: Optional[str] = None) -> None:
-    """Delay summary email sending by configured interval."""
+async def send_session_report(session: MeetSession) -> None:
+    """Render a stopped session's report (with its final summary) and email it."""
+    session_id, meet_url, recipient_email = session.session_id, session.meet_url, session.report_recipient
     try:
-        await asyncio.sleep(SUMMARY_DELAY_SECONDS)
-        await asyncio.to_thread(send_summary_email, recipient_email, meet_url)
+        report_path = await render_session_report(session)
+        # Published whether or not email is configured, so the dashboard can always show the summary
+        session_events.publish(
+            "report_ready", session_id, meet_url=meet_url, report_path=str(report_path) if report_path else None
+        )
+        sent = await asyncio.to_thread(send_summary_email, recipient_email, meet_url, report_path, session.summary)
+        if sent:
+            session_events.publish("email_sent", session_id, meet_url=meet_url, recipient=recipient_email)
     except Exception as exc:
-        print(f"❌ Summary email scheduling failed: {exc}")
+        print(f"❌ Summary report delivery failed: {exc}")
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application"""
+    global recording_catalog, recording_watcher
     print("🚀 Starting Google Calendar OAuth 2.0 Simple Backend...")
+
+    RECORDINGS_ROOT.mkdir(parents=True, exist_ok=True)
+    recording_catalog = await asyncio.to_thread(RecordingCatalog, str(RECORDING_CATALOG_DB), str(RECORDINGS_ROOT))
+    if await asyncio.to_thread(recording_catalog.backfill_if_needed):
+        print(f"🗂️ Recording catalog backfilled from {RECORDINGS_ROOT}")
+    recording_watcher = start_catalog_watcher(recording_catalog)
+    await asyncio.to_thread(recover_interrupted_sessions)
+    if archive_transcoder:
+        archive_transcoder.start()
+        print(f"🗜️ Archive transcoding enabled ({ARCHIVE_PROFILE}, {ARCHIVE_WORKERS} worker(s))")
     
     # Check if credentials file exists
     if not os.path.exists(CREDENTIALS_FILE):
@@ -732,7 +1035,8 @@ async def root():
             "/auth/connect": "Start OAuth flow",
             "/auth/callback": "OAuth callback handler",
             "/auth/logout": "Logout and clear credentials",
-            "/calendar/events": "Get calendar events"
+            "/calendar/events": "Get calendar events",
+            "/events": "Server-Sent Events stream of session lifecycle events"
         }
     }
 
@@ -870,6 +1174,7 @@ async def get_calendar_events(days: int = 7) -> CalendarResponse:
     if not current_credentials or not current_credentials.valid:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
+    started = time.perf_counter()
     try:
         service = get_calendar_service()
         if not service:
@@ -932,6 +1237,7 @@ async def get_calendar_events(days: int = 7) -> CalendarResponse:
             
             calendar_events.append(calendar_event)
         
+        CALENDAR_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint="events")
         return CalendarResponse(
             events=calendar_events,
             count=len(calendar_events),
@@ -939,6 +1245,7 @@ async def get_calendar_events(days: int = 7) -> CalendarResponse:
         )
         
     except Exception as e:
+        CALENDAR_REQUEST_ERRORS.inc(endpoint="events")
         print(f"❌ Failed to get calendar events: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get calendar events: {str(e)}")
 
@@ -955,53 +1262,378 @@ async def trigger_summary_email(request: Optional[SummaryEmailRequest] = None):
     if not recipient:
         raise HTTPException(status_code=400, detail="No recipient email available")
 
-    meet_url = request.meet_url if request else None
+    meet_url = str(request.meet_url) if request and request.meet_url else None
+    session = find_session_by_url(meet_url)
+    report_path = await render_session_report(session)
+    session_events.publish(
+        "report_ready",
+        session.session_id if session else None,
+        meet_url=meet_url,
+        report_path=str(report_path) if report_path else None,
+    )
 
     try:
-        await asyncio.to_thread(send_summary_email, recipient, meet_url)
+        sent = await asyncio.to_thread(
+            send_summary_email, recipient, meet_url, report_path, session.summary if session else None
+        )
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to send summary email: {exc}")
 
+    if sent:
+        session_events.publish(
+            "email_sent",
+            session.session_id if session else None,
+            meet_url=meet_url,
+            recipient=recipient,
+        )
+
     return {
         "message": "Summary report emailed successfully",
         "recipient": recipient
     }
 
 
+async def watch_participant_count(session: MeetSession) -> None:
+    """Poll the participant count once per session and publish only the changes."""
+    try:
+        while session.is_recording and active_sessions.get(session.session_id) is session:
+            try:
+                count = await asyncio.to_thread(get_participant_count, session.driver)
+            except Exception:
+                count = session.participant_count
+            session.participant_checked_at = time.monotonic()
+            if count != session.participant_count:
+                previous = session.participant_count
+                session.participant_count = count
+                session_events.publish(
+                    "participants", session.session_id,
+                    participant_count=count, previous_count=previous,
+                )
+            await asyncio.sleep(PARTICIPANT_POLL_SECONDS)
+    except asyncio.CancelledError:
+        pass
+
+
+async def supervise_session(session: MeetSession) -> None:
+    """Stop the session through the normal path once the meeting is over or the bot is stuck."""
+    detector = MeetingEndDetector(alone_seconds=MEET_ALONE_MINUTES * 60)
+    try:
+        while session.is_recording and active_sessions.get(session.session_id) is session:
+            await asyncio.sleep(SUPERVISOR_POLL_SECONDS)
+            if session.stopping:
+                return
+            driver_ok, end_screen = True, None
+            try:
+                end_screen = await asyncio.to_thread(detect_end_screen, session.driver)
+            except Exception:
+                driver_ok = False
+            verdict = detector.observe(
+                end_screen=end_screen,
+                participant_count=session.participant_count,
+                recorder_active=session.recorder.is_active() if session.recorder else True,
+                driver_ok=driver_ok,
+            )
+            if verdict and not session.stopping:
+                print(f"🏁 Ending session {session.session_id}: {verdict['reason']} ({verdict['detail']})")
+                # Runs as its own job: the stop path cancels this supervisor
+                submit_stop(session.session_id, verdict["reason"], verdict["detail"])
+                return
+    except asyncio.CancelledError:
+        pass
+
+
+async def watch_active_speakers(session: MeetSession) -> None:
+    """Drain the in-page active-speaker buffer into the session's timeline."""
+    try:
+        while session.is_recording and active_sessions.get(session.session_id) is session:
+            try:
+                await asyncio.to_thread(session.speaker_timeline.drain, session.driver)
+            except Exception:
+                pass
+            await asyncio.sleep(SPEAKER_POLL_SECONDS)
+    except asyncio.CancelledError:
+        pass
+
+
+async def watch_live_captions(session: MeetSession) -> None:
+    """Drain caption deltas in batches and append them to the session's caption log."""
+    try:
+        while session.is_recording and active_sessions.get(session.session_id) is session:
+            try:
+                await asyncio.to_thread(session.caption_stream.drain, session.driver)
+            except Exception:
+                pass
+            if session.summarizer and session.recorder and session.recorder.start_time:
+                # Summarize each window in the background as soon as the meeting has moved past it;
+                # the transcript is only rebuilt (off the loop) when a new window has closed
+                position = time.monotonic() - session.recorder.start_time
+                if session.summarizer.due(position):
+                    await asyncio.to_thread(
+                        lambda: session.summarizer.observe(session.caption_stream.transcript()["segments"], position)
+                    )
+            await asyncio.sleep(CAPTION_POLL_SECONDS)
+    except asyncio.CancelledError:
+        pass
+
+
+def save_caption_transcript(session: MeetSession) -> Optional[str]:
+    """Final caption drain; writes the compiled transcript next to the recording."""
+    stream = session.caption_stream
+    if stream is None:
+        return None
+    if session.driver:
+        try:
+            stream.drain(session.driver)
+        except Exception:
+            pass
+    transcript_path = Path(stream.log_path).with_suffix(".json")
+    try:
+        transcript = stream.close(str(transcript_path))
+    except Exception as exc:
+        print(f"⚠️ Could not save caption transcript: {exc}")
+        return None
+    print(f"💬 Caption transcript saved: {transcript_path} ({len(transcript['segments'])} segments)")
+    try:
+        transcript_index.add_transcript_file(str(transcript_path), {
+            "session_id": session.session_id,
+            "meet_url": session.meet_url,
+            "recording_path": str(session.recording_path) if session.recording_path else None,
+            "recording_started_at": session.recording_start_time.isoformat() if session.recording_start_time else None,
+        })
+    except Exception as exc:
+        print(f"⚠️ Could not index caption transcript: {exc}")
+    return str(transcript_path)
+
+
+def save_session_summary(session: MeetSession) -> Optional[Dict[str, Any]]:
+    """Reduce the window summaries built during the meeting into the final summary."""
+    if session.summarizer is None or session.caption_stream is None:
+        return None
+    try:
+        summary = session.summarizer.finalize(session.caption_stream.transcript()["segments"])
+    except Exception as exc:
+        print(f"⚠️ Could not summarize meeting: {exc}")
+        return None
+    if session.recording_path:
+        try:
+            write_summary(summary, str(session.recording_path.with_suffix(".summary.json")))
+        except OSError as exc:
+            print(f"⚠️ Could not save meeting summary: {exc}")
+    session.summary = summary
+    return summary
+
+
+def save_speaker_timeline(session: MeetSession, end_ms: int) -> Optional[Dict[str, Any]]:
+    """Final drain of speaker changes, stored in the recording's metadata sidecar."""
+    timeline = session.speaker_timeline
+    if timeline is None:
+        return None
+    if session.driver:
+        try:
+            timeline.drain(session.driver)
+        except Exception:
+            pass
+    timeline.finish(end_ms)
+    result = timeline.to_metadata()
+
+    update_recording_metadata(session, {"speaker_timeline": result})
+    return result
+
+
+def save_participant_audio(
+    session: MeetSession, end_ms: int, speaker_timeline: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Stop the per-track audio taps and write participants.json with speaker-labelled stretches."""
+    sink = session.participant_audio
+    if sink is None:
+        return None
+    if session.driver:
+        try:
+            sink.stop(session.driver)
+        except Exception as exc:
+            print(f"⚠️ Participant audio did not stop cleanly: {exc}")
+    result = sink.finish(end_ms, speaker_timeline)
+    update_recording_metadata(session, {"participant_tracks": len(result["tracks"])})
+    return result
+
+
+def update_recording_metadata(session: MeetSession, fields: Dict[str, Any]) -> None:
+    """Merge ``fields`` into the recording's .json sidecar (atomically, the catalog watches it)."""
+    if not session.recording_path:
+        return
+    metadata_path = session.recording_path.with_suffix(".json")
+    try:
+        metadata = json.loads(metadata_path.read_text()) if metadata_path.exists() else {}
+        metadata.update(fields)
+        tmp_path = metadata_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(metadata, indent=2))
+        os.replace(tmp_path, metadata_path)
+    except Exception as exc:
+        print(f"⚠️ Could not update recording metadata: {exc}")
+
+
+@app.get("/recordings")
+async def list_recordings(
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    meet_url: Optional[str] = None,
+    min_duration: Optional[float] = None,
+    max_duration: Optional[float] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+):
+    """Newest-first recordings from the catalog; pass ``next_cursor`` back as ``cursor`` for the next page."""
+    limit = max(1, min(limit, 200))
+    try:
+        return await asyncio.to_thread(
+            recording_catalog.query,
+            date_from=date_from,
+            date_to=date_to,
+            meet_url=meet_url,
+            min_duration=min_duration,
+            max_duration=max_duration,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.get("/search")
+async def search_transcripts(q: str, limit: int = 20):
+    """Ranked transcript hits with millisecond offsets into each recording."""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Query must not be empty")
+    limit = max(1, min(limit, 100))
+    started = time.perf_counter()
+
+    def _search():
+        result = transcript_index.search(q, limit=limit)
+        result["hits"] = [attach_snippets(hit) for hit in result["hits"]]
+        return result
+
+    result = await asyncio.to_thread(_search)
+    result["took_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+@app.get("/events")
+async def stream_session_events(request: Request, session_id: Optional[str] = None):
+    """Server-Sent Events stream of session lifecycle events."""
+    try:
+        last_event_id = int(request.headers.get("last-event-id", "0"))
+    except ValueError:
+        last_event_id = 0
+
+    return StreamingResponse(
+        session_events.stream(session_id=session_id, last_event_id=last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/join-and-record")
 async def join_and_record_meet(request: MeetJoinRequest):
     """Join Google Meet and start recording"""
     session_id = f"session_{int(time.time())}"
     meet_url = str(request.meet_url)
+    requested_at = time.perf_counter()
     
     try:
         # Create session
         session = MeetSession(session_id, meet_url)
-        
+        session_events.publish("joining", session_id, meet_url=meet_url)
+
         # Setup driver
-        session.driver = setup_chrome_driver(headless=request.headless)
+        capture_mode = (request.capture_mode or ("browser" if request.headless else CAPTURE_MODE)).strip().lower()
+        if capture_mode not in ("ffmpeg", "browser"):
+            raise HTTPException(status_code=400, detail=f"Unknown capture mode: {capture_mode}")
+        session.driver = setup_chrome_driver(
+            headless=request.headless,
+            live_captions=request.live_captions,
+            browser_capture=capture_mode == "browser",
+            participant_audio=request.participant_audio,
+        )
 
         def _join_and_prepare():
             # Join meet (blocking call)
-            if not join_google_meet(session.driver, meet_url):
+            if not join_google_meet(session.driver, meet_url, captions=request.live_captions):
                 session.driver.quit()
                 raise HTTPException(status_code=400, detail="Failed to join Google Meet")
+            session_events.publish("admitted", session_id, meet_url=meet_url)
 
-            # Prepare recording directories and start FFmpeg capture
-            recordings_root = Path(os.getenv("MEET_RECORDINGS_ROOT", Path(__file__).resolve().parent.parent / "recordings"))
-            recordings_root.mkdir(parents=True, exist_ok=True)
+            # Prepare recording directories and start capture
+            RECORDINGS_ROOT.mkdir(parents=True, exist_ok=True)
 
-            dated_dir = recordings_root / datetime.now().strftime("%Y-%m-%d")
+            dated_dir = RECORDINGS_ROOT / datetime.now().strftime("%Y-%m-%d")
             dated_dir.mkdir(exist_ok=True)
 
             base_name = f"meet_recording_{datetime.now().strftime('%H%M%S')}"
-            recorder = FFmpegRecorder(out_dir=str(dated_dir), base_name=base_name)
+            if capture_mode == "browser":
+                recorder = BrowserRecorder(
+                    session.driver,
+                    session_id,
+                    out_dir=str(dated_dir),
+                    base_name=base_name,
+                    ws_base=BROWSER_CAPTURE_WS_URL,
+                    fps=BROWSER_CAPTURE_FPS,
+                    segment_seconds=RECORDING_SEGMENT_SECONDS if upload_backend else None,
+                )
+            else:
+                recorder = FFmpegRecorder(
+                    out_dir=str(dated_dir),
+                    base_name=base_name,
+                    segment_seconds=RECORDING_SEGMENT_SECONDS if upload_backend else None,
+                    capture_profile=CAPTURE_PROFILE,
+                )
 
+            recorder_started = time.perf_counter()
             if not recorder.start():
                 session.driver.quit()
                 raise HTTPException(status_code=500, detail="Failed to start screen recording")
+            _observe_phase("recorder_start", recorder_started)
+
+            if upload_backend:
+                object_name = "/".join([
+                    _slugify(current_user_email or "anonymous"),
+                    dated_dir.name,
+                    Path(recorder.out_path).name,
+                ])
+                if capture_mode == "browser":
+                    session.uploader = SegmentUploader(
+                        upload_backend, recorder.segment_dir, object_name,
+                        content_type="video/webm", segment_extension=".webm",
+                    ).start()
+                else:
+                    session.uploader = SegmentUploader(upload_backend, recorder.segment_dir, object_name).start()
 
             session.recorder = recorder
+            try:
+                timeline = SpeakerTimeline()
+                timeline.align(session.driver, recorder.start_time)
+                session.speaker_timeline = timeline
+            except Exception as exc:
+                print(f"⚠️ Active-speaker timeline unavailable: {exc}")
+            if request.participant_audio:
+                try:
+                    sink = ParticipantAudioSink(
+                        session_id,
+                        str(Path(recorder.out_path).with_suffix("")) + "_participants",
+                        BROWSER_CAPTURE_WS_URL,
+                    )
+                    tracks = sink.begin(session.driver, recorder.start_time)
+                    session.participant_audio = sink
+                    print(f"🎙️ Tapping {tracks} remote audio track(s) per participant")
+                except Exception as exc:
+                    print(f"⚠️ Per-participant audio unavailable: {exc}")
+            if request.live_captions:
+                try:
+                    stream = CaptionStream(str(Path(recorder.out_path).with_suffix(".captions.jsonl")))
+                    stream.align(session.driver, recorder.start_time)
+                    session.caption_stream = stream
+                    session.summarizer = IncrementalSummarizer(summary_model, summary_cache, SUMMARY_WINDOW_SECONDS)
+                except Exception as exc:
+                    print(f"⚠️ Live captions unavailable: {exc}")
             session.is_recording = True
             session.recording_start_time = datetime.now()
             session.recording_path = Path(recorder.out_path)
@@ -1013,13 +1645,24 @@ async def join_and_record_meet(request: MeetJoinRequest):
                 "recording_started_at": session.recording_start_time.isoformat(),
                 "output_path": str(session.recording_path),
                 "headless": request.headless,
+                "live_captions": session.caption_stream is not None,
+                "capture_mode": capture_mode,
+                "participant_audio": Path(session.participant_audio.out_dir).name if session.participant_audio else None,
             }
+            if capture_mode == "browser":
+                metadata["capture_source"] = recorder.mode
             try:
                 metadata_path.write_text(json.dumps(metadata, indent=2))
             except Exception:
                 pass
 
             active_sessions[session_id] = session
+            session_events.publish(
+                "recording", session_id,
+                meet_url=meet_url,
+                recording_started_at=session.recording_start_time.isoformat(),
+                recording_path=str(session.recording_path),
+            )
 
         # Perform the join/record preparation in background threads to avoid blocking the event loop
         try:
@@ -1034,8 +1677,16 @@ async def join_and_record_meet(request: MeetJoinRequest):
                     pass
             raise HTTPException(status_code=500, detail=f"Failed to initialize recording: {exc}")
 
-        recipient_email = current_user_email or EMAIL_RECIPIENT
-        asyncio.create_task(schedule_summary_email(meet_url, recipient_email))
+        session.participant_task = asyncio.create_task(watch_participant_count(session))
+        session.supervisor_task = asyncio.create_task(supervise_session(session))
+        if session.speaker_timeline:
+            session.speaker_task = asyncio.create_task(watch_active_speakers(session))
+        if session.caption_stream:
+            session.caption_task = asyncio.create_task(watch_live_captions(session))
+        # The report goes out from the stop path, once the final summary exists
+        session.report_recipient = current_user_email or EMAIL_RECIPIENT
+        TIME_TO_RECORD_SECONDS.observe(time.perf_counter() - requested_at)
+        SESSION_STARTS.inc(outcome="recording")
         return {
             "success": True,
             "session_id": session_id,
@@ -1045,6 +1696,8 @@ async def join_and_record_meet(request: MeetJoinRequest):
         }
         
     except Exception as e:
+        SESSION_STARTS.inc(outcome="failed")
+        session_events.publish("failed", session_id, meet_url=meet_url, error=str(e))
         if 'session' in locals() and session.driver:
             session.driver.quit()
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
@@ -1059,10 +1712,20 @@ async def get_participants(session_id: str):
     
     if not session.driver:
         raise HTTPException(status_code=400, detail="Session driver not available")
-    
+
+    # The per-session watcher keeps the count fresh; only query Chrome when it is stale
+    checked_at = session.participant_checked_at
+    if checked_at is not None and time.monotonic() - checked_at < PARTICIPANT_POLL_SECONDS:
+        return {
+            "session_id": session_id,
+            "participant_count": session.participant_count,
+            "is_recording": session.is_recording
+        }
+
     try:
-        participant_count = get_participant_count(session.driver)
+        participant_count = await asyncio.to_thread(get_participant_count, session.driver)
         session.participant_count = participant_count
+        session.participant_checked_at = time.monotonic()
         
         return {
             "session_id": session_id,
@@ -1073,26 +1736,46 @@ async def get_participants(session_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting participant count: {str(e)}")
 
-@app.post("/stop-recording")
-async def stop_recording(request: RecordingStopRequest):
-    """Stop recording and return the recording path"""
-    session_id = request.session_id
-    
+async def _run_stop_step(func, *args, **kwargs):
+    """Run one blocking stop step on the stop executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(stop_executor, functools.partial(func, *args, **kwargs))
+
+async def stop_session(session_id: str, reason: str = REASON_REQUESTED, detail: Optional[str] = None) -> Dict[str, Any]:
+    """Stop a session's recording and release its browser (runs inside a stop job)"""
     if session_id not in active_sessions:
         raise HTTPException(status_code=404, detail="Session not found")
-    
+
     session = active_sessions[session_id]
-    
+    if session.stopping:
+        raise HTTPException(status_code=409, detail="Session is already stopping")
+    session.stopping = True
+    session.end_reason = reason
+
     try:
         recording_path: Optional[str] = None
         recording_duration: Optional[str] = None
+        upload_result: Optional[Dict[str, Any]] = None
+        speaker_turns: Optional[int] = None
+        caption_transcript: Optional[str] = None
+        participant_audio: Optional[Dict[str, Any]] = None
         recording_end_time = datetime.now()
 
         if session.is_recording:
             session.is_recording = False
+            session.recording_end_time = recording_end_time
+            if session.speaker_task:
+                session.speaker_task.cancel()
+            if session.caption_task:
+                session.caption_task.cancel()
+            if session.recorder and session.recorder.start_time:
+                timeline_end_ms = int((time.monotonic() - session.recorder.start_time) * 1000)
+            else:
+                timeline_end_ms = 0
 
             if session.recorder:
-                stopped_path = session.recorder.stop()
+                # Browser capture needs the event loop free to receive its last chunks
+                stopped_path = await _run_stop_step(session.recorder.stop)
                 recording_path = stopped_path or (
                     str(session.recording_path) if session.recording_path else None
                 )
@@ -1102,15 +1785,65 @@ async def stop_recording(request: RecordingStopRequest):
             if session.recording_start_time:
                 recording_duration = str(recording_end_time - session.recording_start_time)
 
+            memory = await _run_stop_step(chrome_memory, session.driver) if session.driver else None
+            await _run_stop_step(update_recording_metadata, session, {
+                "recording_ended_at": recording_end_time.isoformat(),
+                "duration_seconds": round((recording_end_time - session.recording_start_time).total_seconds(), 3)
+                if session.recording_start_time else None,
+                "end_reason": reason,
+                "end_detail": detail,
+                "chrome_profile": CHROME_PROFILE,
+                "chrome_memory": memory,
+            })
+
+            # Needs the browser, so collect it before the driver is shut down below
+            speaker_timeline = await _run_stop_step(save_speaker_timeline, session, timeline_end_ms)
+            if speaker_timeline:
+                speaker_turns = len(speaker_timeline["intervals"])
+            participant_audio = await _run_stop_step(save_participant_audio, session, timeline_end_ms, speaker_timeline)
+            caption_transcript = await _run_stop_step(save_caption_transcript, session)
+            await _run_stop_step(save_session_summary, session)
+
+            # Most segments were shipped during the meeting; only the tail and compose remain
+            if session.uploader:
+                try:
+                    upload_result = await _run_stop_step(session.uploader.finalize)
+                except (StorageError, OSError) as exc:
+                    print(f"❌ Recording upload failed: {exc}")
+                    upload_result = {"error": str(exc)}
+
+            if archive_transcoder and recording_path and os.path.isfile(recording_path):
+                archive_transcoder.submit(recording_path)
+
         # Always attempt to shut down the browser
         if session.driver:
             try:
-                session.driver.quit()
+                await _run_stop_step(session.driver.quit)
             except Exception:
                 pass
 
+        if session.participant_task:
+            session.participant_task.cancel()
+        if session.supervisor_task:
+            session.supervisor_task.cancel()
+
         # Remove session bookkeeping
-        del active_sessions[session_id]
+        # Shutdown may already have cleared it
+        active_sessions.pop(session_id, None)
+        finished_sessions[session_id] = session
+        while len(finished_sessions) > FINISHED_SESSION_LIMIT:
+            finished_sessions.popitem(last=False)
+        session_events.publish(
+            "stopped", session_id,
+            recording_path=recording_path,
+            recording_duration=recording_duration,
+            stopped_at=recording_end_time.isoformat(),
+            upload=upload_result,
+            end_reason=reason,
+        )
+        if recording_path or session.summary:
+            # After save_session_summary above, so the email carries the map-reduce summary
+            asyncio.create_task(send_session_report(session))
 
         return {
             "success": True,
@@ -1119,41 +1852,258 @@ async def stop_recording(request: RecordingStopRequest):
             "recording_path": recording_path,
             "recording_duration": recording_duration,
             "stopped_at": recording_end_time.isoformat(),
+            "upload": upload_result,
+            "speaker_turns": speaker_turns,
+            "caption_transcript": caption_transcript,
+            "participant_tracks": len(participant_audio["tracks"]) if participant_audio else None,
+            "summary": session.summary,
+            "end_reason": reason,
         }
 
     except Exception as e:
+        session.stopping = False
         raise HTTPException(status_code=500, detail=f"Error stopping recording: {str(e)}")
 
+async def _run_stop_job(job: StopJob, detail: Optional[str]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        result = await stop_session(job.session_id, job.reason, detail)
+        STOP_SECONDS.observe(time.perf_counter() - started)
+        return result
+    except HTTPException as exc:
+        STOP_FAILURES.inc()
+        print(f"⚠️ Stopping {job.session_id} failed: {exc.detail}")
+        session_events.publish("stop_failed", job.session_id, job_id=job.job_id, error=exc.detail)
+        raise
+
+def submit_stop(session_id: str, reason: str = REASON_REQUESTED, detail: Optional[str] = None) -> StopJob:
+    """Start stopping a session in the background, or return the stop already under way"""
+    running = stop_jobs.running_for(session_id)
+    if running:
+        return running
+    if session_id not in active_sessions:
+        raise HTTPException(status_code=404, detail="Session not found")
+    job, _ = stop_jobs.submit(session_id, reason, functools.partial(_run_stop_job, detail=detail))
+    session_events.publish("stopping", session_id, job_id=job.job_id, end_reason=reason)
+    return job
+
+def _stop_job_response(job: StopJob) -> Dict[str, Any]:
+    return {**job.to_dict(), "status_url": f"/stop-jobs/{job.job_id}"}
+
+@app.post("/stop-recording", status_code=202)
+async def stop_recording(request: RecordingStopRequest):
+    """Start stopping a recording; returns a job handle to poll (the result arrives with the job)"""
+    return _stop_job_response(submit_stop(request.session_id, REASON_REQUESTED))
+
+@app.get("/stop-jobs/{job_id}")
+async def get_stop_job(job_id: str, wait: float = 0):
+    """Status of a stop job; ``wait`` long-polls up to that many seconds (max 60) for it to finish"""
+    job = stop_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Stop job not found")
+    await stop_jobs.wait(job, min(max(wait, 0.0), 60.0))
+    return _stop_job_response(job)
+
+@app.websocket("/capture/{session_id}")
+async def browser_capture_socket(websocket: WebSocket, session_id: str, token: str = ""):
+    """Receive MediaRecorder chunks from a session's Meet tab"""
+    recorder = recorder_for(session_id, token)
+    if recorder is None:
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive_bytes()
+            ack = await asyncio.to_thread(recorder.write_chunk, message)
+            await websocket.send_text(json.dumps({"ack": ack}))
+    except WebSocketDisconnect:
+        pass
+
+@app.websocket("/capture/{session_id}/audio")
+async def participant_audio_socket(websocket: WebSocket, session_id: str, token: str = ""):
+    """Receive per-participant audio chunks and voice/source events from a session's Meet tab"""
+    sink = sink_for(session_id, token)
+    if sink is None:
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                ack = await asyncio.to_thread(sink.write_chunk, message["bytes"])
+            else:
+                try:
+                    ack = sink.record_event(message["text"])
+                except (ValueError, KeyError, TypeError) as exc:
+                    # Keep the socket open; closing it makes the page reconnect and resend the same message
+                    print(f"⚠️ Bad participant audio message for {session_id}: {exc!r}")
+                    ack = {"error": "malformed control message"}
+            await websocket.send_text(json.dumps(ack))
+    except WebSocketDisconnect:
+        pass
+
 @app.get("/active-sessions")
-async def get_active_sessions():
-    """Get all active recording sessions"""
+async def get_active_sessions(memory: bool = False):
+    """Get all active recording sessions (?memory=1 adds each Chrome process tree's memory)"""
     sessions_info = []
-    for session_id, session in active_sessions.items():
-        sessions_info.append({
+    for session_id, session in list(active_sessions.items()):
+        info = {
             "session_id": session_id,
             "meet_url": session.meet_url,
             "is_recording": session.is_recording,
             "start_time": session.recording_start_time.isoformat() if session.recording_start_time else None,
-            "participant_count": session.participant_count
-        })
-    
-    return {"active_sessions": sessions_info}
+            "participant_count": session.participant_count,
+        }
+        if memory:
+            # Walks /proc for every Chrome process, so dashboards polling this leave it off
+            info["chrome_memory"] = await asyncio.to_thread(chrome_memory, session.driver) if session.driver else None
+        sessions_info.append(info)
+
+    return {"active_sessions": sessions_info, "chrome_profile": CHROME_PROFILE}
+
+@app.get("/selector-stats")
+async def get_selector_stats():
+    """Join-screen selector wins and tries per UI step, best first"""
+    return selector_stats.snapshot()
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus scrape endpoint: join phase latencies, session counts, ffmpeg and email stats"""
+    return Response(content=REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+async def _shutdown_session(session: MeetSession, executor: ThreadPoolExecutor) -> None:
+    """Finalize one session's recorder, close its browser and finish its upload, tracking what is left to do"""
+    loop = asyncio.get_running_loop()
+    session.shutdown_pending = ["recorder", "browser"] + (["upload"] if session.uploader else [])
+    # The watchers poll the driver; stop them before it goes away
+    for task in (session.participant_task, session.supervisor_task, session.speaker_task, session.caption_task):
+        if task:
+            task.cancel()
+    if session.summarizer:
+        session.summarizer.close()
+    if session.recorder:
+        try:
+            await loop.run_in_executor(executor, functools.partial(session.recorder.stop, verify=False))
+        except Exception:
+            pass
+    session.shutdown_pending.remove("recorder")
+    if session.driver:
+        try:
+            await loop.run_in_executor(executor, session.driver.quit)
+        except Exception:
+            pass
+    session.shutdown_pending.remove("browser")
+    fields: Dict[str, Any] = {"end_reason": "shutdown"}
+    if session.uploader:
+        try:
+            fields["upload"] = await loop.run_in_executor(executor, session.uploader.finalize)
+        except Exception as exc:
+            print(f"❌ Recording upload failed during shutdown: {exc}")
+            fields.update({"upload_incomplete": True, "upload_error": str(exc)})
+        session.shutdown_pending.remove("upload")
+    try:
+        update_recording_metadata(session, fields)
+    except Exception:
+        pass
+
+
+def _interrupted_entry(session: MeetSession) -> Dict[str, Any]:
+    recorder = session.recorder
+    uploader = session.uploader
+    proc = getattr(recorder, "proc", None)
+    try:
+        driver_pid = session.driver.service.process.pid if session.driver else None
+    except AttributeError:
+        driver_pid = None
+    return {
+        "session_id": session.session_id,
+        "meet_url": session.meet_url,
+        "recording_path": str(session.recording_path) if session.recording_path else None,
+        "segment_dir": getattr(recorder, "segment_dir", None),
+        "pending_steps": list(getattr(session, "shutdown_pending", [])),
+        "recorder_pids": [proc.pid] if proc is not None and proc.poll() is None else [],
+        "browser_pids": process_tree(driver_pid) if driver_pid else [],
+        "upload": {
+            "object_name": uploader.object_name,
+            "segment_dir": uploader.segment_dir,
+            "content_type": uploader.content_type,
+            "segment_extension": uploader.segment_extension,
+        } if uploader else None,
+    }
+
+
+def recover_interrupted_sessions() -> None:
+    """Finish cleanup for sessions the previous run could not stop in time"""
+    for entry in interrupted_sessions.pending():
+        try:
+            notes = recover_session(entry, upload_backend)
+            print(f"🩹 Recovered interrupted session {entry['session_id']}: {notes}")
+            if entry.get("recording_path"):
+                rel_path = os.path.relpath(entry["recording_path"], RECORDINGS_ROOT).replace(os.sep, "/")
+                recording_catalog.refresh(rel_path)
+        except Exception as exc:
+            print(f"❌ Recovery of {entry.get('session_id')} failed: {exc}")
+        finally:
+            interrupted_sessions.clear(entry["session_id"])
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Clean up all sessions on shutdown"""
-    for session in active_sessions.values():
-        if session.recorder:
-            try:
-                session.recorder.stop()
-            except Exception:
-                pass
-        if session.driver:
-            try:
-                session.driver.quit()
-            except Exception:
-                pass
+    """Stop every session in parallel under one deadline; journal the ones that miss it"""
+    sessions = list(active_sessions.values())
+    if sessions:
+        deadline = time.monotonic() + SHUTDOWN_DEADLINE_SECONDS
+        # Sessions already inside a stop job are left to it (it owns their recorder and driver)
+        stopping: Dict[asyncio.Task, MeetSession] = {}
+        for session in sessions:
+            job = stop_jobs.running_for(session.session_id)
+            if job is not None and job.task is not None:
+                session.shutdown_pending = ["stop_job"] + (["upload"] if session.uploader else [])
+                stopping[job.task] = session
+        sessions = [session for session in sessions if session not in stopping.values()]
+
+        # Signal every ffmpeg at once so they all finalize concurrently
+        for session in sessions:
+            session.is_recording = False
+            if session.recorder:
+                session.recorder.request_stop()
+
+        print(f"🛑 Stopping {len(sessions)} session(s) and awaiting {len(stopping)} stop job(s) "
+              f"within {SHUTDOWN_DEADLINE_SECONDS:.0f}s...")
+        executor = ThreadPoolExecutor(max_workers=max(1, len(sessions) * 2), thread_name_prefix="shutdown")
+        tasks = {asyncio.create_task(_shutdown_session(session, executor)): session for session in sessions}
+        tasks.update(stopping)
+        _, late = await asyncio.wait(tasks, timeout=max(0.0, deadline - time.monotonic()))
+        # Worker threads cannot be interrupted; leave them to finish or die with the process
+        executor.shutdown(wait=False)
+
+        if late:
+            stragglers = [tasks[task] for task in late]
+            for task in late:
+                task.cancel()
+            interrupted_sessions.mark([_interrupted_entry(session) for session in stragglers])
+            for session in stragglers:
+                fields = {"recovery_needed": True, "end_reason": "shutdown_deadline"}
+                if "upload" in session.shutdown_pending:
+                    fields["upload_incomplete"] = True
+                try:
+                    update_recording_metadata(session, fields)
+                except Exception:
+                    pass
+            print(f"⚠️ {len(stragglers)} session(s) missed the shutdown deadline; marked for recovery")
     active_sessions.clear()
+    stop_executor.shutdown(wait=False)
+    report_renderer.shutdown()
+    if archive_transcoder:
+        archive_transcoder.stop()
+    if recording_watcher:
+        recording_watcher.stop()
+    if recording_catalog:
+        recording_catalog.close()
 
 
 
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for frontend_server.py
+
+Starts the frontend server in each mode as a separate process (so client
+threads do not share its interpreter) on a local port and hammers it with
+concurrent clients fetching the real static assets. Reports requests/second
+and latency percentiles, optionally with a stalled client holding a
+connection open (the case that freezes the single-threaded server) and with
+conditional revalidation requests (If-None-Match -> 304). Clients reuse
+connections like browsers do unless --no-keep-alive is given.
+
+Usage:
+    python benchmarks/frontend_server_load.py --duration 5 --concurrency 16
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_SCRIPT = os.path.join(ROOT, 'frontend_server.py')
+
+ASSETS = ['/auth.html', '/dashboard.html', '/styles.css', '/app.js']
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _client(port, deadline, latencies, errors, conditional, keep_alive):
+    etags = {}
+    i = 0
+    conn = None
+    while time.perf_counter() < deadline:
+        path = ASSETS[i % len(ASSETS)]
+        i += 1
+        headers = {}
+        if conditional and path in etags:
+            headers['If-None-Match'] = etags[path]
+        start = time.perf_counter()
+        try:
+            # http.client transparently reconnects when the server closes (HTTP/1.0)
+            if conn is None:
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            conn.request('GET', path, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            if resp.getheader('ETag'):
+                etags[path] = resp.getheader('ETag')
+        except Exception:
+            errors.append(1)
+            conn = None
+            continue
+        finally:
+            if conn is not None and not keep_alive:
+                conn.close()
+                conn = None
+        latencies.append(time.perf_counter() - start)
+    if conn is not None:
+        conn.close()
+
+
+def _stalled_client(port, stop):
+    """Open a connection and send an incomplete request, like a slow mobile client"""
+    try:
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(b'GET /styles.css HTTP/1.1\r\nHost: localhost\r\n')
+        stop.wait()
+        sock.close()
+    except OSError:
+        pass
+
+
+def _wait_for_port(port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server did not start on port {port}")
+
+
+def run(mode, duration, concurrency, conditional, stalled, keep_alive):
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT, '--port', str(port), '--mode', mode, '--quiet'],
+        stdout=subprocess.DEVNULL,
+    )
+    _wait_for_port(port)
+
+    stop = threading.Event()
+    if stalled:
+        threading.Thread(target=_stalled_client, args=(port, stop), daemon=True).start()
+        time.sleep(0.2)
+
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    clients = [
+        threading.Thread(target=_client, args=(port, deadline, latencies, errors, conditional, keep_alive))
+        for _ in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for t in clients:
+        t.start()
+    for t in clients:
+        t.join(timeout=duration + 15)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    server.terminate()
+    server.wait(timeout=5)
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000 if latencies else float('nan')
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else float('nan')
+    return {
+        'mode': mode,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': p50,
+        'p95_ms': p95,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frontend server load benchmark")
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--modes', default='single,threaded')
+    parser.add_argument('--conditional', action='store_true', help="revalidate with If-None-Match")
+    parser.add_argument('--stalled-client', action='store_true', help="hold one connection open")
+    parser.add_argument('--no-keep-alive', action='store_true', help="open a new connection per request")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for mode in args.modes.split(','):
+        result = run(mode, args.duration, args.concurrency, args.conditional,
+                     args.stalled_client, not args.no_keep_alive)
+        print(f"{result['mode']:<10} {result['requests']:>9} {result['errors']:>7} "
+              f"{result['rps']:>9.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
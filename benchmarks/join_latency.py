@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Join-latency benchmark for join_google_meet against local mock-Meet pages
+
+Serves the fixtures in benchmarks/mock_meet/ (lobby and in-call markup for
+several Meet variants) from a local HTTP server. Headless Chrome is launched
+with the backend's own setup_chrome_driver(), and the real join_google_meet()
+is run against each variant several times. Reports join latency p50/p95 per
+variant, the first (cold) join separately, and whether get_participant_count()
+read the expected number of participants once in the call.
+
+Selector statistics start empty for every variant, so the cold join shows
+the fixed-order sweep and the later joins show the learned order. The
+backend's fixed settle sleeps (about 12 s per join) are part of the measured
+time; the interesting part is what varies on top of them.
+
+Variants:
+    ask_to_join  guest lobby, "Ask to join" button, host admits after 1.5 s
+    join_now     guest lobby, "Join now" button
+    aria_button  icon-only join control matched by its aria-label
+    jsname_div   bare div matched only by jsname; participants counted from tiles
+    signed_in    no name field, so the name step always sweeps (not run by default)
+
+Usage:
+    python benchmarks/join_latency.py --runs 5 --wait-seconds 5
+"""
+
+import argparse
+import functools
+import http.server
+import math
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'mock_meet')
+sys.path.insert(0, ROOT)
+
+VARIANTS = ['ask_to_join', 'join_now', 'aria_button', 'jsname_div', 'signed_in']
+DEFAULT_VARIANTS = 'ask_to_join,join_now,aria_button,jsname_div'
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve_fixtures():
+    handler = functools.partial(_QuietHandler, directory=FIXTURES)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _percentile(values, fraction):
+    # Nearest-rank, so p95 of a handful of runs is a real observed value
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _import_backend(wait_seconds):
+    # Importing creates no files; run() swaps in per-variant selector stats before the first join
+    os.environ['JOIN_WAIT_SECONDS'] = str(wait_seconds)
+    import backend
+    return backend
+
+
+def run(backend, driver, base_url, variant, runs, participants, workdir):
+    from selector_stats import SelectorStats
+
+    backend.selector_stats = SelectorStats(
+        os.path.join(workdir, f'{variant}_selectors.json'),
+        fast_timeout=backend.SELECTOR_FAST_TIMEOUT_SECONDS,
+    )
+    url = f"{base_url}/{variant}.html?participants={participants}"
+    latencies, joined, counted = [], 0, 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        ok = backend.join_google_meet(driver, url)
+        latencies.append(time.perf_counter() - started)
+        joined += bool(ok)
+        if backend.get_participant_count(driver) == participants:
+            counted += 1
+    warm = latencies[1:] or latencies
+    return {
+        'variant': variant,
+        'runs': runs,
+        'joined': joined,
+        'counted': counted,
+        'cold_s': latencies[0],
+        'p50_s': statistics.median(warm),
+        'p95_s': _percentile(warm, 0.95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Meet join latency benchmark against local fixtures")
+    parser.add_argument('--runs', type=int, default=5, help="joins per variant (the first is reported as cold)")
+    parser.add_argument('--variants', default=DEFAULT_VARIANTS)
+    parser.add_argument('--participants', type=int, default=4)
+    parser.add_argument('--wait-seconds', type=float, default=5.0,
+                        help="per-selector wait in the join flow (production uses 30)")
+    parser.add_argument('--headed', action='store_true', help="show the browser")
+    args = parser.parse_args()
+
+    variants = args.variants.split(',')
+    for variant in variants:
+        if variant not in VARIANTS:
+            parser.error(f"unknown variant: {variant}")
+
+    server = _serve_fixtures()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    with tempfile.TemporaryDirectory(prefix='join_bench_') as workdir:
+        backend = _import_backend(args.wait_seconds)
+        driver = backend.setup_chrome_driver(headless=not args.headed)
+        try:
+            print(f"{'variant':<12} {'joined':>7} {'count ok':>9} {'cold s':>8} {'p50 s':>7} {'p95 s':>7}")
+            for variant in variants:
+                r = run(backend, driver, base_url, variant, args.runs, args.participants, workdir)
+                print(f"{r['variant']:<12} {r['joined']:>3}/{r['runs']:<3} {r['counted']:>5}/{r['runs']:<3} "
+                      f"{r['cold_s']:>8.2f} {r['p50_s']:>7.2f} {r['p95_s']:>7.2f}")
+        finally:
+            driver.quit()
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+// Shared behaviour for the mock Meet fixtures used by benchmarks/join_latency.py.
+//
+// Each fixture holds its lobby markup in <template id="lobby">. Like the real
+// single-page app, the lobby only appears after a boot delay. Clicking the
+// element marked data-join goes straight into the call, or for "ask to join"
+// lobbies waits to be admitted first. The call view has one tile per
+// participant, a participant-count badge (unless data-count-badge="false")
+// and a "Leave call" button.
+//
+// Query parameters: participants (default 4), render_ms (lobby boot delay,
+// default 800), admit_ms (host admission delay; defaults to the body's
+// data-admit-ms).
+(function () {
+  const params = new URLSearchParams(location.search);
+  const body = document.body;
+  const participants = parseInt(params.get('participants') || '4', 10);
+  const renderMs = parseInt(params.get('render_ms') || '800', 10);
+  const admitMs = parseInt(params.get('admit_ms') || body.dataset.admitMs || '0', 10);
+  const countBadge = body.dataset.countBadge !== 'false';
+
+  function toggle(el) {
+    if (el.hasAttribute('data-is-muted')) {
+      const muted = el.getAttribute('data-is-muted') === 'true';
+      el.setAttribute('data-is-muted', String(!muted));
+      el.setAttribute('aria-label', muted ? 'Turn off microphone (ctrl + d)' : 'Turn on microphone (ctrl + d)');
+    } else if (el.hasAttribute('data-is-camera-on')) {
+      const on = el.getAttribute('data-is-camera-on') === 'true';
+      el.setAttribute('data-is-camera-on', String(!on));
+      el.setAttribute('aria-label', on ? 'Turn on camera (ctrl + e)' : 'Turn off camera (ctrl + e)');
+    }
+  }
+
+  function enterCall() {
+    const tiles = [];
+    for (let i = 0; i < participants; i++) {
+      const name = i === 0 ? 'AI Assistant' : `Participant ${i}`;
+      tiles.push(`<div class="tile" data-participant-id="spaces/mock/devices/${i}"><span class="tile-name">${name}</span></div>`);
+    }
+    const badge = countBadge
+      ? `<button class="people" aria-label="Show everyone"><span data-participant-count="${participants}">${participants}</span></button>`
+      : '';
+    body.innerHTML = `
+      <main class="call">
+        <section class="grid">${tiles.join('')}</section>
+        <nav class="controls">
+          <button aria-label="Turn off microphone (ctrl + d)" data-is-muted="true"></button>
+          <button aria-label="Turn on captions (c)"></button>
+          ${badge}
+          <button class="leave" aria-label="Leave call"></button>
+        </nav>
+      </main>`;
+  }
+
+  function join() {
+    if (admitMs > 0) {
+      body.innerHTML = '<main class="lobby"><p>Asking to be let in...</p></main>';
+      setTimeout(enterCall, admitMs);
+    } else {
+      enterCall();
+    }
+  }
+
+  setTimeout(() => {
+    const lobby = document.getElementById('lobby');
+    body.appendChild(lobby.content.cloneNode(true));
+    body.querySelectorAll('[data-is-muted], [data-is-camera-on]').forEach((el) => {
+      el.addEventListener('click', () => toggle(el));
+    });
+    body.querySelector('[data-join]').addEventListener('click', join);
+  }, renderMs);
+})();
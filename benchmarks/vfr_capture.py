@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Capture-profile benchmark for recorder.py
+
+Renders synthetic meeting content with ffmpeg's lavfi sources to a lossless
+intermediate (so every profile decodes the same input), then encodes it with
+the recorder's real video arguments for each capture profile. Reports output
+size, frames written, and the encoder's CPU time (user+sys of the ffmpeg
+child, minus a decode-only pass), relative to the constant-rate "standard"
+profile.
+
+Scenarios:
+    slide        static slide, the common "someone is presenting" case
+    grid         dark tile grid with one small moving camera tile
+    screenshare  full-screen motion (testsrc2), the worst case for VFR
+    meeting      slide -> grid -> screenshare -> slide, back to back
+
+Usage:
+    python benchmarks/vfr_capture.py --seconds 30 --profiles standard,vfr
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from recorder import CAPTURE_PROFILES, video_args  # noqa: E402
+
+SIZE = '1280x720'
+FPS = 25
+
+
+def _slide(seconds):
+    return f"smptehdbars=s={SIZE}:r={FPS}:d={seconds}"
+
+
+def _grid(seconds):
+    tiles = ''.join(
+        f",drawbox=x={x}:y={y}:w=620:h=340:color=0x3c4043:t=fill"
+        for x in (10, 650) for y in (10, 370)
+    )
+    return (
+        f"color=c=0x202124:s={SIZE}:r={FPS}:d={seconds}{tiles}[bg];"
+        f"testsrc2=s=300x170:r={FPS}:d={seconds}[cam];"
+        f"[bg][cam]overlay=x=170:y=85:shortest=1"
+    )
+
+
+def _screenshare(seconds):
+    return f"testsrc2=s={SIZE}:r={FPS}:d={seconds}"
+
+
+SCENARIOS = {
+    'slide': lambda s: _slide(s),
+    'grid': lambda s: _grid(s),
+    'screenshare': lambda s: _screenshare(s),
+    'meeting': lambda s: (
+        f"{_slide(s / 4)}[a];{_grid(s / 4)}[b];{_screenshare(s / 4)}[c];{_slide(s / 4)}[d];"
+        f"[a][b][c][d]concat=n=4:v=1:a=0"
+    ),
+}
+
+
+def _run_ffmpeg(args):
+    """Run ffmpeg and return the CPU seconds (user+sys) it used"""
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    subprocess.run(['ffmpeg', '-nostdin', '-y', '-v', 'error', *args], check=True)
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+
+
+def _packet_count(path):
+    out = subprocess.run(
+        ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-count_packets',
+         '-show_entries', 'stream=nb_read_packets', '-of', 'json', path],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return int(json.loads(out)['streams'][0]['nb_read_packets'])
+
+
+def _profile_args(profile):
+    # The recorder's own argument builder, without probing displays or audio devices
+    return video_args(profile, FPS)
+
+
+def run(scenario, seconds, profiles, workdir):
+    source = os.path.join(workdir, f'{scenario}.mkv')
+    _run_ffmpeg(['-f', 'lavfi', '-i', SCENARIOS[scenario](seconds) + '[out0]',
+                 '-c:v', 'libx264', '-preset', 'ultrafast', '-qp', '0', source])
+    decode_cpu = _run_ffmpeg(['-i', source, '-f', 'null', '-'])
+
+    results = []
+    for profile in profiles:
+        out = os.path.join(workdir, f'{scenario}_{profile}.mp4')
+        cpu = _run_ffmpeg(['-i', source, *_profile_args(profile), '-an', out])
+        results.append({
+            'scenario': scenario,
+            'profile': profile,
+            'size_mb': os.path.getsize(out) / 1e6,
+            'frames': _packet_count(out),
+            'cpu_s': max(cpu - decode_cpu, 0.0),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture profile size/CPU benchmark")
+    parser.add_argument('--seconds', type=float, default=30.0)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--profiles', default='standard,vfr')
+    args = parser.parse_args()
+
+    profiles = args.profiles.split(',')
+    for profile in profiles:
+        if profile not in CAPTURE_PROFILES:
+            parser.error(f"unknown profile: {profile}")
+    baseline = profiles[0]
+
+    print(f"{'scenario':<12} {'profile':<9} {'frames':>7} {'size MB':>8} {'cpu s':>7} "
+          f"{'size vs ' + baseline:>16} {'cpu vs ' + baseline:>15}")
+    with tempfile.TemporaryDirectory(prefix='vfr_bench_') as workdir:
+        for scenario in args.scenarios.split(','):
+            results = run(scenario, args.seconds, profiles, workdir)
+            base = results[0]
+            for r in results:
+                size_delta = (r['size_mb'] / base['size_mb'] - 1) * 100 if base['size_mb'] else 0.0
+                cpu_delta = (r['cpu_s'] / base['cpu_s'] - 1) * 100 if base['cpu_s'] else 0.0
+                print(f"{r['scenario']:<12} {r['profile']:<9} {r['frames']:>7} {r['size_mb']:>8.2f} "
+                      f"{r['cpu_s']:>7.2f} {size_delta:>+15.1f}% {cpu_delta:>+14.1f}%")
+
+
+if __name__ == '__main__':
+    main()
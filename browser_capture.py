@@ -0,0 +1,371 @@
+# browser_capture.py
+"""
+In-browser recording of the Meet tab.
+
+Instead of pointing x11grab at the whole desktop, an injected script records
+the meeting inside Chrome with MediaRecorder and streams the encoded WebM
+chunks to the backend over a local WebSocket. The script prefers tab capture
+(``getDisplayMedia`` with ``preferCurrentTab``, auto-accepted by a Chrome
+switch). If that is unavailable, it composites the page's ``<video>``
+elements onto a canvas and mixes the remote audio with WebAudio. This works
+headless as well. No X display, desktop compositing or libx264 re-encode is
+involved.
+
+Every chunk carries a sequence number and is acknowledged by the backend.
+The page keeps unacknowledged chunks and resends them after a reconnect, so
+a dropped socket does not leave a hole in the file.
+"""
+
+import os
+import hmac
+import json
+import time
+import struct
+import secrets
+import datetime
+import threading
+from typing import Any, Dict, List, Optional
+
+from recorder import SEGMENT_LIST_NAME
+
+# Extra Chrome switches for this mode: accept the tab-capture prompt and let the
+# WebAudio mixer start without a click
+BROWSER_CAPTURE_CHROME_ARGS = [
+    "--auto-accept-this-tab-capture",
+    "--autoplay-policy=no-user-gesture-required",
+]
+
+_CAPTURE_TEMPLATE = """
+(async () => {
+    if (window.__meetCapture) return window.__meetCapture.info;
+    const URL = %(url)s, FPS = %(fps)s, TIMESLICE = %(timeslice)s, STOP_TIMEOUT = %(stop_timeout)s;
+    const W = %(width)s, H = %(height)s;
+
+    let stream = null, mode = 'tab', stopComposite = null;
+    try {
+        stream = await navigator.mediaDevices.getDisplayMedia({
+            video: {frameRate: FPS},
+            audio: {suppressLocalAudioPlayback: false},
+            preferCurrentTab: true,
+            selfBrowserSurface: 'include',
+            surfaceSwitching: 'exclude',
+        });
+    } catch (e) {
+        stream = null;
+    }
+
+    if (!stream) {
+        // Composite fallback: draw the visible participant videos into a grid and mix every
+        // remote audio stream the page is playing
+        mode = 'composite';
+        const canvas = document.createElement('canvas');
+        canvas.width = W; canvas.height = H;
+        const ctx = canvas.getContext('2d');
+        const audio = new AudioContext();
+        const dest = audio.createMediaStreamDestination();
+        const wired = new Set();
+        const draw = () => {
+            for (const el of document.querySelectorAll('audio, video')) {
+                const s = el.srcObject;
+                if (!s || wired.has(s.id) || !s.getAudioTracks || !s.getAudioTracks().length) continue;
+                wired.add(s.id);
+                audio.createMediaStreamSource(s).connect(dest);
+            }
+            ctx.fillStyle = '#202124';
+            ctx.fillRect(0, 0, W, H);
+            const videos = [...document.querySelectorAll('video')]
+                .filter(v => v.readyState >= 2 && v.videoWidth && v.offsetParent);
+            if (!videos.length) return;
+            const cols = Math.ceil(Math.sqrt(videos.length)), rows = Math.ceil(videos.length / cols);
+            const w = W / cols, h = H / rows;
+            videos.forEach((v, i) => {
+                const scale = Math.min(w / v.videoWidth, h / v.videoHeight);
+                const dw = v.videoWidth * scale, dh = v.videoHeight * scale;
+                ctx.drawImage(v, (i %% cols) * w + (w - dw) / 2, Math.floor(i / cols) * h + (h - dh) / 2, dw, dh);
+            });
+        };
+        const timer = setInterval(draw, 1000 / FPS);
+        stream = canvas.captureStream(FPS);
+        dest.stream.getAudioTracks().forEach(t => stream.addTrack(t));
+        stopComposite = () => { clearInterval(timer); audio.close(); };
+    }
+
+    const mimeType = ['video/webm;codecs=vp8,opus', 'video/webm;codecs=vp9,opus', 'video/webm']
+        .find(t => MediaRecorder.isTypeSupported(t));
+    const recorder = new MediaRecorder(stream, {mimeType, videoBitsPerSecond: %(video_bps)s, audioBitsPerSecond: 128000});
+
+    const pending = [];
+    let seq = 0, ws = null, closed = false, recorderDone = false, onDrained = null;
+    const send = (item) => { if (ws && ws.readyState === 1) ws.send(item.blob); };
+    const connect = () => {
+        ws = new WebSocket(URL);
+        ws.onopen = () => pending.forEach(send);
+        ws.onmessage = (ev) => {
+            const ack = JSON.parse(ev.data).ack;
+            while (pending.length && pending[0].seq <= ack) pending.shift();
+            if (recorderDone && !pending.length && onDrained) onDrained();
+        };
+        ws.onclose = () => { if (!closed) setTimeout(connect, 1000); };
+    };
+    connect();
+
+    recorder.ondataavailable = (ev) => {
+        if (!ev.data || !ev.data.size) return;
+        const header = new ArrayBuffer(8);
+        new DataView(header).setBigUint64(0, BigInt(seq));
+        const item = {seq: seq++, blob: new Blob([header, ev.data])};
+        pending.push(item);
+        send(item);
+    };
+
+    const info = {mode, mimeType, startedAt: performance.timeOrigin + performance.now()};
+    window.__meetCapture = {
+        info,
+        stop: () => new Promise((resolve) => {
+            let done = false;
+            const finish = () => {
+                if (done) return;
+                done = true;
+                closed = true;
+                try { ws.close(); } catch (e) {}
+                stream.getTracks().forEach(t => t.stop());
+                if (stopComposite) stopComposite();
+                resolve({chunks: seq, unacked: pending.length});
+            };
+            onDrained = finish;
+            recorder.onstop = () => { recorderDone = true; if (!pending.length) finish(); };
+            if (recorder.state !== 'inactive') recorder.stop(); else recorder.onstop();
+            setTimeout(finish, STOP_TIMEOUT);
+        }),
+    };
+    recorder.start(TIMESLICE);
+    return info;
+})()
+"""
+
+
+class BrowserCaptureError(Exception):
+    """Raised when the in-page recorder cannot be started."""
+
+
+def evaluate_async(driver, expression: str) -> Any:
+    """Evaluate a (promise-returning) expression in the page with user activation.
+
+    Runtime.evaluate with userGesture gives getDisplayMedia and AudioContext the
+    user activation they require.
+    """
+    result = driver.execute_cdp_cmd("Runtime.evaluate", {
+        "expression": expression,
+        "awaitPromise": True,
+        "returnByValue": True,
+        "userGesture": True,
+    })
+    if result.get("exceptionDetails"):
+        details = result["exceptionDetails"]
+        raise BrowserCaptureError((details.get("exception") or {}).get("description") or details.get("text"))
+    return (result.get("result") or {}).get("value")
+
+
+# Recorders waiting for chunks, keyed by session id
+_active: Dict[str, "BrowserRecorder"] = {}
+_active_lock = threading.Lock()
+
+
+def recorder_for(session_id: str, token: str) -> Optional["BrowserRecorder"]:
+    """Look up the recorder a capture socket belongs to, checking its token."""
+    with _active_lock:
+        recorder = _active.get(session_id)
+    if recorder is None or not hmac.compare_digest(recorder.token, token or ""):
+        return None
+    return recorder
+
+
+class BrowserRecorder:
+    """MediaRecorder capture of the Meet tab, with the same interface as FFmpegRecorder."""
+
+    def __init__(
+        self,
+        driver,
+        session_id: str,
+        out_dir: str,
+        base_name: str,
+        ws_base: str,
+        fps: int = 15,
+        timeslice_ms: int = 1000,
+        segment_seconds: int = None,
+        video_bps: int = 1_500_000,
+        size: tuple = (1280, 720),
+        stop_timeout: float = 15.0,
+    ):
+        self.driver = driver
+        self.session_id = session_id
+        self.ws_base = ws_base.rstrip("/")
+        self.fps = fps
+        self.timeslice_ms = timeslice_ms
+        self.video_bps = video_bps
+        self.size = size
+        self.stop_timeout = stop_timeout
+        self.token = secrets.token_urlsafe(24)
+
+        os.makedirs(out_dir, exist_ok=True)
+        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        safe = "".join(c for c in base_name if c.isalnum() or c in " _-").strip()
+        self.out_path = os.path.join(out_dir, f"{safe}_{ts}.webm")
+        # Segments are cut on chunk boundaries; WebM chunks from one MediaRecorder
+        # concatenate back into a valid file
+        self.segment_seconds = segment_seconds
+        self.segment_dir = None
+        if segment_seconds:
+            self.segment_dir = os.path.join(out_dir, f"{safe}_{ts}_segments")
+            os.makedirs(self.segment_dir, exist_ok=True)
+        self._chunks_per_segment = max(1, int(segment_seconds * 1000 / timeslice_ms)) if segment_seconds else 0
+
+        self.mode: Optional[str] = None
+        self.mime_type: Optional[str] = None
+        self.page_started_ms: Optional[float] = None
+        self.is_recording = False
+        self.start_time = None
+        self.bytes_received = 0
+        self.last_chunk_at: Optional[float] = None
+        self._next_seq = 0
+        self._segment_index = 0
+        self._segment_chunks = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    def capture_url(self) -> str:
+        return f"{self.ws_base}/capture/{self.session_id}?token={self.token}"
+
+    def _script(self) -> str:
+        return _CAPTURE_TEMPLATE % {
+            "url": json.dumps(self.capture_url()),
+            "fps": int(self.fps),
+            "timeslice": int(self.timeslice_ms),
+            "stop_timeout": int(self.stop_timeout * 1000),
+            "width": int(self.size[0]),
+            "height": int(self.size[1]),
+            "video_bps": int(self.video_bps),
+        }
+
+    def _open_output(self) -> None:
+        if self.segment_dir:
+            self._file = open(os.path.join(self.segment_dir, f"segment_{self._segment_index:05d}.webm"), "wb")
+        else:
+            self._file = open(self.out_path, "wb")
+
+    def _close_segment(self) -> None:
+        """Finish the current segment and list it so the uploader can ship it."""
+        self._file.close()
+        self._file = None
+        with open(os.path.join(self.segment_dir, SEGMENT_LIST_NAME), "a") as f:
+            f.write(f"segment_{self._segment_index:05d}.webm\n")
+        self._segment_index += 1
+        self._segment_chunks = 0
+
+    def start(self) -> bool:
+        with self._lock:
+            self._open_output()
+        with _active_lock:
+            _active[self.session_id] = self
+        try:
+            info = evaluate_async(self.driver, self._script()) or {}
+        except Exception as exc:
+            print(f"❌ In-browser capture failed to start: {exc}")
+            self._release()
+            return False
+        self.start_time = time.monotonic()
+        self.mode = info.get("mode")
+        self.mime_type = info.get("mimeType")
+        self.page_started_ms = info.get("startedAt")
+        self.is_recording = True
+        print(f"🎥 In-browser capture started ({self.mode}, {self.mime_type}) -> {self.out_path}")
+        return True
+
+    def write_chunk(self, message: bytes) -> int:
+        """Append one ``[u64 seq][webm bytes]`` message; returns the highest contiguous seq written."""
+        if len(message) < 8:
+            return self._next_seq - 1
+        seq = struct.unpack(">Q", message[:8])[0]
+        with self._lock:
+            # Resends after a reconnect repeat chunks we already have; a gap means the
+            # page will resend from the last ack, so wait for that
+            if seq == self._next_seq and self._file is not None:
+                self._file.write(message[8:])
+                self._file.flush()
+                self.bytes_received += len(message) - 8
+                self.last_chunk_at = time.monotonic()
+                self._next_seq += 1
+                if self.segment_dir:
+                    self._segment_chunks += 1
+                    if self._segment_chunks >= self._chunks_per_segment:
+                        self._close_segment()
+                        self._open_output()
+            return self._next_seq - 1
+
+    def is_active(self) -> bool:
+        """True while chunks keep arriving (a stalled page counts as stopped)"""
+        if not self.is_recording:
+            return False
+        stall_seconds = max(10.0, 5 * self.timeslice_ms / 1000.0)
+        return time.monotonic() - (self.last_chunk_at or self.start_time) < stall_seconds
+
+    def segment_paths(self) -> List[str]:
+        if not self.segment_dir or not os.path.isdir(self.segment_dir):
+            return []
+        return sorted(
+            os.path.join(self.segment_dir, name)
+            for name in os.listdir(self.segment_dir)
+            if name.startswith("segment_") and name.endswith(".webm")
+        )
+
+    def _release(self) -> None:
+        with _active_lock:
+            if _active.get(self.session_id) is self:
+                del _active[self.session_id]
+        with self._lock:
+            if self._file is not None:
+                if self.segment_dir and self._segment_chunks:
+                    self._close_segment()
+                else:
+                    self._file.close()
+                    self._file = None
+
+    def _join_segments(self) -> None:
+        with open(self.out_path, "wb") as out:
+            for path in self.segment_paths():
+                if os.path.getsize(path) == 0:
+                    os.remove(path)
+                    continue
+                with open(path, "rb") as f:
+                    while True:
+                        block = f.read(1 << 20)
+                        if not block:
+                            break
+                        out.write(block)
+
+    def request_stop(self) -> None:
+        """Nothing to signal ahead of stop(); the page recorder is flushed there"""
+
+    def stop(self, verify: bool = True) -> Optional[str]:
+        # verify matches FFmpegRecorder.stop; chunks are already checked as they arrive
+        if not self.is_recording:
+            return None
+        self.is_recording = False
+        print("🛑 Stopping in-browser capture...")
+        try:
+            result = evaluate_async(self.driver, "window.__meetCapture ? window.__meetCapture.stop() : null") or {}
+            if result.get("unacked"):
+                print(f"⚠️ {result['unacked']} capture chunk(s) were not delivered before stop")
+        except Exception as exc:
+            print(f"⚠️ Could not stop the page recorder cleanly: {exc}")
+        finally:
+            self._release()
+
+        if self.segment_dir:
+            self._join_segments()
+        if os.path.exists(self.out_path) and os.path.getsize(self.out_path) > 0:
+            print(f"✅ Recording saved: {os.path.basename(self.out_path)} "
+                  f"({self.bytes_received / 1024 / 1024:.1f} MB, {self._next_seq} chunks)")
+            return self.out_path
+        print("❌ In-browser capture produced no data")
+        return None
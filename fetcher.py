@@ -0,0 +1,337 @@
+# fetcher.py
+"""
+Parallel ranged download with resume.
+
+Recordings are fetched as concurrent byte ranges over a small pool of
+keep-alive HTTP connections and written with positional writes into a
+preallocated ``.part`` file. Finished ranges are recorded in a sidecar
+progress file, so an interrupted download resumes with only the missing
+ranges. The result is verified (GCS ``x-goog-hash`` MD5 when available, or a
+caller-supplied SHA-256) before it is moved into place.
+"""
+
+import os
+import json
+import queue
+import base64
+import hashlib
+import threading
+import http.client
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Optional, Set, Tuple
+from urllib.parse import urlsplit, urljoin
+
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+READ_SIZE = 256 * 1024
+MAX_REDIRECTS = 5
+
+
+class DownloadError(Exception):
+    """Raised when a download cannot be completed or fails verification."""
+
+
+class ConnectionPool:
+    """A bounded set of reusable HTTP(S) connections to one origin."""
+
+    def __init__(self, url: str, maxsize: int = 8, timeout: float = 30.0):
+        parts = urlsplit(url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize)
+
+    def _new(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._new()
+        try:
+            conn.request(method, target, headers=headers)
+            return conn, conn.getresponse()
+        except (http.client.HTTPException, OSError):
+            # Stale keep-alive connection; retry once on a fresh one
+            conn.close()
+            conn = self._new()
+            conn.request(method, target, headers=headers)
+            return conn, conn.getresponse()
+
+    def release(self, conn: http.client.HTTPConnection, reusable: bool = True) -> None:
+        if not reusable:
+            conn.close()
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def _target(url: str) -> str:
+    parts = urlsplit(url)
+    return (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+
+def _goog_md5(header: Optional[str]) -> Optional[str]:
+    """Extract the base64 MD5 from a GCS ``x-goog-hash`` header."""
+    if not header:
+        return None
+    for item in header.split(","):
+        key, _, value = item.strip().partition("=")
+        if key == "md5":
+            return value
+    return None
+
+
+def _if_range_validator(meta: Dict[str, Any]) -> Optional[str]:
+    """If-Range needs a strong validator; a weak ETag (``W/"..."``) would turn every range into a 200."""
+    etag = meta.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return meta.get("last_modified")
+
+
+class RangedDownloader:
+    """Downloads one URL as parallel byte ranges with resume and verification."""
+
+    def __init__(
+        self,
+        url: str,
+        dest: str,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_workers: int = 8,
+        retries: int = 3,
+        expected_sha256: Optional[str] = None,
+        timeout: float = 30.0,
+    ):
+        self.url = url
+        self.dest = dest
+        self.part_path = dest + ".part"
+        self.progress_path = dest + ".progress.json"
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self.retries = retries
+        self.expected_sha256 = expected_sha256
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._done: Set[int] = set()
+        self._resumed = 0
+        self._pool: Optional[ConnectionPool] = None
+
+    # -- metadata -----------------------------------------------------------
+
+    def _head(self) -> Dict[str, Any]:
+        url = self.url
+        for _ in range(MAX_REDIRECTS + 1):
+            pool = ConnectionPool(url, 1, self.timeout)
+            try:
+                conn, resp = pool.request("HEAD", _target(url), {})
+                resp.read()
+                conn.close()
+            finally:
+                pool.close()
+            if resp.status in (301, 302, 303, 307, 308):
+                url = urljoin(url, resp.getheader("Location"))
+                continue
+            if resp.status != 200:
+                raise DownloadError(f"HEAD {url} returned {resp.status}")
+            length = resp.getheader("Content-Length")
+            return {
+                "url": url,
+                "size": int(length) if length is not None else None,
+                "ranges": (resp.getheader("Accept-Ranges") or "").lower() == "bytes",
+                "etag": resp.getheader("ETag"),
+                "last_modified": resp.getheader("Last-Modified"),
+                "md5": _goog_md5(resp.getheader("x-goog-hash")),
+            }
+        raise DownloadError(f"Too many redirects for {self.url}")
+
+    def _load_progress(self, meta: Dict[str, Any]) -> None:
+        try:
+            with open(self.progress_path) as f:
+                saved = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        same = (
+            saved.get("url") == meta["url"]
+            and saved.get("size") == meta["size"]
+            and saved.get("etag") == meta["etag"]
+            and saved.get("last_modified") == meta["last_modified"]
+            and saved.get("part_size") == self.part_size
+            and os.path.exists(self.part_path)
+        )
+        if same:
+            self._done = set(saved.get("done", []))
+            self._resumed = len(self._done)
+            print(f"🔁 Resuming {self.dest}: {self._resumed} part(s) already downloaded")
+
+    def _save_progress(self, meta: Dict[str, Any]) -> None:
+        # Called with self._lock held
+        state = {
+            "url": meta["url"],
+            "size": meta["size"],
+            "etag": meta["etag"],
+            "last_modified": meta["last_modified"],
+            "part_size": self.part_size,
+            "done": sorted(self._done),
+        }
+        tmp = self.progress_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.progress_path)
+
+    # -- transfer -----------------------------------------------------------
+
+    def _fetch_range(self, fd: int, meta: Dict[str, Any], index: int) -> None:
+        start = index * self.part_size
+        end = min(start + self.part_size, meta["size"]) - 1
+        headers = {"Range": f"bytes={start}-{end}"}
+        validator = _if_range_validator(meta)
+        if validator:
+            # If the object changed, the server sends 200 (whole body) instead of 206
+            headers["If-Range"] = validator
+
+        last_error: Optional[Exception] = None
+        for _attempt in range(self.retries):
+            conn = None
+            try:
+                conn, resp = self._pool.request("GET", _target(meta["url"]), headers)
+                if resp.status != 206:
+                    resp.read()
+                    self._pool.release(conn, reusable=False)
+                    raise DownloadError(f"Range {start}-{end} returned {resp.status} (object changed?)")
+
+                buf = bytearray(READ_SIZE)
+                view = memoryview(buf)
+                offset = start
+                while True:
+                    n = resp.readinto(view)
+                    if not n:
+                        break
+                    os.pwrite(fd, view[:n], offset)
+                    offset += n
+                if offset != end + 1:
+                    raise DownloadError(f"Range {start}-{end} truncated at {offset}")
+
+                self._pool.release(conn, reusable=not resp.will_close)
+                with self._lock:
+                    self._done.add(index)
+                    self._save_progress(meta)
+                return
+            except DownloadError as exc:
+                if "object changed" in str(exc):
+                    raise
+                last_error = exc
+            except (http.client.HTTPException, OSError) as exc:
+                last_error = exc
+            if conn is not None:
+                conn.close()
+        raise DownloadError(f"Range {start}-{end} failed after {self.retries} attempts: {last_error}")
+
+    def _download_whole(self, meta: Dict[str, Any]) -> None:
+        """Fallback for servers without Range support: one sequential stream."""
+        pool = ConnectionPool(meta["url"], 1, self.timeout)
+        try:
+            conn, resp = pool.request("GET", _target(meta["url"]), {})
+            if resp.status != 200:
+                raise DownloadError(f"GET {meta['url']} returned {resp.status}")
+            with open(self.part_path, "wb") as f:
+                buf = bytearray(READ_SIZE)
+                view = memoryview(buf)
+                while True:
+                    n = resp.readinto(view)
+                    if not n:
+                        break
+                    f.write(view[:n])
+            conn.close()
+        finally:
+            pool.close()
+
+    def _verify(self, meta: Dict[str, Any]) -> Dict[str, str]:
+        md5 = hashlib.md5()
+        sha256 = hashlib.sha256()
+        with open(self.part_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                md5.update(block)
+                sha256.update(block)
+        md5_b64 = base64.b64encode(md5.digest()).decode()
+        sha_hex = sha256.hexdigest()
+        if meta.get("md5") and meta["md5"] != md5_b64:
+            raise DownloadError(f"MD5 mismatch: expected {meta['md5']}, got {md5_b64}")
+        if self.expected_sha256 and self.expected_sha256.lower() != sha_hex:
+            raise DownloadError(f"SHA-256 mismatch: expected {self.expected_sha256}, got {sha_hex}")
+        return {"md5": md5_b64, "sha256": sha_hex}
+
+    def run(self) -> Dict[str, Any]:
+        meta = self._head()
+        os.makedirs(os.path.dirname(os.path.abspath(self.dest)), exist_ok=True)
+
+        if not meta["ranges"] or not meta["size"]:
+            self._download_whole(meta)
+            parts = 1
+        else:
+            self._load_progress(meta)
+            parts = (meta["size"] + self.part_size - 1) // self.part_size
+            fd = os.open(self.part_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size != meta["size"]:
+                    os.ftruncate(fd, meta["size"])
+                    if hasattr(os, "posix_fallocate"):
+                        try:
+                            os.posix_fallocate(fd, 0, meta["size"])
+                        except OSError:
+                            pass  # not supported by every filesystem; ftruncate is enough
+
+                missing = [i for i in range(parts) if i not in self._done]
+                self._pool = ConnectionPool(meta["url"], self.max_workers, self.timeout)
+                try:
+                    with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="range-fetch") as pool:
+                        futures = [pool.submit(self._fetch_range, fd, meta, i) for i in missing]
+                        for future in as_completed(futures):
+                            future.result()
+                finally:
+                    self._pool.close()
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        try:
+            checksums = self._verify(meta)
+        except DownloadError:
+            # Corrupt data must not be resumed from; start clean next time
+            for path in (self.part_path, self.progress_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            raise
+        os.replace(self.part_path, self.dest)
+        try:
+            os.remove(self.progress_path)
+        except FileNotFoundError:
+            pass
+
+        return {
+            "path": self.dest,
+            "size": os.path.getsize(self.dest),
+            "parts": parts,
+            "resumed_parts": self._resumed,
+            **checksums,
+        }
+
+
+def download_file(public_url: str, local_filename: str, **kwargs) -> Dict[str, Any]:
+    """Download a file from a public URL with parallel ranges and resume."""
+    result = RangedDownloader(public_url, local_filename, **kwargs).run()
+    print(f"Downloaded to {local_filename}")
+    return result
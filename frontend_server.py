@@ -6,72 +6,244 @@ Serves static files on port 8080
 
 import http.server
 import socketserver
+import email.utils
+import functools
+import argparse
+import shutil
+import socket
 import os
 import sys
-from urllib.parse import urlparse
+from urllib.parse import urlparse, unquote
+
+from asset_index import AssetIndex, choose_encoding, start_watcher
+
+# Cache-Control per file extension. HTML must always be revalidated so new builds are
+# picked up immediately; everything else can be cached and revalidated with ETags.
+DEFAULT_CACHE_CONTROL = os.getenv('FRONTEND_CACHE_CONTROL', 'public, max-age=3600')
+HTML_CACHE_CONTROL = os.getenv('FRONTEND_HTML_CACHE_CONTROL', 'no-store')
+CACHE_POLICY = {
+    '.html': HTML_CACHE_CONTROL,
+}
+
+SENDFILE_CHUNK = 1 << 20
+
+
+def cache_control_for(path):
+    """Return the Cache-Control header value for a file path"""
+    _, ext = os.path.splitext(path)
+    return CACHE_POLICY.get(ext.lower(), DEFAULT_CACHE_CONTROL)
+
 
 class CORSHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     """HTTP request handler with CORS support"""
-    
+
+    # Headers and the sendfile body go out as separate writes; without TCP_NODELAY the
+    # tail of the body waits on the client's delayed ACK on kept-alive connections.
+    disable_nagle_algorithm = True
+
     def end_headers(self):
         # Add CORS headers
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
-        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-        self.send_header('Pragma', 'no-cache')
-        self.send_header('Expires', '0')
         super().end_headers()
-    
+
     def do_OPTIONS(self):
         """Handle preflight OPTIONS requests"""
         self.send_response(200)
+        self.send_header('Content-Length', '0')
         self.end_headers()
-    
-    def do_GET(self):
-        """Handle GET requests with proper routing"""
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
-        
+
+    def resolve_path(self):
+        """Map the request path onto an indexed asset path, or None if forbidden"""
+        path = unquote(urlparse(self.path).path)
+
         # Default to auth.html for root path
         if path == '/':
             path = '/auth.html'
-        
-        # Remove leading slash for file system
+
+        # Remove leading slash for index lookup
         if path.startswith('/'):
             path = path[1:]
-        
+
         # Security check - prevent directory traversal
         if '..' in path or path.startswith('/'):
-            self.send_error(403, "Forbidden")
+            return None
+
+        # Extensionless routes map onto their page, e.g. /dashboard -> dashboard.html
+        if not os.path.splitext(path)[1] and self.server.asset_index.get(path + '.html'):
+            path += '.html'
+
+        return path
+
+    def do_GET(self):
+        """Handle GET requests from the in-memory asset index"""
+        body = self.send_head()
+        if body is None:
             return
-        
-        # Check if file exists
-        if not os.path.exists(path):
-            # For SPA routing, serve auth.html for unknown routes
-            if not path.endswith(('.html', '.css', '.js', '.ico', '.png', '.jpg', '.svg')):
-                path = 'auth.html'
-        
-        # Set the path for the parent class
-        self.path = '/' + path
-        
-        # Call parent implementation
-        super().do_GET()
-    
+        if isinstance(body, bytes):
+            self.wfile.write(body)
+            return
+        try:
+            self.send_body(body)
+        finally:
+            body.close()
+
+    def do_HEAD(self):
+        """Handle HEAD requests"""
+        body = self.send_head()
+        if body is not None and not isinstance(body, bytes):
+            body.close()
+
+    def send_head(self):
+        """Send status and headers, honouring If-None-Match / If-Modified-Since
+
+        Returns the body to send: bytes for in-memory assets, an open file for
+        assets too large to index, or None when no body follows.
+        """
+        path = self.resolve_path()
+        if path is None:
+            self.send_error(403, "Forbidden")
+            return None
+
+        asset = self.server.asset_index.get(path)
+        if asset is None:
+            self.send_error(404, "File not found")
+            return None
+
+        encoding = choose_encoding(self.headers.get('Accept-Encoding'), asset.variants)
+        etag = asset.etag(encoding)
+        last_modified = self.date_time_string(int(asset.mtime))
+        cache_control = cache_control_for(path)
+        vary = len(asset.variants) > 1
+
+        if self.is_not_modified(asset.etags(), asset.mtime):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            self.send_header('Cache-Control', cache_control)
+            if vary:
+                self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return None
+
+        if asset.in_memory:
+            body = asset.variants[encoding]
+            length = len(body)
+        else:
+            try:
+                body = open(asset.full_path, 'rb')
+            except OSError:
+                self.send_error(404, "File not found")
+                return None
+            length = os.fstat(body.fileno()).st_size
+
+        self.send_response(200)
+        self.send_header('Content-Type', asset.content_type)
+        self.send_header('Content-Length', str(length))
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+        if vary:
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.send_header('Cache-Control', cache_control)
+        self.end_headers()
+        return body
+
+    def is_not_modified(self, etags, mtime):
+        """Evaluate conditional request headers (If-None-Match takes precedence)"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            candidates = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in candidates or any(etag in candidates for etag in etags)
+
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            if since is None:
+                return False
+            return int(mtime) <= since.timestamp()
+
+        return False
+
+    def send_body(self, f):
+        """Send the file body with os.sendfile, falling back to a userspace copy"""
+        self.wfile.flush()
+        if hasattr(os, 'sendfile') and isinstance(self.connection, socket.socket):
+            try:
+                offset = 0
+                out_fd = self.connection.fileno()
+                in_fd = f.fileno()
+                while True:
+                    sent = os.sendfile(out_fd, in_fd, offset, SENDFILE_CHUNK)
+                    if sent == 0:
+                        return
+                    offset += sent
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            except OSError:
+                f.seek(offset)
+        shutil.copyfileobj(f, self.wfile)
+
     def log_message(self, format, *args):
         """Custom log format"""
+        if getattr(self.server, 'quiet', False):
+            return
         print(f"[{self.log_date_time_string()}] {format % args}")
 
+
+class KeepAliveCORSHTTPRequestHandler(CORSHTTPRequestHandler):
+    """HTTP/1.1 handler so browsers can reuse connections against the threaded server"""
+    protocol_version = 'HTTP/1.1'
+
+
+class ThreadedHTTPServer(http.server.ThreadingHTTPServer):
+    """One thread per connection so a slow client never blocks other page loads"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def create_server(port, directory, mode='threaded', quiet=False, watch=True):
+    """Build the frontend server in the requested mode ('threaded' or 'single')
+
+    The static tree is indexed into memory up front; with ``watch`` enabled a
+    background watcher keeps the index in sync with the files on disk.
+    """
+    if mode == 'threaded':
+        server_class, handler_class = ThreadedHTTPServer, KeepAliveCORSHTTPRequestHandler
+    elif mode == 'single':
+        server_class, handler_class = socketserver.TCPServer, CORSHTTPRequestHandler
+    else:
+        raise ValueError(f"Unknown server mode: {mode}")
+
+    server = server_class(("", port), functools.partial(handler_class, directory=directory))
+    server.quiet = quiet
+    server.asset_index = AssetIndex(directory).build()
+    server.asset_watcher = start_watcher(server.asset_index) if watch else None
+    return server
+
+
 def main():
     """Start the HTTP server"""
-    PORT = 8080
-    
+    parser = argparse.ArgumentParser(description="Frontend static file server")
+    parser.add_argument('--port', type=int, default=int(os.getenv('FRONTEND_PORT', '8080')))
+    parser.add_argument('--mode', choices=['threaded', 'single'],
+                        default=os.getenv('FRONTEND_SERVER_MODE', 'threaded'))
+    parser.add_argument('--quiet', action='store_true', help="disable per-request logging")
+    args = parser.parse_args()
+    PORT = args.port
+
     # Change to the directory containing this script
     script_dir = os.path.dirname(os.path.abspath(__file__))
     os.chdir(script_dir)
-    
+
     print(f"🚀 Starting Google Calendar Auth Frontend Server")
     print(f"📁 Serving files from: {script_dir}")
+    print(f"🧵 Server mode: {args.mode}")
     print(f"🌐 Server URL: http://localhost:{PORT}")
     print(f"🔐 Auth page: http://localhost:{PORT}/auth.html")
     print(f"")
@@ -79,15 +251,20 @@ def main():
     print(f"   Start backend with: python backend.py")
     print(f"⚠️  Press Ctrl+C to stop the server")
     print(f"")
-    
+
     try:
-        with socketserver.TCPServer(("", PORT), CORSHTTPRequestHandler) as httpd:
-            httpd.serve_forever()
+        with create_server(PORT, script_dir, mode=args.mode, quiet=args.quiet) as httpd:
+            print(f"🗂️  Indexed {len(httpd.asset_index.paths())} static assets in memory")
+            try:
+                httpd.serve_forever()
+            finally:
+                if httpd.asset_watcher:
+                    httpd.asset_watcher.stop()
     except KeyboardInterrupt:
         print(f"\n🛑 Server stopped by user")
         sys.exit(0)
     except OSError as e:
-        if e.errno == 48:  # Address already in use
+        if e.errno in (48, 98):  # Address already in use (macOS / Linux)
             print(f"❌ Port {PORT} is already in use!")
             print(f"💡 Try stopping any existing servers or use a different port")
         else:
@@ -0,0 +1,195 @@
+# live_captions.py
+"""
+Live caption scraping as a low-latency streaming transcript.
+
+With captions switched on in Meet, an injected observer watches the caption
+region and records deltas for each caption block: ``(block, start, time,
+speaker, offset, text)``, meaning "replace everything from ``offset`` with
+``text``". One delta covers Meet appending words and also Meet revising
+earlier words. The backend drains the buffered deltas in one batch per
+poll, stamps them in recording time and appends them to a per-session JSONL
+log as they arrive. When the meeting ends the log is already a complete
+transcript; ASR over the recording stays an optional refinement pass.
+"""
+
+import os
+import json
+from typing import Any, Dict, List, Optional
+
+from speaker_timeline import page_clock_origin
+
+# Meet renders captions in a labelled region; each block has a speaker and a text node.
+# Meet's class names change between releases; keep these lists in one place.
+REGION_SELECTORS = ["[role='region'][aria-label*='aption']", ".a4cQT", "[jsname='dsyhDe']"]
+BLOCK_SELECTORS = [".nMcdL", ".TBMuR", ".CNusmb"]
+SPEAKER_SELECTORS = [".NWpY1d", ".KcIKyf", ".zs7s8d"]
+TEXT_SELECTORS = [".bh44bd", ".iTTPOb", ".VbkSUe"]
+
+_OBSERVER_TEMPLATE = """
+(() => {
+    if (location.hostname !== 'meet.google.com' || window.__meetCaptionObserver) return;
+    const REGION = %(region)s, BLOCK = %(block)s, SPEAKER = %(speaker)s, TEXT = %(text)s, LIMIT = 5000;
+    const deltas = window.__meetCaptionDeltas = [];
+    const ids = new WeakMap();
+    const sent = new Map();
+    let nextId = 0;
+    let pending = false;
+
+    const clock = () => performance.timeOrigin + performance.now();
+    const first = (root, selectors) => {
+        for (const sel of selectors) {
+            const el = root.querySelector(sel);
+            if (el) return el;
+        }
+        return null;
+    };
+
+    const scan = () => {
+        pending = false;
+        const t = clock();
+        for (const regionSel of REGION) {
+            for (const region of document.querySelectorAll(regionSel)) {
+                for (const blockSel of BLOCK) {
+                    for (const block of region.querySelectorAll(blockSel)) {
+                        const textEl = first(block, TEXT);
+                        const text = textEl ? (textEl.textContent || '').trim() : '';
+                        if (!text) continue;
+                        let id = ids.get(block);
+                        if (id === undefined) { id = nextId++; ids.set(block, id); }
+                        const prev = sent.get(id);
+                        if (prev && prev.text === text) continue;
+                        const speakerEl = first(block, SPEAKER);
+                        const speaker = speakerEl ? (speakerEl.textContent || '').trim() : '';
+                        const old = prev ? prev.text : '';
+                        let k = 0;
+                        while (k < old.length && k < text.length && old[k] === text[k]) k++;
+                        const start = prev ? prev.start : t;
+                        deltas.push([id, start, t, speaker, k, text.slice(k)]);
+                        sent.set(id, {text, start});
+                    }
+                }
+            }
+        }
+        if (deltas.length > LIMIT) deltas.splice(0, deltas.length - LIMIT);
+    };
+
+    const observer = new MutationObserver(() => {
+        if (!pending) { pending = true; setTimeout(scan, 250); }
+    });
+    const attach = () => {
+        observer.observe(document.body, {subtree: true, childList: true, characterData: true});
+        scan();
+    };
+    window.__meetCaptionObserver = observer;
+    if (document.body) attach(); else document.addEventListener('DOMContentLoaded', attach);
+})();
+"""
+
+CAPTION_OBSERVER_SCRIPT = _OBSERVER_TEMPLATE % {
+    "region": json.dumps(REGION_SELECTORS),
+    "block": json.dumps(BLOCK_SELECTORS),
+    "speaker": json.dumps(SPEAKER_SELECTORS),
+    "text": json.dumps(TEXT_SELECTORS),
+}
+
+_DRAIN_SCRIPT = "return (window.__meetCaptionDeltas || []).splice(0);"
+
+
+class CaptionStream:
+    """Applies caption deltas, appending each to a JSONL log as it arrives."""
+
+    def __init__(self, log_path: str):
+        self.log_path = log_path
+        self.page_origin_ms: Optional[float] = None
+        self.blocks: Dict[int, Dict[str, Any]] = {}
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+        self._log = open(log_path, "a", encoding="utf-8")
+
+    def align(self, driver, recorder_started: float) -> None:
+        self.page_origin_ms = page_clock_origin(driver, recorder_started)
+
+    def _to_ms(self, page_ms: float) -> int:
+        return max(0, int(round(page_ms - (self.page_origin_ms or 0.0))))
+
+    def apply(self, delta: Dict[str, Any]) -> None:
+        """Fold one recording-time delta into the current caption blocks."""
+        block = self.blocks.get(delta["block"])
+        if block is None:
+            block = self.blocks[delta["block"]] = {
+                "speaker": delta["speaker"],
+                "start_ms": delta["start_ms"],
+                "end_ms": delta["t_ms"],
+                "text": "",
+            }
+        block["text"] = block["text"][:delta["from"]] + delta["text"]
+        block["end_ms"] = max(block["end_ms"], delta["t_ms"])
+        if delta["speaker"]:
+            block["speaker"] = delta["speaker"]
+
+    def ingest(self, raw: List[list]) -> int:
+        """Apply raw observer deltas and append them to the log."""
+        if not raw:
+            return 0
+        lines = []
+        for block_id, start, t, speaker, offset, text in raw:
+            delta = {
+                "block": int(block_id),
+                "start_ms": self._to_ms(start),
+                "t_ms": self._to_ms(t),
+                "speaker": speaker,
+                "from": int(offset),
+                "text": text,
+            }
+            self.apply(delta)
+            lines.append(json.dumps(delta, ensure_ascii=False))
+        self._log.write("\n".join(lines) + "\n")
+        self._log.flush()
+        return len(raw)
+
+    def drain(self, driver) -> int:
+        return self.ingest(driver.execute_script(_DRAIN_SCRIPT) or [])
+
+    def transcript(self) -> Dict[str, Any]:
+        """Caption blocks as a transcript in the same shape ChunkedTranscriber produces."""
+        segments = [
+            {
+                "start": round(block["start_ms"] / 1000.0, 3),
+                "end": round(block["end_ms"] / 1000.0, 3),
+                "text": block["text"].strip(),
+                "speaker": block["speaker"],
+            }
+            # Snapshot: the caption watcher may be ingesting on another thread
+            for block in list(self.blocks.values())
+            if block["text"].strip()
+        ]
+        segments.sort(key=lambda s: s["start"])
+        return {
+            "engine": "meet-captions",
+            "duration": max((s["end"] for s in segments), default=0.0),
+            "segments": segments,
+        }
+
+    def close(self, transcript_path: Optional[str] = None) -> Dict[str, Any]:
+        """Stop logging and optionally write the compiled transcript atomically."""
+        self._log.close()
+        transcript = self.transcript()
+        if transcript_path:
+            tmp = f"{transcript_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(transcript, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, transcript_path)
+        return transcript
+
+    @classmethod
+    def replay(cls, log_path: str) -> Dict[str, Any]:
+        """Rebuild the transcript from a delta log, e.g. after a crash mid-meeting."""
+        stream = cls.__new__(cls)
+        stream.log_path = log_path
+        stream.page_origin_ms = None
+        stream.blocks = {}
+        with open(log_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    stream.apply(json.loads(line))
+        return stream.transcript()
@@ -0,0 +1,104 @@
+# meeting_supervisor.py
+"""
+Meeting-end detection for recording sessions.
+
+A session normally ends with /stop-recording. A bot left in a meeting that
+has ended, or that everyone else has left, would otherwise keep Chrome and
+the recorder running until someone notices. The backend polls each session
+cheaply and feeds what it sees to ``MeetingEndDetector``, which decides when
+one of the end conditions holds. Its verdict names the reason; the caller
+runs the normal stop path and stores the reason with the recording.
+"""
+
+import json
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Reasons recorded as ``end_reason`` in the recording metadata
+REASON_REQUESTED = "requested"
+REASON_MEETING_ENDED = "meeting_ended"
+REASON_ALONE = "alone"
+REASON_RECORDER_STOPPED = "recorder_stopped"
+REASON_DRIVER_CRASHED = "driver_crashed"
+
+# Text on the screens Meet shows once the bot is no longer in the call
+END_SCREEN_PHRASES = [
+    "You left the meeting",
+    "You've left the meeting",
+    "The meeting has ended",
+    "This meeting has ended",
+    "Your host ended the meeting",
+    "You've been removed from the meeting",
+    "You were removed from the meeting",
+    "Returning to home screen",
+]
+# Present only while in the call; while it is there the (costly) page text is not read,
+# so a chat message quoting an end phrase cannot end the session
+IN_CALL_SELECTORS = [
+    "[aria-label*='Leave call']",
+    "[aria-label*='leave call']",
+]
+
+END_SCREEN_SCRIPT = """
+const phrases = %(phrases)s, inCall = %(in_call)s;
+for (const sel of inCall) { if (document.querySelector(sel)) return null; }
+const text = document.body ? document.body.innerText.slice(0, 4000) : '';
+return phrases.find(p => text.includes(p)) || null;
+""" % {"phrases": json.dumps(END_SCREEN_PHRASES), "in_call": json.dumps(IN_CALL_SELECTORS)}
+
+
+def detect_end_screen(driver) -> Optional[str]:
+    """The end-screen phrase Meet is showing, or None while still in the call.
+
+    Raises whatever the driver raises, which the supervisor counts as a failed probe.
+    """
+    return driver.execute_script(END_SCREEN_SCRIPT)
+
+
+class MeetingEndDetector:
+    """Turns periodic observations of one session into an end verdict."""
+
+    def __init__(
+        self,
+        alone_seconds: float = 300.0,
+        driver_failures: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.alone_seconds = alone_seconds
+        self.driver_failures = driver_failures
+        self.clock = clock
+        self.alone_since: Optional[float] = None
+        self.failed_probes = 0
+
+    def observe(
+        self,
+        *,
+        end_screen: Optional[str],
+        participant_count: int,
+        recorder_active: bool,
+        driver_ok: bool,
+    ) -> Optional[Dict[str, Any]]:
+        """Returns ``{"reason", "detail"}`` once the session should stop, else None."""
+        now = self.clock()
+
+        if not driver_ok:
+            self.failed_probes += 1
+            if self.failed_probes >= self.driver_failures:
+                return {"reason": REASON_DRIVER_CRASHED, "detail": f"{self.failed_probes} failed browser probes"}
+        else:
+            self.failed_probes = 0
+            if end_screen:
+                return {"reason": REASON_MEETING_ENDED, "detail": end_screen}
+
+        if not recorder_active:
+            return {"reason": REASON_RECORDER_STOPPED, "detail": "recorder is no longer running"}
+
+        # 0 means the count could not be read; only an explicit 1 (the bot itself) is "alone"
+        if participant_count == 1:
+            if self.alone_since is None:
+                self.alone_since = now
+            elif now - self.alone_since >= self.alone_seconds:
+                return {"reason": REASON_ALONE, "detail": f"only participant for {now - self.alone_since:.0f}s"}
+        elif participant_count > 1:
+            self.alone_since = None
+        return None
@@ -0,0 +1,375 @@
+# participant_audio.py
+"""
+Per-participant audio taps on Meet's WebRTC connection.
+
+A document-start hook wraps ``RTCPeerConnection`` and remembers every remote
+audio track. Once recording starts, each track gets its own Opus
+MediaRecorder, streamed to the backend over a WebSocket and keyed by track.
+The result is one file per track instead of a single ``amix`` of everyone.
+
+The page gates each track on its level and pauses its recorder through
+silence, so the files hold only voiced audio. Each voiced stretch is logged
+with its meeting time, so transcription can run per stretch.
+
+Meet forwards a small number of "loudest speaker" audio streams and reuses
+them as people take turns, so a track is not always one person. Each voiced
+stretch is therefore attributed on its own, with both the RTP contributing
+sources sampled from the receiver and the active-speaker timeline from the
+DOM.
+"""
+
+import os
+import hmac
+import json
+import math
+import struct
+import secrets
+import threading
+from typing import Any, Dict, Optional
+
+from browser_capture import evaluate_async
+from speaker_timeline import assign_speakers, page_clock_origin
+
+AUDIO_TAP_HOOK_SCRIPT = """
+(() => {
+    if (location.hostname !== 'meet.google.com' || window.__meetAudioTaps) return;
+    const Native = window.RTCPeerConnection;
+    if (!Native) return;
+    const taps = window.__meetAudioTaps = {entries: [], onTrack: null};
+    const remember = (ev) => {
+        if (ev.track.kind !== 'audio') return;
+        const entry = {receiver: ev.receiver, track: ev.track};
+        taps.entries.push(entry);
+        if (taps.onTrack) taps.onTrack(entry);
+    };
+    // A Proxy keeps the constructor's name, prototype, statics and toString intact
+    window.RTCPeerConnection = new Proxy(Native, {
+        construct(target, args, newTarget) {
+            const pc = Reflect.construct(target, args, newTarget);
+            pc.addEventListener('track', remember);
+            return pc;
+        },
+    });
+})();
+"""
+
+_BEGIN_TEMPLATE = """
+(async () => {
+    const taps = window.__meetAudioTaps;
+    if (!taps) throw new Error('audio tap hook is not installed');
+    if (taps.end) return {tracks: taps.entries.length};
+    const URL = %(url)s, TIMESLICE = %(timeslice)s, THRESHOLD_DB = %(threshold_db)s;
+    const HANGOVER = %(hangover)s, STOP_TIMEOUT = %(stop_timeout)s;
+    const clock = () => performance.timeOrigin + performance.now();
+    const audio = new AudioContext();
+    const pending = [], active = [];
+    let ws = null, closed = false, nextId = 0, nextControl = 0, onDrained = null;
+
+    const sendItem = (item) => { if (ws && ws.readyState === 1) ws.send(item.blob); };
+    const control = (msg) => {
+        msg.n = nextControl++;
+        const item = {control: msg.n, blob: JSON.stringify(msg)};
+        pending.push(item);
+        sendItem(item);
+    };
+    const connect = () => {
+        ws = new WebSocket(URL);
+        ws.onopen = () => pending.forEach(sendItem);
+        ws.onmessage = (ev) => {
+            const msg = JSON.parse(ev.data);
+            for (let i = pending.length - 1; i >= 0; i--) {
+                const p = pending[i];
+                const acked = p.control !== undefined ? p.control === msg.control : (p.track === msg.track && p.seq <= msg.ack);
+                if (acked) pending.splice(i, 1);
+            }
+            if (onDrained && !pending.length && active.every(t => t.done)) onDrained();
+        };
+        ws.onclose = () => { if (!closed) setTimeout(connect, 1000); };
+    };
+    connect();
+
+    const tap = (entry) => {
+        if (entry.track.readyState === 'ended') return;
+        const id = nextId++;
+        const stream = new MediaStream([entry.track]);
+        // Chrome only pulls remote WebRTC audio into WebAudio while a media element plays it
+        const sink = new Audio();
+        sink.muted = true;
+        sink.srcObject = stream;
+        sink.play().catch(() => {});
+        const analyser = audio.createAnalyser();
+        analyser.fftSize = 2048;
+        audio.createMediaStreamSource(stream).connect(analyser);
+        const samples = new Float32Array(analyser.fftSize);
+
+        const recorder = new MediaRecorder(stream, {mimeType: 'audio/webm;codecs=opus', audioBitsPerSecond: 32000});
+        const state = {id, done: false, seq: 0, voiced: false, lastVoice: 0, sources: ''};
+        active.push(state);
+        recorder.ondataavailable = (ev) => {
+            if (!ev.data || !ev.data.size) return;
+            const header = new ArrayBuffer(8);
+            const view = new DataView(header);
+            view.setUint32(0, id);
+            view.setUint32(4, state.seq);
+            const item = {track: id, seq: state.seq++, blob: new Blob([header, ev.data])};
+            pending.push(item);
+            sendItem(item);
+        };
+        recorder.onstop = () => {
+            state.done = true;
+            if (onDrained && !pending.length && active.every(t => t.done)) onDrained();
+        };
+        control({type: 'track', track: id, trackId: entry.track.id, t: clock()});
+
+        const poll = () => {
+            const t = clock();
+            analyser.getFloatTimeDomainData(samples);
+            let sum = 0;
+            for (let i = 0; i < samples.length; i++) sum += samples[i] * samples[i];
+            const db = 10 * Math.log10(sum / samples.length + 1e-12);
+            if (db > THRESHOLD_DB) {
+                state.lastVoice = t;
+                if (!state.voiced) {
+                    state.voiced = true;
+                    if (recorder.state === 'paused') recorder.resume();
+                    control({type: 'voice', track: id, t});
+                }
+            } else if (state.voiced && t - state.lastVoice > HANGOVER) {
+                state.voiced = false;
+                if (recorder.state === 'recording') recorder.pause();
+                control({type: 'silence', track: id, t});
+            }
+            const ssrc = entry.receiver.getSynchronizationSources().map(s => s.source);
+            const csrc = entry.receiver.getContributingSources().map(s => s.source);
+            const key = ssrc.join(',') + '|' + csrc.join(',');
+            if (key !== state.sources) {
+                state.sources = key;
+                control({type: 'sources', track: id, t, ssrc, csrc});
+            }
+        };
+        recorder.start(TIMESLICE);
+        recorder.pause();
+        state.timer = setInterval(poll, 100);
+        state.stop = (t) => {
+            clearInterval(state.timer);
+            if (state.voiced) control({type: 'silence', track: id, t});
+            state.voiced = false;
+            if (recorder.state !== 'inactive') recorder.stop(); else state.done = true;
+            sink.srcObject = null;
+        };
+        entry.track.addEventListener('ended', () => state.stop(clock()));
+    };
+
+    taps.entries.forEach(tap);
+    taps.onTrack = tap;
+    taps.end = () => new Promise((resolve) => {
+        let done = false;
+        const finish = () => {
+            if (done) return;
+            done = true;
+            closed = true;
+            try { ws.close(); } catch (e) {}
+            audio.close();
+            resolve({tracks: active.length, unacked: pending.length});
+        };
+        taps.onTrack = null;
+        onDrained = finish;
+        const t = clock();
+        active.forEach(s => s.stop(t));
+        setTimeout(() => { if (!pending.length && active.every(s => s.done)) finish(); }, 0);
+        setTimeout(finish, STOP_TIMEOUT);
+    });
+    return {tracks: active.length};
+})()
+"""
+
+# Sinks waiting for audio, keyed by session id
+_active: Dict[str, "ParticipantAudioSink"] = {}
+_active_lock = threading.Lock()
+
+
+def sink_for(session_id: str, token: str) -> Optional["ParticipantAudioSink"]:
+    """Look up the sink an audio socket belongs to, checking its token."""
+    with _active_lock:
+        sink = _active.get(session_id)
+    if sink is None or not hmac.compare_digest(sink.token, token or ""):
+        return None
+    return sink
+
+
+class ParticipantAudioSink:
+    """Writes each tapped track to its own file and logs voiced stretches and RTP sources."""
+
+    def __init__(
+        self,
+        session_id: str,
+        out_dir: str,
+        ws_base: str,
+        threshold_db: float = -50.0,
+        hangover_ms: int = 800,
+        timeslice_ms: int = 1000,
+        stop_timeout: float = 10.0,
+    ):
+        self.session_id = session_id
+        self.out_dir = out_dir
+        self.ws_base = ws_base.rstrip("/")
+        self.threshold_db = threshold_db
+        self.hangover_ms = hangover_ms
+        self.timeslice_ms = timeslice_ms
+        self.stop_timeout = stop_timeout
+        self.token = secrets.token_urlsafe(24)
+        self.page_origin_ms: Optional[float] = None
+
+        os.makedirs(out_dir, exist_ok=True)
+        self._files: Dict[int, Any] = {}
+        self._next_seq: Dict[int, int] = {}
+        self._tracks: Dict[int, Dict[str, Any]] = {}
+        self._controls_seen = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._events = open(os.path.join(out_dir, "events.jsonl"), "a", encoding="utf-8")
+
+    def capture_url(self) -> str:
+        return f"{self.ws_base}/capture/{self.session_id}/audio?token={self.token}"
+
+    def _to_ms(self, page_ms: float) -> int:
+        return max(0, int(round(page_ms - (self.page_origin_ms or 0.0))))
+
+    def begin(self, driver, recorder_started: float) -> int:
+        """Start tapping every current and future remote audio track; returns tracks tapped."""
+        self.page_origin_ms = page_clock_origin(driver, recorder_started)
+        with _active_lock:
+            _active[self.session_id] = self
+        script = _BEGIN_TEMPLATE % {
+            "url": json.dumps(self.capture_url()),
+            "timeslice": int(self.timeslice_ms),
+            "threshold_db": float(self.threshold_db),
+            "hangover": int(self.hangover_ms),
+            "stop_timeout": int(self.stop_timeout * 1000),
+        }
+        try:
+            result = evaluate_async(driver, script) or {}
+        except Exception:
+            self._release()
+            raise
+        return int(result.get("tracks", 0))
+
+    # -- socket side --------------------------------------------------------
+
+    def write_chunk(self, message: bytes) -> Dict[str, int]:
+        """Append one ``[u32 track][u32 seq][webm bytes]`` message; returns the ack."""
+        if len(message) < 8:
+            return {}
+        track, seq = struct.unpack(">II", message[:8])
+        with self._lock:
+            expected = self._next_seq.get(track, 0)
+            # Stragglers that arrive after stop() closed the files are dropped
+            if seq == expected and not self._closed:
+                f = self._files.get(track)
+                if f is None:
+                    f = self._files[track] = open(os.path.join(self.out_dir, f"track_{track:02d}.webm"), "ab")
+                f.write(message[8:])
+                f.flush()
+                self._next_seq[track] = expected = expected + 1
+            return {"track": track, "ack": expected - 1}
+
+    def record_event(self, text: str) -> Dict[str, Any]:
+        """Log one control message (track/voice/silence/sources) in recording time.
+
+        A malformed message is logged and dropped; it is still acked when it carries a
+        number, since the page would otherwise resend it on every reconnect.
+        """
+        number = None
+        try:
+            event = json.loads(text)
+            if not isinstance(event, dict):
+                raise ValueError("not a JSON object")
+            number = int(event.pop("n"))
+            track_index = int(event["track"])
+            page_ms = float(event.pop("t", 0.0))
+            if not math.isfinite(page_ms):
+                raise ValueError(f"bad timestamp {page_ms}")
+            event["t_ms"] = self._to_ms(page_ms)
+        except (ValueError, KeyError, TypeError) as exc:
+            print(f"⚠️ Dropping malformed participant audio event for {self.session_id}: {exc!r}")
+            return {"control": number} if number is not None else {"error": "malformed control message"}
+        with self._lock:
+            # Messages are resent after a reconnect until acked
+            if number in self._controls_seen:
+                return {"control": number}
+            self._controls_seen.add(number)
+            if self._closed:
+                return {"control": number}
+            track = self._tracks.setdefault(track_index, {"voiced": [], "sources": []})
+            kind = event.get("type")
+            if kind == "track":
+                track["track_id"] = event.get("trackId")
+            elif kind == "voice":
+                track["voiced"].append([event["t_ms"], None])
+            elif kind == "silence" and track["voiced"] and track["voiced"][-1][1] is None:
+                track["voiced"][-1][1] = event["t_ms"]
+            elif kind == "sources":
+                track["sources"].append([event["t_ms"], event.get("ssrc") or [], event.get("csrc") or []])
+            self._events.write(json.dumps(event) + "\n")
+            self._events.flush()
+        return {"control": number}
+
+    # -- finishing ----------------------------------------------------------
+
+    def _release(self) -> None:
+        with _active_lock:
+            if _active.get(self.session_id) is self:
+                del _active[self.session_id]
+
+    def stop(self, driver) -> None:
+        """Stop the page recorders and wait for their last chunks."""
+        try:
+            result = evaluate_async(driver, "window.__meetAudioTaps && window.__meetAudioTaps.end ? window.__meetAudioTaps.end() : null") or {}
+            if result.get("unacked"):
+                print(f"⚠️ {result['unacked']} participant audio message(s) were not delivered before stop")
+        finally:
+            self._release()
+            with self._lock:
+                self._closed = True
+                for f in self._files.values():
+                    f.close()
+                self._files.clear()
+                self._events.close()
+
+    def finish(self, end_ms: int, speaker_timeline: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Write ``participants.json``: per-track files and each voiced stretch with its speaker."""
+        tracks, stretches = [], []
+        for track_index in sorted(self._tracks):
+            info = self._tracks[track_index]
+            path = os.path.join(self.out_dir, f"track_{track_index:02d}.webm")
+            file_offset = 0
+            for start_ms, stop_ms in info["voiced"]:
+                stop_ms = end_ms if stop_ms is None else stop_ms
+                # The track file skips the silence in between, so keep where each stretch lands in it
+                csrc = [c for t, _, c in info["sources"] if t <= stop_ms]
+                stretches.append({
+                    "track": track_index,
+                    "start": round(start_ms / 1000.0, 3),
+                    "end": round(stop_ms / 1000.0, 3),
+                    "file_offset": round(file_offset / 1000.0, 3),
+                    "csrc": csrc[-1] if csrc else [],
+                })
+                file_offset += max(0, stop_ms - start_ms)
+            tracks.append({
+                "track": track_index,
+                "track_id": info.get("track_id"),
+                "path": os.path.basename(path) if os.path.exists(path) else None,
+                "voiced_seconds": round(file_offset / 1000.0, 3),
+                "sources": info["sources"],
+            })
+
+        stretches.sort(key=lambda s: s["start"])
+        if speaker_timeline:
+            assign_speakers(stretches, speaker_timeline)
+        result = {"tracks": tracks, "voiced": stretches}
+        target = os.path.join(self.out_dir, "participants.json")
+        tmp = f"{target}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, target)
+        return result
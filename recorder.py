@@ -1,23 +1,79 @@
 # recorder.py
 
 
-import os, subprocess, datetime, platform, sys
+import os, subprocess, datetime, platform, sys, shutil, time
 import logging
 import fcntl  # For Linux file locking
 
+from metrics import REGISTRY, SLOW_BUCKETS
+
 logger = logging.getLogger(__name__)
 
+FFMPEG_START_SECONDS = REGISTRY.histogram(
+    "ffmpeg_start_seconds", "Time to spawn ffmpeg and see it running", buckets=SLOW_BUCKETS)
+FFMPEG_STOP_SECONDS = REGISTRY.histogram(
+    "ffmpeg_stop_seconds", "Time to stop ffmpeg and finalize the recording", buckets=SLOW_BUCKETS)
+# stage: start (did not come up), kill (ignored SIGTERM), output (no usable file), stop (error while stopping)
+FFMPEG_FAILURES = REGISTRY.counter("ffmpeg_failures_total", "ffmpeg recorder failures", ["stage"])
+
+SEGMENT_LIST_NAME = "segments.csv"
+
+# Live video encoder settings. "fast" spends as little CPU as possible during the
+# meeting (bigger files); pair it with transcoder.py to compress afterwards.
+CAPTURE_PROFILES = {
+    "standard": ["-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p"],
+    "fast": ["-c:v", "libx264", "-preset", "ultrafast", "-tune", "zerolatency",
+             "-crf", "20", "-g", "250", "-pix_fmt", "yuv420p"],
+    # Variable frame rate: the screen is still grabbed at the full rate, but frames that
+    # barely differ from the previous one are dropped before the encoder, so a static
+    # grid or slide costs almost nothing and screen-share motion keeps every frame.
+    "vfr": ["-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p"],
+}
+VFR_PROFILES = {"vfr"}
+# Longest run of dropped frames, in seconds, so an idle screen still gets a frame this often
+VFR_IDLE_FRAME_SECONDS = 2
+
+
+def video_args(capture_profile: str, fps) -> list:
+    """Video encoder arguments for a capture profile at the given grab rate"""
+    args = list(CAPTURE_PROFILES[capture_profile])
+    if capture_profile in VFR_PROFILES:
+        max_dropped = int(fps) * VFR_IDLE_FRAME_SECONDS
+        args = [
+            "-vf", f"mpdecimate=max={max_dropped}",
+            "-vsync", "vfr",
+            # GOP length counts frames, which no longer map to time; key on time instead
+            # so seeking and segment cuts stay regular
+            "-force_key_frames", f"expr:gte(t,n_forced*{VFR_IDLE_FRAME_SECONDS})",
+            *args,
+        ]
+    return args
+
+
 class FFmpegRecorder:
-    def __init__(self, out_dir: str, base_name: str, fps: int = 25):
+    def __init__(self, out_dir: str, base_name: str, fps: int = 25, segment_seconds: int = None,
+                 capture_profile: str = None):
         # Set platform detection first, before any other methods are called
         self.is_linux = 'linux' in platform.system().lower()
         
         os.makedirs(out_dir, exist_ok=True)
         ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         safe = "".join(c for c in base_name if c.isalnum() or c in " _-").strip()
-        self.out_path = os.path.join(out_dir, f"{safe}_{ts}.mp4")
+        # Segmented recordings are written as MPEG-TS pieces that can be shipped while
+        # the meeting is still running and are byte-concatenated into out_path on stop.
+        self.segment_seconds = segment_seconds
+        self.segment_dir = None
+        if segment_seconds:
+            self.segment_dir = os.path.join(out_dir, f"{safe}_{ts}_segments")
+            os.makedirs(self.segment_dir, exist_ok=True)
+            self.out_path = os.path.join(out_dir, f"{safe}_{ts}.ts")
+        else:
+            self.out_path = os.path.join(out_dir, f"{safe}_{ts}.mp4")
         self.proc = None
         self.fps = str(fps)
+        self.capture_profile = capture_profile or os.environ.get("MEET_CAPTURE_PROFILE", "standard")
+        if self.capture_profile not in CAPTURE_PROFILES:
+            raise ValueError(f"Unknown capture profile: {self.capture_profile}")
         self.is_recording = False
         self.start_time = None
         self.log_file = os.path.join(out_dir, 'recording.log')
@@ -92,10 +148,10 @@ class FFmpegRecorder:
                     "-video_size", rec_size,
                     "-framerate", self.fps, "-f", "x11grab", "-i", display,
                     "-f", "alsa", "-i", audio_sources['alsa_device'],  # Hardware microphone
-                    "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+                    *self._video_args(),
                     "-c:a", "aac", "-b:a", "192k",
                     "-loglevel", "warning",
-                    self.out_path
+                    *self._output_args()
                 ]
                 self._log_message(f"Using ALSA fallback command with: {display}, {audio_sources['alsa_device']}")
             else:
@@ -107,10 +163,10 @@ class FFmpegRecorder:
                     "-f", "pulse", "-i", audio_sources['monitor'],  # System audio
                     "-f", "pulse", "-i", audio_sources['mic'],      # Microphone
                     "-filter_complex", "amix=inputs=2:duration=first",  # Mix both audio sources
-                    "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+                    *self._video_args(),
                     "-c:a", "aac", "-b:a", "192k",
                     "-loglevel", "warning",
-                    self.out_path
+                    *self._output_args()
                 ]
                 self._log_message(f"Using PulseAudio command with: {display}, {audio_sources}")
 
@@ -119,8 +175,8 @@ class FFmpegRecorder:
             return [
                 "ffmpeg","-y",
                 "-f","avfoundation","-framerate", self.fps, "-i", os.environ.get("AVF_INPUT","1:0"),
-                "-c:v","libx264","-preset","veryfast","-pix_fmt","yuv420p",
-                "-c:a","aac","-b:a","128k", self.out_path
+                *self._video_args(),
+                "-c:a","aac","-b:a","128k", *self._output_args()
             ]
         # Windows
         ffmpeg_path = r"C:\ffmpeg\bin\ffmpeg.exe"  # full path to ffmpeg.exe
@@ -128,10 +184,50 @@ class FFmpegRecorder:
             ffmpeg_path, "-y",
             "-f", "gdigrab", "-framerate", self.fps, "-i", "desktop",
             "-f", "dshow", "-i", "audio=Microphone (Realtek High Definition Audio)",
-            "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
-            "-c:a", "aac", "-b:a", "128k", self.out_path
+            *self._video_args(),
+            "-c:a", "aac", "-b:a", "128k", *self._output_args()
         ]
 
+    def _video_args(self):
+        """Video encoder arguments for the selected capture profile"""
+        return video_args(self.capture_profile, self.fps)
+
+    def _output_args(self):
+        """Output arguments: a single MP4, or fixed-length MPEG-TS segments plus a segment list"""
+        if not self.segment_seconds:
+            return [self.out_path]
+        return [
+            "-f", "segment",
+            "-segment_time", str(self.segment_seconds),
+            "-segment_format", "mpegts",
+            "-segment_list", os.path.join(self.segment_dir, SEGMENT_LIST_NAME),
+            "-segment_list_type", "csv",
+            "-reset_timestamps", "0",
+            os.path.join(self.segment_dir, "segment_%05d.ts"),
+        ]
+
+    def segment_paths(self):
+        """Paths of the segments written so far, in recording order"""
+        if not self.segment_dir or not os.path.isdir(self.segment_dir):
+            return []
+        return sorted(
+            os.path.join(self.segment_dir, name)
+            for name in os.listdir(self.segment_dir)
+            if name.startswith("segment_") and name.endswith(".ts")
+        )
+
+    def _join_segments(self):
+        """Concatenate finished MPEG-TS segments into the final local recording"""
+        segments = self.segment_paths()
+        if not segments:
+            return
+        tmp_path = self.out_path + ".part"
+        with open(tmp_path, "wb") as out:
+            for segment in segments:
+                with open(segment, "rb") as src:
+                    shutil.copyfileobj(src, out, 1024 * 1024)
+        os.replace(tmp_path, self.out_path)
+
     def _get_linux_audio_sources(self):
         """Get both system audio and microphone sources for Linux with ALSA fallback"""
         sources = {'monitor': 'default', 'mic': 'default', 'use_alsa': False}
@@ -205,6 +301,7 @@ class FFmpegRecorder:
         return sources
 
     def start(self):
+        started = time.perf_counter()
         try:
             self._log_message("🎥 Starting recording process...")
             
@@ -217,48 +314,64 @@ class FFmpegRecorder:
                 stderr=subprocess.PIPE,
                 universal_newlines=True
             )
+            # Monotonic reference that in-page timelines are aligned to
+            self.start_time = time.monotonic()
             
             # Check if process started successfully
             if self.proc.poll() is None:
+                FFMPEG_START_SECONDS.observe(time.perf_counter() - started)
                 logger.info("Recording process started successfully")
                 print(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] ✅ Recording started successfully")
                 return True
             else:
+                FFMPEG_FAILURES.inc(stage="start")
                 logger.error("Failed to start recording process")
                 print(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] ❌ Failed to start recording")
                 return False
                 
         except Exception as e:
+            FFMPEG_FAILURES.inc(stage="start")
             logger.error(f"Error starting recording: {e}")
             print(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] ❌ Error starting recording: {str(e)}")
             return False
 
-    def stop(self):
+    def request_stop(self):
+        """Ask ffmpeg to finalize without waiting, so many recorders can wind down together"""
+        if self.proc and self.proc.poll() is None:
+            self.proc.terminate()
+
+    def stop(self, verify=True):
         if not self.proc:
             return None
             
+        started = time.perf_counter()
         try:
             self._log_message("🛑 Stopping recording...")
             
             if self.is_linux:
                 # Graceful shutdown for Linux
-                self.proc.terminate()
+                self.request_stop()
                 try:
                     self.proc.wait(timeout=5)
                 except subprocess.TimeoutExpired:
                     self._log_message("⚠️ Force stopping FFmpeg process...")
+                    FFMPEG_FAILURES.inc(stage="kill")
                     # Send SIGTERM then SIGKILL if needed
                     self.proc.kill()
                     self.proc.wait(timeout=2)
             else:
                 self.proc.terminate()
                 self.proc.wait(timeout=5)
+
+            if self.segment_seconds:
+                self._join_segments()
             
             # Verify recording
             if os.path.exists(self.out_path):
                 file_size = os.path.getsize(self.out_path)
                 if file_size > 0:
-                    duration = self._get_video_duration()
+                    # Shutdown skips the ffprobe pass; every second counts there
+                    duration = self._get_video_duration() if verify else 0
                     status_msg = (f"✅ Recording saved: {os.path.basename(self.out_path)}\n"
                                 f"   📊 Size: {file_size/1024/1024:.1f} MB, Duration: {duration:.1f} seconds")
                     self._log_message(status_msg)
@@ -268,12 +381,15 @@ class FFmpegRecorder:
             else:
                 self._log_message("❌ Recording file not found", 'error')
             
+            FFMPEG_FAILURES.inc(stage="output")
             return None
             
         except Exception as e:
+            FFMPEG_FAILURES.inc(stage="stop")
             self._log_message(f"❌ Error stopping recording: {str(e)}", 'error')
             return None
         finally:
+            FFMPEG_STOP_SECONDS.observe(time.perf_counter() - started)
             self.proc = None
             # Cleanup Linux logging
             if self.is_linux and hasattr(self, 'log_handler'):
@@ -0,0 +1,297 @@
+# recording_catalog.py
+"""
+SQLite catalog of recordings under MEET_RECORDINGS_ROOT.
+
+Each recording (``<root>/<date>/<name>.mp4|.ts|...``) and its ``.json``
+sidecar become one row, so listing past meetings is an indexed query instead
+of a walk over the whole tree. The catalog is filled once by a bulk backfill
+and then kept current by the same inotify watcher the frontend asset index
+uses (with a polling fallback). Listing uses keyset pagination on
+``(started_at, path)``, so deep pages cost the same as the first page.
+"""
+
+import os
+import json
+import base64
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+RECORDING_EXTENSIONS = {".mp4", ".ts", ".mkv", ".webm"}
+# Other JSON files written next to a recording that are not its sidecar
+DERIVED_SUFFIXES = (".captions.json", ".summary.json", ".progress.json")
+# Directories of per-recording pieces (upload segments, per-participant audio)
+DERIVED_DIR_SUFFIXES = ("_segments", "_participants")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    path             TEXT PRIMARY KEY,
+    recorded_date    TEXT,
+    started_at       TEXT NOT NULL,
+    ended_at         TEXT,
+    duration_seconds REAL,
+    session_id       TEXT,
+    meet_url         TEXT,
+    size             INTEGER NOT NULL,
+    mtime            REAL NOT NULL,
+    metadata         TEXT
+);
+CREATE INDEX IF NOT EXISTS recordings_started ON recordings (started_at DESC, path DESC);
+CREATE INDEX IF NOT EXISTS recordings_url ON recordings (meet_url, started_at DESC);
+CREATE INDEX IF NOT EXISTS recordings_date ON recordings (recorded_date, started_at DESC);
+CREATE TABLE IF NOT EXISTS catalog_state (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+COLUMNS = ("path", "recorded_date", "started_at", "ended_at", "duration_seconds",
+           "session_id", "meet_url", "size", "mtime", "metadata")
+
+
+def encode_cursor(started_at: str, path: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([started_at, path]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        started_at, path = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(started_at), str(path)
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _is_recording(rel_path: str) -> bool:
+    head, name = os.path.split(rel_path)
+    if head.endswith(DERIVED_DIR_SUFFIXES):
+        return False
+    return os.path.splitext(name)[1].lower() in RECORDING_EXTENSIONS
+
+
+def _is_sidecar(rel_path: str) -> bool:
+    return rel_path.endswith(".json") and not rel_path.endswith(DERIVED_SUFFIXES)
+
+
+class RecordingCatalog:
+    """Recording rows keyed by path relative to the recordings root.
+
+    Implements the ``root``/``build``/``refresh``/``refresh_tree``/``remove_tree``
+    interface expected by ``asset_index.InotifyWatcher``.
+    """
+
+    def __init__(self, db_path: str, root: str):
+        self.root = os.path.abspath(root)
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    # -- reading files ------------------------------------------------------
+
+    def _row_for(self, rel_path: str) -> Optional[Tuple]:
+        full = os.path.join(self.root, rel_path)
+        try:
+            stat_result = os.stat(full)
+        except OSError:
+            return None
+
+        sidecar: Dict[str, Any] = {}
+        try:
+            with open(os.path.splitext(full)[0] + ".json") as f:
+                sidecar = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
+
+        started_at = sidecar.get("recording_started_at") or datetime.fromtimestamp(stat_result.st_mtime).isoformat()
+        parent = os.path.basename(os.path.dirname(full))
+        recorded_date = parent if len(parent) == 10 and parent[4] == "-" else started_at[:10]
+        # The bulky per-meeting extras stay in their own files
+        metadata = {k: v for k, v in sidecar.items() if k not in ("speaker_timeline",)}
+        return (
+            rel_path,
+            recorded_date,
+            started_at,
+            sidecar.get("recording_ended_at"),
+            sidecar.get("duration_seconds"),
+            sidecar.get("session_id"),
+            sidecar.get("meet_url"),
+            stat_result.st_size,
+            stat_result.st_mtime,
+            json.dumps(metadata) if metadata else None,
+        )
+
+    def _recordings_for_sidecar(self, rel_path: str) -> List[str]:
+        stem = os.path.splitext(rel_path)[0]
+        return [stem + ext for ext in RECORDING_EXTENSIONS if os.path.exists(os.path.join(self.root, stem + ext))]
+
+    def _upsert(self, rows: List[Tuple]) -> None:
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        updates = ", ".join(f"{c}=excluded.{c}" for c in COLUMNS[1:])
+        with self._lock, self._db:
+            self._db.executemany(
+                f"INSERT INTO recordings ({', '.join(COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(path) DO UPDATE SET {updates}",
+                rows,
+            )
+
+    # -- watcher interface --------------------------------------------------
+
+    def _walk(self, rel_dir: str = "") -> List[str]:
+        base = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        found = []
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".") and not d.endswith(DERIVED_DIR_SUFFIXES)]
+            for filename in filenames:
+                rel_path = os.path.relpath(os.path.join(dirpath, filename), self.root).replace(os.sep, "/")
+                if _is_recording(rel_path):
+                    found.append(rel_path)
+        return found
+
+    def build(self) -> "RecordingCatalog":
+        """Bulk (re)scan: upsert every recording on disk and drop rows whose file is gone."""
+        paths = self._walk()
+        rows = [row for row in (self._row_for(p) for p in paths) if row is not None]
+        self._upsert(rows)
+        with self._lock, self._db:
+            self._db.execute("CREATE TEMP TABLE IF NOT EXISTS seen (path TEXT PRIMARY KEY)")
+            self._db.execute("DELETE FROM seen")
+            self._db.executemany("INSERT OR IGNORE INTO seen VALUES (?)", [(p,) for p in paths])
+            self._db.execute("DELETE FROM recordings WHERE path NOT IN (SELECT path FROM seen)")
+            self._db.execute(
+                "INSERT INTO catalog_state VALUES ('backfilled_at', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                (datetime.now().isoformat(),),
+            )
+        return self
+
+    def backfill_if_needed(self) -> bool:
+        """Run the one-time bulk backfill on a fresh catalog; returns True if it ran."""
+        with self._lock:
+            done = self._db.execute("SELECT 1 FROM catalog_state WHERE key='backfilled_at'").fetchone()
+        if done:
+            return False
+        self.build()
+        return True
+
+    def refresh(self, rel_path: str) -> None:
+        if _is_sidecar(rel_path):
+            for recording in self._recordings_for_sidecar(rel_path):
+                self.refresh(recording)
+            return
+        if not _is_recording(rel_path):
+            return
+        row = self._row_for(rel_path)
+        if row is None:
+            with self._lock, self._db:
+                self._db.execute("DELETE FROM recordings WHERE path = ?", (rel_path,))
+        else:
+            self._upsert([row])
+
+    def refresh_tree(self, rel_dir: str) -> None:
+        rows = [row for row in (self._row_for(p) for p in self._walk(rel_dir)) if row is not None]
+        self._upsert(rows)
+
+    def remove_tree(self, rel_dir: str) -> None:
+        prefix = rel_dir.rstrip("/") + "/"
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM recordings WHERE substr(path, 1, ?) = ?", (len(prefix), prefix))
+
+    # -- queries ------------------------------------------------------------
+
+    def get(self, rel_path: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM recordings WHERE path = ?", (rel_path,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        item = dict(row)
+        item["metadata"] = json.loads(item["metadata"]) if item["metadata"] else {}
+        item["full_path"] = os.path.join(self.root, item["path"])
+        return item
+
+    def query(
+        self,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        meet_url: Optional[str] = None,
+        min_duration: Optional[float] = None,
+        max_duration: Optional[float] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Newest-first page of recordings plus the cursor for the next page."""
+        where, params = [], []
+        if date_from:
+            where.append("recorded_date >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("recorded_date <= ?")
+            params.append(date_to)
+        if meet_url:
+            where.append("meet_url = ?")
+            params.append(meet_url)
+        if min_duration is not None:
+            where.append("duration_seconds >= ?")
+            params.append(min_duration)
+        if max_duration is not None:
+            where.append("duration_seconds <= ?")
+            params.append(max_duration)
+        if cursor:
+            where.append("(started_at, path) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        sql = "SELECT * FROM recordings"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY started_at DESC, path DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        items = [self._to_dict(row) for row in rows[:limit]]
+        next_cursor = encode_cursor(items[-1]["started_at"], items[-1]["path"]) if len(rows) > limit else None
+        return {"recordings": items, "next_cursor": next_cursor}
+
+
+class CatalogPoller:
+    """Portable fallback that rescans the tree on an interval."""
+
+    def __init__(self, catalog: RecordingCatalog, interval: float = 30.0):
+        self.catalog = catalog
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="recording-catalog-poller", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.catalog.build()
+            except Exception as exc:
+                print(f"⚠️ Recording catalog rescan failed: {exc}")
+
+
+def start_catalog_watcher(catalog: RecordingCatalog):
+    """Watch the recordings tree with inotify where available, polling otherwise."""
+    from asset_index import InotifyWatcher
+
+    if os.name == "posix" and os.uname().sysname == "Linux":
+        try:
+            return InotifyWatcher(catalog).start()
+        except (OSError, AttributeError) as e:
+            print(f"⚠️ inotify unavailable ({e}); falling back to polling")
+    return CatalogPoller(catalog).start()
@@ -0,0 +1,276 @@
+# report_renderer.py
+"""
+Per-meeting summary report rendering.
+
+Reports are built from session metadata (URL, duration, attendance, transcript
+excerpts) into a small self-contained PDF. Rendering happens in a bounded
+process pool so the request/email path never blocks on it, and every output is
+cached on disk under a content hash of its inputs so repeat sends are free.
+"""
+
+import os
+import json
+import asyncio
+import hashlib
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+from typing import Any, Dict, List, Optional
+
+# Bump whenever the templates or the PDF layout change so cached reports are invalidated.
+TEMPLATE_VERSION = "1"
+
+REPORT_TEMPLATES = {
+    "header": "Google Meet Summary Report",
+    "details": (
+        "Meet URL: $meet_url\n"
+        "Session: $session_id\n"
+        "Started: $started_at\n"
+        "Ended: $ended_at\n"
+        "Duration: $duration\n"
+        "Participants: $participant_count"
+    ),
+    "attendees": "Attendees: $attendees",
+    "excerpt": "[$timestamp] $speaker: $text",
+    "bullet": "- $text",
+    "footer": "Generated by AI Meeting Assistant",
+}
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 56
+LINE_HEIGHT = 14
+FONT_SIZE = 10
+TITLE_SIZE = 16
+WRAP_COLUMNS = 95
+MAX_EXCERPTS = 40
+MAX_SUMMARY_ITEMS = 15
+
+
+@lru_cache(maxsize=None)
+def _compiled_template(name: str) -> Template:
+    """Return the compiled template for ``name`` (compiled once per process)."""
+    return Template(REPORT_TEMPLATES[name])
+
+
+def _format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "Unknown"
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m {secs:02d}s"
+    return f"{minutes}m {secs:02d}s"
+
+
+def _format_timestamp(seconds: Any) -> str:
+    try:
+        total = int(float(seconds))
+    except (TypeError, ValueError):
+        return "--:--"
+    minutes, secs = divmod(total, 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def normalize_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce session metadata to the fields that affect the rendered report."""
+    excerpts = []
+    for item in (metadata.get("transcript_excerpts") or [])[:MAX_EXCERPTS]:
+        if isinstance(item, str):
+            item = {"text": item}
+        excerpts.append({
+            "timestamp": item.get("timestamp", item.get("start")),
+            "speaker": item.get("speaker") or "Speaker",
+            "text": str(item.get("text", "")).strip(),
+        })
+
+    summary = metadata.get("summary") or {}
+    return {
+        "session_id": metadata.get("session_id") or "n/a",
+        "meet_url": metadata.get("meet_url") or "Not provided",
+        "started_at": metadata.get("recording_started_at") or "Unknown",
+        "ended_at": metadata.get("recording_ended_at") or "In progress",
+        "duration_seconds": metadata.get("duration_seconds"),
+        "participant_count": metadata.get("participant_count") or 0,
+        "attendees": sorted(metadata.get("attendees") or []),
+        "transcript_excerpts": excerpts,
+        "summary": {
+            "overview": str(summary.get("overview") or "").strip(),
+            "key_points": [str(p) for p in (summary.get("key_points") or [])[:MAX_SUMMARY_ITEMS]],
+            "action_items": [str(a) for a in (summary.get("action_items") or [])[:MAX_SUMMARY_ITEMS]],
+        },
+    }
+
+
+def report_hash(metadata: Dict[str, Any]) -> str:
+    """Content hash identifying a rendered report for the given metadata."""
+    canonical = json.dumps(normalize_metadata(metadata), sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256()
+    digest.update(TEMPLATE_VERSION.encode())
+    digest.update(canonical.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _report_lines(report: Dict[str, Any]) -> List[str]:
+    details = _compiled_template("details").substitute(
+        meet_url=report["meet_url"],
+        session_id=report["session_id"],
+        started_at=report["started_at"],
+        ended_at=report["ended_at"],
+        duration=_format_duration(report["duration_seconds"]),
+        participant_count=report["participant_count"],
+    )
+    lines = details.splitlines()
+
+    if report["attendees"]:
+        lines.append(_compiled_template("attendees").substitute(attendees=", ".join(report["attendees"])))
+
+    summary = report["summary"]
+    if summary["overview"] or summary["key_points"] or summary["action_items"]:
+        bullet = _compiled_template("bullet")
+        lines.append("")
+        lines.append("Summary")
+        if summary["overview"]:
+            lines.append(summary["overview"])
+        for title, items in (("Key Points", summary["key_points"]), ("Action Items", summary["action_items"])):
+            if items:
+                lines.append("")
+                lines.append(title)
+                lines.extend(bullet.substitute(text=item) for item in items)
+
+    lines.append("")
+    lines.append("Transcript Excerpts")
+    if report["transcript_excerpts"]:
+        excerpt_template = _compiled_template("excerpt")
+        for excerpt in report["transcript_excerpts"]:
+            lines.append(excerpt_template.substitute(
+                timestamp=_format_timestamp(excerpt["timestamp"]),
+                speaker=excerpt["speaker"],
+                text=excerpt["text"],
+            ))
+    else:
+        lines.append("No transcript available for this meeting.")
+
+    lines.append("")
+    lines.append(_compiled_template("footer").substitute())
+
+    wrapped: List[str] = []
+    for line in lines:
+        wrapped.extend(textwrap.wrap(line, WRAP_COLUMNS, subsequent_indent="    ") or [""])
+    return wrapped
+
+
+def _pdf_escape(text: str) -> str:
+    # The built-in Helvetica font only covers Latin-1; anything else is replaced.
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(title: str, lines: List[str]) -> bytes:
+    """Build a minimal multi-page text PDF using the standard Helvetica font."""
+    per_page = (PAGE_HEIGHT - 2 * MARGIN - 2 * LINE_HEIGHT) // LINE_HEIGHT
+    pages = [lines[i:i + per_page] for i in range(0, len(lines), per_page)] or [[]]
+
+    objects: List[bytes] = []
+    page_ids = []
+    font_id = 3
+    next_id = 4
+    for index, page_lines in enumerate(pages):
+        stream = ["BT", f"/F1 {TITLE_SIZE} Tf", f"{MARGIN} {PAGE_HEIGHT - MARGIN} Td"]
+        if index == 0:
+            stream.append(f"({_pdf_escape(title)}) Tj")
+        stream += [f"/F1 {FONT_SIZE} Tf", f"{LINE_HEIGHT} TL", "T*", "T*"]
+        for line in page_lines:
+            stream.append(f"({_pdf_escape(line)}) Tj T*")
+        stream.append("ET")
+        content = "\n".join(stream).encode("latin-1")
+
+        page_id, content_id = next_id, next_id + 1
+        next_id += 2
+        page_ids.append(page_id)
+        objects.append((
+            f"{page_id} 0 obj\n<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>\nendobj\n"
+        ).encode("latin-1"))
+        objects.append(
+            f"{content_id} 0 obj\n<< /Length {len(content)} >>\nstream\n".encode("latin-1")
+            + content + b"\nendstream\nendobj\n"
+        )
+
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    header_objects = [
+        b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n",
+        f"2 0 obj\n<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>\nendobj\n".encode("latin-1"),
+        b"3 0 obj\n<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>\nendobj\n",
+    ]
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for obj in header_objects + objects:
+        offsets.append(len(out))
+        out += obj
+
+    xref_offset = len(out)
+    out += f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode("latin-1")
+    out += (
+        f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    ).encode("latin-1")
+    return bytes(out)
+
+
+def render_report_file(metadata: Dict[str, Any], out_path: str) -> str:
+    """Render a report to ``out_path`` (runs inside a pool worker)."""
+    report = normalize_metadata(metadata)
+    pdf_bytes = build_pdf(_compiled_template("header").substitute(), _report_lines(report))
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pdf_bytes)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+class ReportRenderer:
+    """Renders per-meeting reports in a bounded process pool with a content-hash cache."""
+
+    def __init__(self, cache_dir: str, max_workers: int = 2):
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def cached_path(self, metadata: Dict[str, Any]) -> Path:
+        return self.cache_dir / f"report_{report_hash(metadata)}.pdf"
+
+    async def render(self, metadata: Dict[str, Any]) -> Path:
+        """Return the PDF for ``metadata``, rendering it in the pool only on a cache miss."""
+        out_path = self.cached_path(metadata)
+        if out_path.exists():
+            return out_path
+
+        key = out_path.name
+        pending = self._inflight.get(key)
+        if pending is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(self._get_pool(), render_report_file, dict(metadata), str(out_path))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _f: self._inflight.pop(key, None))
+
+        await asyncio.shield(pending)
+        return out_path
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,150 @@
+# selector_stats.py
+"""
+Adaptive ordering of the selectors used to drive Meet's join screen.
+
+The join flow keeps several candidate selectors per UI step (name field,
+mic and camera toggles, join button), because Meet's markup changes between
+rollouts. In practice the same one or two match on nearly every run. Trying
+the list in a fixed order wastes a full wait on every stale candidate before
+them. ``SelectorStats`` remembers how often each candidate was tried and how
+often it won, per step, in a JSON file that survives restarts.
+
+``search`` first tries the historically best candidates with a short timeout.
+Only when all of those miss does it sweep every candidate with the full
+timeout, in order of smoothed success rate (unseen candidates keep their
+listed order).
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+Candidate = Union[str, Tuple[str, str]]
+
+
+def candidate_key(candidate: Candidate) -> str:
+    """Stable name for a candidate: the selector itself, or ``"<by>:<value>"`` for locator tuples."""
+    if isinstance(candidate, str):
+        return candidate
+    by, value = candidate
+    return f"{by}:{value}"
+
+
+class SelectorStats:
+    """Per-step win/try counts for selector candidates, persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = None, fast_timeout: float = 5.0, fast_candidates: int = 2):
+        self.path = path
+        self.fast_timeout = fast_timeout
+        self.fast_candidates = fast_candidates
+        self._lock = threading.Lock()
+        self._steps: Dict[str, Dict[str, Dict[str, Any]]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        if not self.path:
+            return {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self._steps, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            print(f"⚠️ Could not save selector stats: {exc}")
+
+    @staticmethod
+    def _rate(entry: Optional[Dict[str, Any]]) -> float:
+        # Laplace smoothing: unseen candidates sit at 0.5, between proven winners and known misses
+        if not entry:
+            return 0.5
+        return (entry.get("wins", 0) + 1) / (entry.get("tries", 0) + 2)
+
+    def ordered(self, step: str, candidates: Sequence[Candidate]) -> List[Candidate]:
+        """``candidates`` by descending success rate; ties keep their listed order."""
+        with self._lock:
+            stats = dict(self._steps.get(step, {}))
+        indexed = list(enumerate(candidates))
+        indexed.sort(key=lambda item: (-self._rate(stats.get(candidate_key(item[1]))), item[0]))
+        return [candidate for _, candidate in indexed]
+
+    def preferred(self, step: str, candidates: Sequence[Candidate]) -> List[Candidate]:
+        """The best few candidates that have won before; these get the short timeout."""
+        with self._lock:
+            stats = dict(self._steps.get(step, {}))
+        winners = [c for c in self.ordered(step, candidates) if stats.get(candidate_key(c), {}).get("wins")]
+        return winners[:self.fast_candidates]
+
+    def record(self, step: str, tried: Sequence[Candidate], winner: Optional[Candidate]) -> None:
+        """Count one try for every candidate in ``tried`` and a win for ``winner``, then persist."""
+        now = datetime.now().isoformat()
+        with self._lock:
+            stats = self._steps.setdefault(step, {})
+            for candidate in tried:
+                entry = stats.setdefault(candidate_key(candidate), {"wins": 0, "tries": 0})
+                entry["tries"] += 1
+            if winner is not None:
+                entry = stats.setdefault(candidate_key(winner), {"wins": 0, "tries": 1})
+                entry["wins"] += 1
+                entry["last_win"] = now
+            self._save()
+
+    def search(
+        self,
+        step: str,
+        candidates: Sequence[Candidate],
+        probe: Callable[[Candidate, float], Any],
+        full_timeout: float,
+    ) -> Optional[Candidate]:
+        """Return the first candidate for which ``probe(candidate, timeout)`` is truthy, or None.
+
+        A probe that raises (e.g. a wait timing out) counts as a miss.
+        """
+        tried: List[Candidate] = []
+
+        def attempt(candidate: Candidate, timeout: float) -> bool:
+            tried.append(candidate)
+            try:
+                return bool(probe(candidate, timeout))
+            except Exception:
+                return False
+
+        winner = None
+        fast = self.preferred(step, candidates)
+        for candidate in fast:
+            if attempt(candidate, self.fast_timeout):
+                winner = candidate
+                break
+        if winner is None:
+            # Fallback sweep; the preferred ones get another, full-length chance (the page may just be slow)
+            for candidate in self.ordered(step, candidates):
+                if attempt(candidate, full_timeout):
+                    winner = candidate
+                    break
+        self.record(step, tried, winner)
+        return winner
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Per step, every candidate seen with its wins, tries and success rate, best first."""
+        with self._lock:
+            steps = json.loads(json.dumps(self._steps))
+        report = {}
+        for step, stats in sorted(steps.items()):
+            rows = [
+                {"selector": key, **entry, "success_rate": round(entry.get("wins", 0) / entry["tries"], 3) if entry.get("tries") else None}
+                for key, entry in stats.items()
+            ]
+            rows.sort(key=lambda row: -self._rate(row))
+            report[step] = rows
+        return report
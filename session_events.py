@@ -0,0 +1,141 @@
+# session_events.py
+"""
+Session lifecycle event bus.
+
+Backend code (including worker threads started with ``asyncio.to_thread``)
+publishes events such as ``joining``, ``recording`` or ``stopped``; every
+subscribed dashboard tab receives them over a single Server-Sent Events stream.
+The backend therefore does work once per state change instead of once per
+poll per tab.
+"""
+
+import json
+import asyncio
+import itertools
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set
+
+SESSION_EVENT_TYPES = (
+    "joining",
+    "admitted",
+    "recording",
+    "participants",
+    "stopping",
+    "stopped",
+    "stop_failed",
+    "report_ready",
+    "email_sent",
+    "failed",
+)
+
+
+class SessionEvent:
+    def __init__(self, event_id: int, event_type: str, session_id: Optional[str], data: Dict[str, Any]):
+        self.id = event_id
+        self.type = event_type
+        self.session_id = session_id
+        self.data = data
+        self.timestamp = datetime.now().isoformat()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": self.type,
+            "session_id": self.session_id,
+            "timestamp": self.timestamp,
+            **self.data,
+        }
+
+    def to_sse(self) -> str:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.to_dict())}\n\n"
+
+
+class _Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop, session_id: Optional[str], max_queue: int):
+        self.loop = loop
+        self.session_id = session_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+
+    def wants(self, event: SessionEvent) -> bool:
+        return self.session_id is None or event.session_id == self.session_id
+
+    def offer(self, event: SessionEvent) -> None:
+        # Runs on the subscriber's loop. A stalled client loses its oldest events
+        # rather than growing the queue without bound.
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(event)
+
+
+class SessionEventBus:
+    """Fan-out of session events to SSE subscribers, safe to publish from any thread."""
+
+    def __init__(self, history_size: int = 200, max_queue: int = 100):
+        self._ids = itertools.count(1)
+        self._history: Deque[SessionEvent] = deque(maxlen=history_size)
+        self._subscribers: Set[_Subscriber] = set()
+        self._lock = threading.Lock()
+        self._max_queue = max_queue
+
+    def publish(self, event_type: str, session_id: Optional[str] = None, **data: Any) -> SessionEvent:
+        with self._lock:
+            event = SessionEvent(next(self._ids), event_type, session_id, data)
+            self._history.append(event)
+            subscribers = [sub for sub in self._subscribers if sub.wants(event)]
+
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+            except RuntimeError:
+                # Subscriber's loop already closed
+                self._discard(sub)
+        return event
+
+    def _discard(self, sub: _Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def stream(
+        self,
+        session_id: Optional[str] = None,
+        last_event_id: int = 0,
+        heartbeat_seconds: float = 15.0,
+    ) -> AsyncIterator[str]:
+        """Yield SSE frames, replaying history newer than ``last_event_id`` first."""
+        sub = _Subscriber(asyncio.get_running_loop(), session_id, self._max_queue)
+        with self._lock:
+            self._subscribers.add(sub)
+            backlog = [
+                event for event in self._history
+                if event.id > last_event_id and sub.wants(event)
+            ] if last_event_id else []
+
+        try:
+            yield "retry: 3000\n\n"
+            sent_id = last_event_id
+            for event in backlog:
+                sent_id = event.id
+                yield event.to_sse()
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    # Comment frame keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                if event.id <= sent_id:
+                    continue
+                sent_id = event.id
+                yield event.to_sse()
+        finally:
+            self._discard(sub)
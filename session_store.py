@@ -0,0 +1,166 @@
+# session_store.py
+"""
+Journal of sessions that did not shut down cleanly.
+
+Shutdown stops every session in parallel under one deadline. A session
+still stopping when the deadline passes is written here, with its recording
+paths, the steps it did not finish, the PIDs it left behind and, when it was
+uploading, where its segments were going. On the next start
+``recover_session`` finishes what it can: it kills orphaned ffmpeg/Chrome
+processes, rebuilds the recording from its segments and resumes the upload
+and compose. It then notes the outcome in the recording's sidecar and drops
+the entry.
+"""
+
+import os
+import json
+import signal
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from storage import SegmentUploader, StorageBackend
+
+
+class InterruptedSessionStore:
+    """Small JSON file of interrupted sessions, keyed by session id."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entries, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def mark(self, entries: List[Dict[str, Any]]) -> None:
+        """Record interrupted sessions in one write (shutdown may be killed right after)."""
+        with self._lock:
+            current = self._read()
+            for entry in entries:
+                current[entry["session_id"]] = {**entry, "marked_at": datetime.now().isoformat()}
+            self._write(current)
+
+    def pending(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._read().values())
+
+    def clear(self, session_id: str) -> None:
+        with self._lock:
+            current = self._read()
+            if current.pop(session_id, None) is not None:
+                self._write(current)
+
+
+def _kill_if_matches(pid: int, names: tuple) -> bool:
+    """SIGKILL ``pid`` only if it is still one of ours (guards against PID reuse)."""
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            cmdline = f.read().replace(b"\0", b" ").decode(errors="replace").lower()
+    except OSError:
+        return False
+    if not any(name in cmdline for name in names):
+        return False
+    try:
+        os.kill(pid, signal.SIGKILL)
+        return True
+    except OSError:
+        return False
+
+
+def _rebuild_from_segments(out_path: str, segment_dir: str) -> Optional[int]:
+    """Concatenate the segments into ``out_path``; returns how many were joined."""
+    try:
+        names = sorted(n for n in os.listdir(segment_dir) if n.startswith("segment_") and not n.endswith(".csv"))
+    except OSError:
+        return None
+    paths = [os.path.join(segment_dir, n) for n in names if os.path.getsize(os.path.join(segment_dir, n)) > 0]
+    if not paths:
+        return None
+    tmp = out_path + ".part"
+    with open(tmp, "wb") as out:
+        for path in paths:
+            with open(path, "rb") as src:
+                while True:
+                    block = src.read(1 << 20)
+                    if not block:
+                        break
+                    out.write(block)
+    os.replace(tmp, out_path)
+    return len(paths)
+
+
+def _resume_upload(upload: Dict[str, Any], backend: Optional[StorageBackend]) -> Dict[str, Any]:
+    """Upload whatever segments are missing and compose the object; parts already stored are rewritten."""
+    if backend is None:
+        return {"upload_incomplete": True, "upload_error": "no upload backend configured"}
+    try:
+        result = SegmentUploader(
+            backend,
+            upload["segment_dir"],
+            upload["object_name"],
+            content_type=upload.get("content_type", "video/mp2t"),
+            segment_extension=upload.get("segment_extension", ".ts"),
+        ).finalize()
+    except Exception as exc:
+        return {"upload_incomplete": True, "upload_error": str(exc)}
+    return {"upload": result}
+
+
+def recover_session(entry: Dict[str, Any], upload_backend: Optional[StorageBackend] = None) -> Dict[str, Any]:
+    """Finish an interrupted session's cleanup; returns what was done (also stored in the sidecar)."""
+    notes: Dict[str, Any] = {"recovered_at": datetime.now().isoformat(), "recovery_steps": entry.get("pending_steps", [])}
+
+    killed = [pid for pid in entry.get("recorder_pids", []) if _kill_if_matches(pid, ("ffmpeg",))]
+    killed += [pid for pid in entry.get("browser_pids", []) if _kill_if_matches(pid, ("chrome", "chromium", "chromedriver"))]
+    if killed:
+        notes["killed_pids"] = killed
+
+    out_path = entry.get("recording_path")
+    segment_dir = entry.get("segment_dir")
+    if out_path and segment_dir and os.path.isdir(segment_dir):
+        joined = _rebuild_from_segments(out_path, segment_dir)
+        if joined:
+            notes["rebuilt_from_segments"] = joined
+    if out_path and out_path.endswith(".mp4") and not segment_dir:
+        # A single MP4 cut off before ffmpeg wrote its index cannot be repaired by copying
+        notes["possibly_unfinalized"] = True
+
+    upload = entry.get("upload")
+    if upload and "upload" in entry.get("pending_steps", []):
+        notes.update(_resume_upload(upload, upload_backend))
+
+    if out_path:
+        sidecar = os.path.splitext(out_path)[0] + ".json"
+        try:
+            with open(sidecar) as f:
+                metadata = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            metadata = {"session_id": entry["session_id"], "output_path": out_path}
+        if not metadata.get("recording_ended_at") and os.path.exists(out_path):
+            metadata["recording_ended_at"] = datetime.fromtimestamp(os.path.getmtime(out_path)).isoformat()
+        metadata.setdefault("end_reason", "shutdown_deadline")
+        metadata.pop("recovery_needed", None)
+        if "upload" in notes:
+            metadata.pop("upload_incomplete", None)
+            metadata["upload"] = notes["upload"]
+        elif notes.get("upload_incomplete"):
+            metadata["upload_incomplete"] = True
+        metadata["recovery"] = notes
+        tmp = sidecar + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(tmp, sidecar)
+    return notes
@@ -0,0 +1,183 @@
+# speaker_timeline.py
+"""
+Active-speaker timeline scraped from the Meet DOM.
+
+Meet already highlights whoever is talking, so instead of diarizing the mixed
+recorder audio an injected observer watches the participant tiles and pushes
+``(time, participant, speaking)`` changes into an in-page buffer. The backend
+drains that buffer periodically, aligns the page's monotonic clock to the
+recorder start, and folds the changes into a compact interval list that is
+stored in the recording's metadata sidecar and used to attribute transcript
+segments to speakers.
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Participant tiles and the markers Meet toggles on a tile while its audio is active.
+# Meet's class names change between releases; keep these lists in one place.
+TILE_SELECTOR = "[data-participant-id]"
+SPEAKING_SELECTORS = [
+    "[data-is-speaking='true']",
+    "[data-audio-level]:not([data-audio-level='0'])",
+    ".IisKdb.gjg47c",
+    ".kssMZb",
+]
+NAME_SELECTORS = ["[data-self-name]", ".zWGUib", ".XEazBc", ".dwSJ2e"]
+
+_OBSERVER_TEMPLATE = """
+(() => {
+    if (location.hostname !== 'meet.google.com' || window.__meetSpeakerObserver) return;
+    const TILE = %(tile)s, SPEAKING = %(speaking)s, NAMES = %(names)s, LIMIT = 5000;
+    const events = window.__meetSpeakerEvents = [];
+    let active = new Map();
+    let pending = false;
+
+    const clock = () => performance.timeOrigin + performance.now();
+    const nameOf = (tile) => {
+        for (const sel of NAMES) {
+            const el = tile.querySelector(sel);
+            const text = el && (el.getAttribute('data-self-name') || el.textContent || '').trim();
+            if (text) return text;
+        }
+        return (tile.getAttribute('aria-label') || '').trim();
+    };
+    const speaking = (tile) => SPEAKING.some((sel) => tile.matches(sel) || tile.querySelector(sel));
+
+    const scan = () => {
+        pending = false;
+        const t = clock();
+        const now = new Map();
+        for (const tile of document.querySelectorAll(TILE)) {
+            const id = tile.getAttribute('data-participant-id');
+            if (id && !now.has(id) && speaking(tile)) now.set(id, nameOf(tile));
+        }
+        for (const [id, name] of now) if (!active.has(id)) events.push([t, id, name, 1]);
+        for (const [id, name] of active) if (!now.has(id)) events.push([t, id, name, 0]);
+        if (events.length > LIMIT) events.splice(0, events.length - LIMIT);
+        active = now;
+    };
+
+    const observer = new MutationObserver(() => {
+        // Coalesce bursts of mutations into one scan per frame-ish interval
+        if (!pending) { pending = true; setTimeout(scan, 100); }
+    });
+    const attach = () => {
+        observer.observe(document.body, {subtree: true, childList: true, attributes: true,
+                                         attributeFilter: ['class', 'data-is-speaking', 'data-audio-level']});
+        scan();
+    };
+    window.__meetSpeakerObserver = observer;
+    if (document.body) attach(); else document.addEventListener('DOMContentLoaded', attach);
+})();
+"""
+
+ACTIVE_SPEAKER_SCRIPT = _OBSERVER_TEMPLATE % {
+    "tile": json.dumps(TILE_SELECTOR),
+    "speaking": json.dumps(SPEAKING_SELECTORS),
+    "names": json.dumps(NAME_SELECTORS),
+}
+
+_DRAIN_SCRIPT = "return (window.__meetSpeakerEvents || []).splice(0);"
+_CLOCK_SCRIPT = "return performance.timeOrigin + performance.now();"
+
+
+def page_clock_origin(driver, recorder_started: float) -> float:
+    """Page-clock time (ms) at which the recorder started, given its ``time.monotonic()`` start.
+
+    Subtracting this from an in-page ``performance.timeOrigin + performance.now()``
+    stamp gives milliseconds into the recording.
+    """
+    before = time.monotonic()
+    page_now = float(driver.execute_script(_CLOCK_SCRIPT))
+    after = time.monotonic()
+    # Assume the round trip is symmetric and read the page clock at its midpoint
+    elapsed_ms = ((before + after) / 2 - recorder_started) * 1000.0
+    return page_now - elapsed_ms
+
+
+class SpeakerTimeline:
+    """Collects active-speaker changes and turns them into ``[speaker, start_ms, end_ms]`` intervals."""
+
+    def __init__(self, merge_gap_ms: int = 400, min_interval_ms: int = 200):
+        self.merge_gap_ms = merge_gap_ms
+        self.min_interval_ms = min_interval_ms
+        self.page_origin_ms: Optional[float] = None
+        self.speakers: List[Dict[str, str]] = []
+        self._speaker_index: Dict[str, int] = {}
+        self._open: Dict[int, int] = {}
+        self.intervals: List[List[int]] = []
+
+    def align(self, driver, recorder_started: float) -> None:
+        self.page_origin_ms = page_clock_origin(driver, recorder_started)
+
+    def _index(self, participant_id: str, name: str) -> int:
+        index = self._speaker_index.get(participant_id)
+        if index is None:
+            index = len(self.speakers)
+            self._speaker_index[participant_id] = index
+            self.speakers.append({"id": participant_id, "name": name})
+        elif name and not self.speakers[index]["name"]:
+            self.speakers[index]["name"] = name
+        return index
+
+    def _close(self, index: int, end_ms: int) -> None:
+        start_ms = self._open.pop(index, None)
+        if start_ms is None or end_ms - start_ms < self.min_interval_ms:
+            return
+        # Extend this speaker's previous interval across a short pause instead of adding a new one
+        for interval in reversed(self.intervals):
+            if interval[0] == index:
+                if start_ms - interval[2] <= self.merge_gap_ms:
+                    interval[2] = max(interval[2], end_ms)
+                    return
+                break
+        self.intervals.append([index, start_ms, end_ms])
+
+    def ingest(self, events: List[Tuple[float, str, str, int]]) -> None:
+        """Apply raw ``(page_ms, participant_id, name, speaking)`` events from the observer."""
+        if self.page_origin_ms is None:
+            return
+        for page_ms, participant_id, name, speaking in events:
+            at = max(0, int(round(page_ms - self.page_origin_ms)))
+            index = self._index(participant_id, name)
+            if speaking:
+                self._open.setdefault(index, at)
+            else:
+                self._close(index, at)
+
+    def drain(self, driver) -> int:
+        """Pull buffered events out of the page; returns how many were applied."""
+        events = driver.execute_script(_DRAIN_SCRIPT) or []
+        self.ingest(events)
+        return len(events)
+
+    def finish(self, end_ms: int) -> None:
+        """Close intervals still open when the recording stops."""
+        for index in list(self._open):
+            self._close(index, end_ms)
+        self.intervals.sort(key=lambda interval: interval[1])
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {"speakers": self.speakers, "intervals": self.intervals}
+
+
+def assign_speakers(segments: List[Dict[str, Any]], timeline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Label transcript segments (times in seconds) with the speaker overlapping them most."""
+    speakers = timeline.get("speakers") or []
+    intervals = timeline.get("intervals") or []
+    for segment in segments:
+        start_ms = segment["start"] * 1000.0
+        end_ms = segment["end"] * 1000.0
+        overlap: Dict[int, float] = {}
+        for index, s, e in intervals:
+            if s >= end_ms:
+                break
+            shared = min(e, end_ms) - max(s, start_ms)
+            if shared > 0:
+                overlap[index] = overlap.get(index, 0.0) + shared
+        if overlap:
+            best = max(overlap, key=overlap.get)
+            segment["speaker"] = speakers[best]["name"] or speakers[best]["id"]
+    return segments
@@ -0,0 +1,124 @@
+# stop_jobs.py
+"""
+Background jobs that stop recording sessions.
+
+Stopping a session means waiting for ffmpeg to finalize, an ffprobe check,
+the tab recorder's last chunks, the transcript/summary writers and
+``driver.quit()``. That takes seconds. /stop-recording starts a ``StopJob``
+and returns its handle at once. Callers can poll ``/stop-jobs/{job_id}``
+(optionally long-polling until the job ends) or listen for the ``stopped`` /
+``stop_failed`` events on /events.
+
+Each session has at most one running job. A second stop request for the same
+session, from a user or from the meeting supervisor, gets the job that is
+already running instead of starting another. The registry is only used from
+the event loop, so it needs no locking of its own.
+"""
+
+import uuid
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class StopJob:
+    def __init__(self, session_id: str, reason: str):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.session_id = session_id
+        self.reason = reason
+        self.status = JOB_PENDING
+        self.created_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "session_id": self.session_id,
+            "reason": self.reason,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class StopJobRegistry:
+    """Running stop jobs, one per session, plus a bounded history of finished ones."""
+
+    def __init__(self, history_size: int = 200):
+        self.history_size = history_size
+        self._jobs: "OrderedDict[str, StopJob]" = OrderedDict()
+        self._running: Dict[str, StopJob] = {}
+
+    def running_for(self, session_id: str) -> Optional[StopJob]:
+        return self._running.get(session_id)
+
+    def submit(
+        self,
+        session_id: str,
+        reason: str,
+        run: Callable[[StopJob], Awaitable[Dict[str, Any]]],
+    ) -> Tuple[StopJob, bool]:
+        """Start ``run(job)`` as a task; returns ``(job, created)``.
+
+        When the session already has a running job, that job is returned with ``created`` False.
+        """
+        existing = self._running.get(session_id)
+        if existing is not None:
+            return existing, False
+
+        job = StopJob(session_id, reason)
+        self._running[session_id] = job
+        self._jobs[job.job_id] = job
+        self._trim()
+        job.task = asyncio.create_task(self._run(job, run))
+        return job, True
+
+    async def _run(self, job: StopJob, run: Callable[[StopJob], Awaitable[Dict[str, Any]]]) -> None:
+        job.status = JOB_RUNNING
+        job.started_at = datetime.now().isoformat()
+        try:
+            job.result = await run(job)
+            job.status = JOB_DONE
+        except Exception as exc:
+            # HTTPException carries its message in ``detail``
+            job.error = str(getattr(exc, "detail", None) or exc)
+            job.status = JOB_FAILED
+        finally:
+            job.finished_at = datetime.now().isoformat()
+            if self._running.get(job.session_id) is job:
+                del self._running[job.session_id]
+
+    def get(self, job_id: str) -> Optional[StopJob]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: StopJob, timeout: float) -> StopJob:
+        """Wait up to ``timeout`` seconds for ``job`` to finish; the job keeps running either way."""
+        if job.task is not None and not job.finished and timeout > 0:
+            try:
+                await asyncio.wait_for(asyncio.shield(job.task), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    def _trim(self) -> None:
+        # Only finished jobs are forgotten; a running job must stay queryable
+        excess = len(self._jobs) - self.history_size
+        for job_id in [jid for jid, job in self._jobs.items() if job.finished][:max(0, excess)]:
+            del self._jobs[job_id]
@@ -0,0 +1,283 @@
+# storage.py
+"""
+Upload-while-recording to object storage.
+
+``SegmentUploader`` watches a recorder's segment directory and ships every
+completed segment as soon as ffmpeg closes it, concurrently with the rest of
+the meeting. Each part is checksummed and retried on failure, and when the
+recording stops the parts are composed into the final object, so sharing
+only waits for the last segment instead of the whole file.
+
+Backends are pluggable: ``LocalStorageBackend`` writes to a directory (used
+for tests and single-host setups) and ``GCSStorageBackend`` uses Google Cloud
+Storage's native compose.
+"""
+
+import os
+import csv
+import time
+import base64
+import shutil
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, List, Optional
+
+from recorder import SEGMENT_LIST_NAME
+
+HASH_CHUNK = 1024 * 1024
+
+
+class StorageError(Exception):
+    """Raised when a part cannot be stored or verified."""
+
+
+def file_md5(path: str) -> str:
+    """Base64 MD5 of a file, the format GCS reports in ``md5_hash``."""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return base64.b64encode(digest.digest()).decode()
+
+
+def part_name(object_name: str, index: int) -> str:
+    return f"{object_name}.parts/{index:05d}"
+
+
+class StorageBackend:
+    """Interface every storage backend implements."""
+
+    name = "base"
+
+    def put_part(self, object_name: str, index: int, local_path: str, md5: str) -> None:
+        """Store one part and verify it against ``md5``; raise StorageError on mismatch."""
+        raise NotImplementedError
+
+    def compose(self, object_name: str, part_count: int, content_type: str) -> Dict[str, Any]:
+        """Concatenate parts 0..part_count-1 into ``object_name`` and remove the parts."""
+        raise NotImplementedError
+
+
+class LocalStorageBackend(StorageBackend):
+    """Stores objects under a local directory, mirroring object names as paths."""
+
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def _path(self, name: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, name))
+        if not path.startswith(self.root + os.sep):
+            raise StorageError(f"Object name escapes storage root: {name}")
+        return path
+
+    def put_part(self, object_name, index, local_path, md5):
+        dest = self._path(part_name(object_name, index))
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = dest + ".tmp"
+        shutil.copyfile(local_path, tmp)
+        if file_md5(tmp) != md5:
+            os.remove(tmp)
+            raise StorageError(f"Checksum mismatch for part {index} of {object_name}")
+        os.replace(tmp, dest)
+
+    def compose(self, object_name, part_count, content_type):
+        dest = self._path(object_name)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = dest + ".tmp"
+        with open(tmp, "wb") as out:
+            for index in range(part_count):
+                with open(self._path(part_name(object_name, index)), "rb") as src:
+                    shutil.copyfileobj(src, out, HASH_CHUNK)
+        os.replace(tmp, dest)
+        shutil.rmtree(self._path(f"{object_name}.parts"), ignore_errors=True)
+        return {
+            "backend": self.name,
+            "object": object_name,
+            "uri": f"file://{dest}",
+            "size": os.path.getsize(dest),
+            "content_type": content_type,
+            "md5": file_md5(dest),
+        }
+
+
+class GCSStorageBackend(StorageBackend):
+    """Google Cloud Storage backend; parts are server-side composed into the final object."""
+
+    name = "gcs"
+    # GCS compose accepts at most 32 source objects per request
+    MAX_COMPOSE_SOURCES = 32
+
+    def __init__(self, bucket_name: str, client=None):
+        if client is None:
+            from google.cloud import storage  # imported lazily; only needed for this backend
+            client = storage.Client()
+        self.bucket_name = bucket_name
+        self.bucket = client.bucket(bucket_name)
+
+    def put_part(self, object_name, index, local_path, md5):
+        blob = self.bucket.blob(part_name(object_name, index))
+        blob.md5_hash = md5
+        # Sending the MD5 makes GCS reject the upload if the bytes were corrupted in flight
+        blob.upload_from_filename(local_path, checksum="md5")
+
+    def compose(self, object_name, part_count, content_type):
+        sources = [self.bucket.blob(part_name(object_name, i)) for i in range(part_count)]
+        intermediates = []
+        # Fold in batches so recordings with more than 32 segments still compose
+        while len(sources) > self.MAX_COMPOSE_SOURCES:
+            batch, sources = sources[:self.MAX_COMPOSE_SOURCES], sources[self.MAX_COMPOSE_SOURCES:]
+            merged = self.bucket.blob(f"{object_name}.parts/merged_{len(intermediates):05d}")
+            merged.compose(batch)
+            intermediates.append(merged)
+            sources.insert(0, merged)
+
+        final = self.bucket.blob(object_name)
+        final.content_type = content_type
+        final.compose(sources)
+        final.reload()
+
+        for i in range(part_count):
+            self.bucket.blob(part_name(object_name, i)).delete()
+        for blob in intermediates:
+            blob.delete()
+
+        return {
+            "backend": self.name,
+            "object": object_name,
+            "uri": f"gs://{self.bucket_name}/{object_name}",
+            "size": final.size,
+            "content_type": content_type,
+            "crc32c": final.crc32c,
+        }
+
+
+def create_backend(kind: Optional[str]) -> Optional[StorageBackend]:
+    """Build the backend named by MEET_UPLOAD_BACKEND ('local', 'gcs' or empty to disable)."""
+    kind = (kind or "").strip().lower()
+    if not kind:
+        return None
+    if kind == "local":
+        return LocalStorageBackend(os.getenv("MEET_UPLOAD_LOCAL_ROOT", "./uploads"))
+    if kind == "gcs":
+        bucket = os.getenv("MEET_UPLOAD_BUCKET")
+        if not bucket:
+            raise StorageError("MEET_UPLOAD_BUCKET must be set for the gcs upload backend")
+        return GCSStorageBackend(bucket)
+    raise StorageError(f"Unknown upload backend: {kind}")
+
+
+class SegmentUploader:
+    """Uploads a recorder's completed segments while recording continues."""
+
+    def __init__(
+        self,
+        backend: StorageBackend,
+        segment_dir: str,
+        object_name: str,
+        content_type: str = "video/mp2t",
+        segment_extension: str = ".ts",
+        max_workers: int = 4,
+        max_retries: int = 3,
+        poll_interval: float = 1.0,
+        on_part_uploaded: Optional[Callable[[int, str], None]] = None,
+    ):
+        self.backend = backend
+        self.segment_dir = segment_dir
+        self.object_name = object_name
+        self.content_type = content_type
+        self.segment_extension = segment_extension
+        self.max_retries = max_retries
+        self.poll_interval = poll_interval
+        self.on_part_uploaded = on_part_uploaded
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="segment-upload")
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SegmentUploader":
+        self._thread = threading.Thread(target=self._watch, name="segment-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def completed_segments(self) -> List[str]:
+        """Segment file names ffmpeg has finished writing, in order."""
+        list_path = os.path.join(self.segment_dir, SEGMENT_LIST_NAME)
+        try:
+            with open(list_path, newline="") as f:
+                return [row[0] for row in csv.reader(f) if row]
+        except FileNotFoundError:
+            return []
+
+    def _all_segments(self) -> List[str]:
+        try:
+            names = os.listdir(self.segment_dir)
+        except FileNotFoundError:
+            return []
+        return sorted(n for n in names if n.startswith("segment_") and n.endswith(self.segment_extension))
+
+    def _submit(self, names: List[str]) -> None:
+        with self._lock:
+            for name in names:
+                if name in self._futures:
+                    continue
+                self._futures[name] = self._executor.submit(self._upload_segment, name)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self._submit(self.completed_segments())
+
+    def _upload_segment(self, name: str) -> str:
+        index = int(name[len("segment_"):-len(self.segment_extension)])
+        local_path = os.path.join(self.segment_dir, name)
+        md5 = file_md5(local_path)
+
+        delay = 1.0
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                self.backend.put_part(self.object_name, index, local_path, md5)
+                if self.on_part_uploaded:
+                    self.on_part_uploaded(index, md5)
+                return md5
+            except Exception as exc:
+                if attempt == self.max_retries:
+                    raise StorageError(f"Failed to upload {name} after {attempt} attempts: {exc}") from exc
+                print(f"⚠️ Upload of {name} failed (attempt {attempt}): {exc}; retrying in {delay:.0f}s")
+                time.sleep(delay)
+                delay *= 2
+        return md5
+
+    def finalize(self) -> Dict[str, Any]:
+        """Call after the recorder has stopped: upload the tail and compose the final object."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval + 1)
+
+        # Once ffmpeg has exited every segment on disk is complete, listed or not
+        names = self._all_segments()
+        self._submit(names)
+        try:
+            with self._lock:
+                futures = [self._futures[name] for name in names]
+            for future in futures:
+                future.result()
+        finally:
+            self._executor.shutdown(wait=True)
+
+        if not names:
+            raise StorageError(f"No segments found in {self.segment_dir}")
+        expected = [f"segment_{i:05d}{self.segment_extension}" for i in range(len(names))]
+        if names != expected:
+            raise StorageError(f"Segment sequence has gaps: {names}")
+
+        result = self.backend.compose(self.object_name, len(names), self.content_type)
+        result["parts"] = len(names)
+        return result
+
+    def abort(self) -> None:
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
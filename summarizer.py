@@ -0,0 +1,340 @@
+# summarizer.py
+"""
+Incremental map-reduce meeting summarization.
+
+A session's transcript is cut into fixed time windows. Each window is
+summarized (the "map") as soon as the meeting has moved past it, while the
+meeting is still running, and the result is cached under a hash of the window's
+text and the model configuration. When the meeting ends only the last window
+and the final "reduce", which combines the window summaries, are left to do.
+
+Models are pluggable: ``ExtractiveStubModel`` is a deterministic local
+stand-in, and ``OpenAICompatibleModel`` talks to any chat-completions endpoint.
+"""
+
+import os
+import re
+import json
+import hashlib
+import threading
+import urllib.request
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+SUMMARY_VERSION = "1"
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z0-9']+")
+_ACTION = re.compile(
+    r"\b(will|going to|need to|needs to|should|must|action item|follow up|follow-up|todo|to-do|deadline|by (monday|tuesday|wednesday|thursday|friday|tomorrow|next week))\b",
+    re.IGNORECASE,
+)
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i if in into is it its just like me my no not of on or "
+    "our so that the their them then there they this to up was we were what when which who will with you your "
+    "yeah okay ok um uh so do does did can could would should".split()
+)
+
+
+class SummaryModel:
+    """Interface for summarization backends."""
+
+    name = "base"
+
+    def cache_key(self) -> str:
+        """Identifies the model configuration; part of every window's cache key."""
+        return self.name
+
+    def summarize_window(self, segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Map: summarize one window of ``{"start", "end", "text", "speaker"?}`` segments.
+
+        Returns ``{"summary": str, "key_points": [str], "action_items": [str]}``.
+        """
+        raise NotImplementedError
+
+    def reduce(self, windows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Reduce: combine window summaries into ``{"overview", "key_points", "action_items"}``."""
+        raise NotImplementedError
+
+
+def _sentences(segments: List[Dict[str, Any]]) -> List[str]:
+    sentences = []
+    for segment in segments:
+        text = str(segment.get("text", "")).strip()
+        if not text:
+            continue
+        speaker = segment.get("speaker")
+        for sentence in _SENTENCE_SPLIT.split(text):
+            sentence = sentence.strip()
+            if sentence:
+                sentences.append(f"{speaker}: {sentence}" if speaker else sentence)
+    return sentences
+
+
+def _dedupe(items: List[str], limit: int) -> List[str]:
+    seen = set()
+    out = []
+    for item in items:
+        key = item.lower()
+        if key not in seen:
+            seen.add(key)
+            out.append(item)
+        if len(out) >= limit:
+            break
+    return out
+
+
+class ExtractiveStubModel(SummaryModel):
+    """Deterministic stand-in: picks the highest-scoring sentences by term frequency."""
+
+    name = "extractive-stub"
+
+    def __init__(self, sentences_per_window: int = 3, max_key_points: int = 10):
+        self.sentences_per_window = sentences_per_window
+        self.max_key_points = max_key_points
+
+    def cache_key(self) -> str:
+        return f"{self.name}:{self.sentences_per_window}:{self.max_key_points}"
+
+    def _rank(self, sentences: List[str]) -> List[str]:
+        words = [[w for w in _WORD.findall(s.lower()) if w not in _STOPWORDS] for s in sentences]
+        freq = Counter(w for ws in words for w in ws)
+        scored = [
+            (sum(freq[w] for w in ws) / (len(ws) ** 0.5 or 1.0), -i)
+            for i, ws in enumerate(words)
+        ]
+        top = sorted(range(len(sentences)), key=lambda i: scored[i], reverse=True)[:self.sentences_per_window]
+        return [sentences[i] for i in sorted(top)]
+
+    def summarize_window(self, segments):
+        sentences = _sentences(segments)
+        key_points = self._rank(sentences)
+        return {
+            "summary": " ".join(key_points),
+            "key_points": key_points,
+            "action_items": [s for s in sentences if _ACTION.search(s)],
+        }
+
+    def reduce(self, windows):
+        key_points = _dedupe([p for w in windows for p in w.get("key_points", [])[:2]], self.max_key_points)
+        overview = " ".join(_dedupe([w["key_points"][0] for w in windows if w.get("key_points")], 5))
+        return {
+            "overview": overview,
+            "key_points": key_points,
+            "action_items": _dedupe([a for w in windows for a in w.get("action_items", [])], 50),
+        }
+
+
+class OpenAICompatibleModel(SummaryModel):
+    """Summarizes through an OpenAI-style ``/chat/completions`` endpoint."""
+
+    name = "openai-compatible"
+
+    def __init__(self, base_url: str, model: str, api_key: Optional[str] = None, timeout: float = 60.0):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def cache_key(self) -> str:
+        return f"{self.name}:{self.base_url}:{self.model}"
+
+    def _complete_json(self, instructions: str, content: str) -> Dict[str, Any]:
+        body = json.dumps({
+            "model": self.model,
+            "temperature": 0,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": instructions},
+                {"role": "user", "content": content},
+            ],
+        }).encode()
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        request = urllib.request.Request(f"{self.base_url}/chat/completions", data=body, headers=headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+            reply = json.load(resp)
+        return json.loads(reply["choices"][0]["message"]["content"])
+
+    def summarize_window(self, segments):
+        transcript = "\n".join(_sentences(segments))
+        result = self._complete_json(
+            "Summarize this part of a meeting transcript. Reply with JSON: "
+            '{"summary": string, "key_points": [string], "action_items": [string]}.',
+            transcript,
+        )
+        return {
+            "summary": str(result.get("summary", "")),
+            "key_points": list(result.get("key_points") or []),
+            "action_items": list(result.get("action_items") or []),
+        }
+
+    def reduce(self, windows):
+        result = self._complete_json(
+            "These are summaries of consecutive parts of one meeting. Combine them. Reply with JSON: "
+            '{"overview": string, "key_points": [string], "action_items": [string]}.',
+            json.dumps(windows),
+        )
+        return {
+            "overview": str(result.get("overview", "")),
+            "key_points": list(result.get("key_points") or []),
+            "action_items": list(result.get("action_items") or []),
+        }
+
+
+def create_summary_model(kind: Optional[str]) -> SummaryModel:
+    """Build the model named by SUMMARY_MODEL ('local' or 'openai')."""
+    kind = (kind or "local").strip().lower()
+    if kind == "local":
+        return ExtractiveStubModel()
+    if kind == "openai":
+        return OpenAICompatibleModel(
+            os.getenv("SUMMARY_API_BASE", "https://api.openai.com/v1"),
+            os.getenv("SUMMARY_API_MODEL", "gpt-4o-mini"),
+            os.getenv("SUMMARY_API_KEY"),
+        )
+    raise ValueError(f"Unknown summary model: {kind}")
+
+
+class SummaryCache:
+    """One JSON file per window or reduce result, keyed by content + model hash."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self._path(key) + f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp, self._path(key))
+
+
+def content_hash(model: SummaryModel, stage: str, payload: Any) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{SUMMARY_VERSION}:{stage}:{model.cache_key()}".encode())
+    digest.update(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def split_windows(segments: List[Dict[str, Any]], window_seconds: float) -> Dict[int, List[Dict[str, Any]]]:
+    """Group segments by the window their start time falls in."""
+    windows: Dict[int, List[Dict[str, Any]]] = {}
+    for segment in segments:
+        index = int(max(0.0, float(segment["start"])) // window_seconds)
+        windows.setdefault(index, []).append(
+            {"start": segment["start"], "end": segment["end"], "text": segment.get("text", ""), "speaker": segment.get("speaker")}
+        )
+    return windows
+
+
+class IncrementalSummarizer:
+    """Summarizes transcript windows as they close and reduces them at the end."""
+
+    def __init__(
+        self,
+        model: SummaryModel,
+        cache: SummaryCache,
+        window_seconds: float = 300.0,
+        settle_seconds: float = 15.0,
+        max_workers: int = 2,
+    ):
+        self.model = model
+        self.cache = cache
+        self.window_seconds = window_seconds
+        # Captions keep being revised for a few seconds; wait before treating a window as final
+        self.settle_seconds = settle_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="summary-map")
+        self._lock = threading.Lock()
+        self._jobs: Dict[Tuple[int, str], Future] = {}
+        # Highest window index observe() has already queued
+        self._handed_off = -1
+
+    def _map(self, key: str, window: List[Dict[str, Any]]) -> Dict[str, Any]:
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        result = self.model.summarize_window(window)
+        self.cache.put(key, result)
+        return result
+
+    def _submit(self, index: int, window: List[Dict[str, Any]]) -> Future:
+        key = content_hash(self.model, "map", window)
+        with self._lock:
+            job = self._jobs.get((index, key))
+            if job is None:
+                job = self._jobs[(index, key)] = self._executor.submit(self._map, key, window)
+            return job
+
+    def _closed_through(self, position_seconds: float) -> int:
+        """Index of the last window that has closed and settled at ``position_seconds``."""
+        return int((position_seconds - self.settle_seconds) // self.window_seconds) - 1
+
+    def due(self, position_seconds: float) -> bool:
+        """True once a window past the ones already queued has closed; cheap enough to call every tick."""
+        return self._closed_through(position_seconds) > self._handed_off
+
+    def observe(self, segments: List[Dict[str, Any]], position_seconds: float) -> int:
+        """Queue map jobs for windows closed since the last call; returns windows queued.
+
+        Earlier windows are not looked at again here; revisions to them are picked up by ``finalize``.
+        """
+        last = self._closed_through(position_seconds)
+        if last <= self._handed_off:
+            return 0
+        first_start = (self._handed_off + 1) * self.window_seconds
+        fresh = [segment for segment in segments if float(segment["start"]) >= first_start]
+        closed = 0
+        for index, window in split_windows(fresh, self.window_seconds).items():
+            if index <= last:
+                self._submit(index, window)
+                closed += 1
+        self._handed_off = last
+        return closed
+
+    def finalize(self, segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Map whatever is left (usually just the last window) and run the reduce."""
+        windows = split_windows(segments, self.window_seconds)
+        jobs = [(index, self._submit(index, windows[index])) for index in sorted(windows)]
+        try:
+            summaries = []
+            for index, job in jobs:
+                summaries.append({
+                    "start": index * self.window_seconds,
+                    "end": (index + 1) * self.window_seconds,
+                    **job.result(),
+                })
+        finally:
+            self._executor.shutdown(wait=False)
+
+        if not summaries:
+            return {"overview": "", "key_points": [], "action_items": [], "windows": []}
+
+        key = content_hash(self.model, "reduce", summaries)
+        reduced = self.cache.get(key)
+        if reduced is None:
+            reduced = self.model.reduce(summaries)
+            self.cache.put(key, reduced)
+        return {**reduced, "model": self.model.name, "windows": summaries}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def write_summary(summary: Dict[str, Any], path: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(summary, f, indent=2)
+    os.replace(tmp, path)
@@ -0,0 +1,118 @@
+import gzip
+import time
+
+import pytest
+
+import asset_index
+from asset_index import AssetIndex, InotifyWatcher, PollingWatcher, choose_encoding, load_asset
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, "identity"),
+    ("gzip, deflate", "gzip"),
+    ("gzip, br", "br"),
+    ("br;q=0.5, gzip;q=0.8", "gzip"),
+    ("gzip;q=0", "identity"),
+    ("*", "br"),
+    ("br;q=bogus, gzip", "gzip"),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header, {"identity": b"", "gzip": b"", "br": b""}) == expected
+
+
+def test_choose_encoding_only_picks_available_variants():
+    assert choose_encoding("br", {"identity": b"", "gzip": b""}) == "identity"
+
+
+def test_build_indexes_only_servable_files(tmp_path):
+    (tmp_path / "index.html").write_text("<p>hi</p>")
+    (tmp_path / "secret.py").write_text("x = 1")
+    (tmp_path / "token.pickle").write_bytes(b"\x80")
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "site.css").write_text("body{}")
+    (tmp_path / "recordings").mkdir()
+    (tmp_path / "recordings" / "report.pdf").write_bytes(b"%PDF")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "hook.js").write_text("")
+
+    index = AssetIndex(str(tmp_path)).build()
+    assert index.paths() == ["css/site.css", "index.html"]
+
+
+def test_compressible_assets_get_a_gzip_variant_and_distinct_etags(tmp_path):
+    text = "body { color: red; }\n" * 100
+    (tmp_path / "site.css").write_text(text)
+    asset = load_asset(str(tmp_path), "site.css")
+
+    assert asset.content_type == "text/css"
+    assert gzip.decompress(asset.variants["gzip"]) == text.encode()
+    assert asset.etag() != asset.etag("gzip")
+    assert asset.etag("gzip") in asset.etags()
+
+    (tmp_path / "tiny.css").write_text("a{}")
+    assert set(load_asset(str(tmp_path), "tiny.css").variants) == {"identity"}
+
+
+def test_large_files_stay_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_index, "MAX_INDEXED_BYTES", 10)
+    (tmp_path / "big.pdf").write_bytes(b"%PDF" + b"0" * 100)
+    asset = load_asset(str(tmp_path), "big.pdf")
+    assert not asset.in_memory
+    assert asset.size == 104
+
+
+def test_refresh_and_remove_tree(tmp_path):
+    index = AssetIndex(str(tmp_path)).build()
+    (tmp_path / "app.js").write_text("one")
+    assert index.refresh("app.js").variants["identity"] == b"one"
+
+    (tmp_path / "app.js").unlink()
+    assert index.refresh("app.js") is None
+    assert index.get("app.js") is None
+
+    (tmp_path / "img").mkdir()
+    (tmp_path / "img" / "a.svg").write_text("<svg/>")
+    index.refresh_tree("img")
+    assert index.paths() == ["img/a.svg"]
+    index.remove_tree("img")
+    assert index.paths() == []
+
+
+def test_polling_watcher_picks_up_changes(tmp_path):
+    (tmp_path / "app.js").write_text("one")
+    index = AssetIndex(str(tmp_path)).build()
+    watcher = PollingWatcher(index, interval=0.05).start()
+    try:
+        (tmp_path / "app.js").write_text("version two")
+        (tmp_path / "new.css").write_text("a{}")
+        assert _wait_for(lambda: index.get("app.js").variants["identity"] == b"version two")
+        assert _wait_for(lambda: index.get("new.css") is not None)
+        (tmp_path / "new.css").unlink()
+        assert _wait_for(lambda: index.get("new.css") is None)
+    finally:
+        watcher.stop()
+
+
+def test_inotify_watcher_follows_new_directories(tmp_path):
+    index = AssetIndex(str(tmp_path)).build()
+    try:
+        watcher = InotifyWatcher(index).start()
+    except (OSError, AttributeError) as exc:
+        pytest.skip(f"inotify unavailable: {exc}")
+    try:
+        (tmp_path / "js").mkdir()
+        (tmp_path / "js" / "app.js").write_text("one")
+        assert _wait_for(lambda: index.get("js/app.js") is not None)
+        (tmp_path / "js" / "app.js").write_text("two")
+        assert _wait_for(lambda: index.get("js/app.js").variants["identity"] == b"two")
+    finally:
+        watcher.stop()
@@ -0,0 +1,165 @@
+import base64
+import hashlib
+import http.server
+import os
+import re
+import threading
+
+import pytest
+
+from fetcher import DownloadError, RangedDownloader
+
+PART_SIZE = 64 * 1024
+BODY = os.urandom(PART_SIZE * 5 + 1234)
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    """Serves BODY with Range support; ranges starting at ``fail_starts`` get a 500.
+
+    If-Range is evaluated as RFC 7233 says: only a strong ETag or the exact
+    Last-Modified date matches, anything else gets the whole body with a 200.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _headers(self, status, length, extra=()):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        if self.server.etag:
+            self.send_header("ETag", self.server.etag)
+        if self.server.last_modified:
+            self.send_header("Last-Modified", self.server.last_modified)
+        self.send_header("x-goog-hash", "md5=" + base64.b64encode(hashlib.md5(BODY).digest()).decode())
+        for name, value in extra:
+            self.send_header(name, value)
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._headers(200, len(BODY))
+
+    def do_GET(self):
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if not match:
+            self._headers(200, len(BODY))
+            self.wfile.write(BODY)
+            return
+        start, end = int(match.group(1)), int(match.group(2))
+        if_range = self.headers.get("If-Range")
+        with self.server.lock:
+            self.server.ranges.append(start)
+            self.server.if_range.append(if_range)
+        if if_range and (if_range.startswith("W/") or if_range not in (self.server.etag, self.server.last_modified)):
+            self._headers(200, len(BODY))
+            self.wfile.write(BODY)
+            return
+        if start in self.server.fail_starts:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._headers(206, end - start + 1, [("Content-Range", f"bytes {start}-{end}/{len(BODY)}")])
+        self.wfile.write(BODY[start:end + 1])
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    httpd.lock = threading.Lock()
+    httpd.ranges = []
+    httpd.fail_starts = set()
+    httpd.if_range = []
+    httpd.etag = '"v1"'
+    httpd.last_modified = "Wed, 14 Oct 2026 09:30:00 GMT"
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/recording.mp4"
+
+
+def test_parallel_download_matches_source(server, tmp_path):
+    dest = str(tmp_path / "recording.mp4")
+    result = RangedDownloader(_url(server), dest, part_size=PART_SIZE, max_workers=3).run()
+
+    assert open(dest, "rb").read() == BODY
+    assert result["parts"] == 6
+    assert result["resumed_parts"] == 0
+    assert result["sha256"] == hashlib.sha256(BODY).hexdigest()
+    assert sorted(server.ranges) == [i * PART_SIZE for i in range(6)]
+    assert not os.path.exists(dest + ".part")
+    assert not os.path.exists(dest + ".progress.json")
+
+
+def test_interrupted_download_resumes_missing_ranges(server, tmp_path):
+    dest = str(tmp_path / "recording.mp4")
+    server.fail_starts = {2 * PART_SIZE, 4 * PART_SIZE}
+
+    with pytest.raises(DownloadError):
+        RangedDownloader(_url(server), dest, part_size=PART_SIZE, max_workers=2, retries=1).run()
+    assert os.path.exists(dest + ".part")
+    assert os.path.exists(dest + ".progress.json")
+    assert not os.path.exists(dest)
+
+    server.fail_starts = set()
+    server.ranges = []
+    result = RangedDownloader(_url(server), dest, part_size=PART_SIZE, max_workers=2).run()
+
+    assert sorted(server.ranges) == [2 * PART_SIZE, 4 * PART_SIZE]
+    assert result["resumed_parts"] == 4
+    assert open(dest, "rb").read() == BODY
+    assert not os.path.exists(dest + ".progress.json")
+
+
+def test_progress_is_ignored_when_part_size_changes(server, tmp_path):
+    dest = str(tmp_path / "recording.mp4")
+    server.fail_starts = {PART_SIZE}
+    with pytest.raises(DownloadError):
+        RangedDownloader(_url(server), dest, part_size=PART_SIZE, retries=1).run()
+
+    server.fail_starts = set()
+    result = RangedDownloader(_url(server), dest, part_size=PART_SIZE * 2).run()
+
+    assert result["resumed_parts"] == 0
+    assert open(dest, "rb").read() == BODY
+
+
+def test_checksum_mismatch_discards_partial_download(server, tmp_path):
+    dest = str(tmp_path / "recording.mp4")
+    downloader = RangedDownloader(_url(server), dest, part_size=PART_SIZE, expected_sha256="0" * 64)
+    with pytest.raises(DownloadError, match="SHA-256"):
+        downloader.run()
+    assert not os.path.exists(dest + ".part")
+    assert not os.path.exists(dest + ".progress.json")
+
+
+def test_strong_etag_is_sent_as_if_range(server, tmp_path):
+    RangedDownloader(_url(server), str(tmp_path / "recording.mp4"), part_size=PART_SIZE).run()
+    assert set(server.if_range) == {'"v1"'}
+
+
+def test_weak_etag_falls_back_to_last_modified(server, tmp_path):
+    # e.g. nginx with gzip enabled downgrades ETags to weak ones
+    server.etag = 'W/"v1"'
+    dest = str(tmp_path / "recording.mp4")
+    result = RangedDownloader(_url(server), dest, part_size=PART_SIZE, max_workers=3).run()
+
+    assert open(dest, "rb").read() == BODY
+    assert result["parts"] == 6
+    assert set(server.if_range) == {server.last_modified}
+
+
+def test_weak_etag_without_last_modified_sends_no_if_range(server, tmp_path):
+    server.etag = 'W/"v1"'
+    server.last_modified = None
+    dest = str(tmp_path / "recording.mp4")
+    RangedDownloader(_url(server), dest, part_size=PART_SIZE).run()
+
+    assert open(dest, "rb").read() == BODY
+    assert set(server.if_range) == {None}
@@ -0,0 +1,90 @@
+import gzip
+import http.client
+import threading
+
+import pytest
+
+from frontend_server import create_server
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / "auth.html").write_text("<html>auth</html>")
+    (tmp_path / "dashboard.html").write_text("<html>dashboard</html>")
+    (tmp_path / "app.js").write_text("console.log('hello');\n" * 50)
+    (tmp_path / "backend.py").write_text("SECRET = 1\n")
+    server = create_server(0, str(tmp_path), quiet=True, watch=False)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _request(server, path, headers=None, method="GET"):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    try:
+        conn.request(method, path, headers=headers or {})
+        resp = conn.getresponse()
+        return resp.status, dict(resp.getheaders()), resp.read()
+    finally:
+        conn.close()
+
+
+def test_root_serves_auth_page_with_validators(site):
+    status, headers, body = _request(site, "/")
+    assert status == 200
+    assert body == b"<html>auth</html>"
+    assert headers["ETag"].startswith('"')
+    assert headers["Cache-Control"] == "no-store"
+    assert "Last-Modified" in headers
+
+
+def test_extensionless_route_maps_to_page(site):
+    status, _, body = _request(site, "/dashboard")
+    assert status == 200
+    assert body == b"<html>dashboard</html>"
+
+
+def test_if_none_match_returns_304(site):
+    _, headers, _ = _request(site, "/app.js")
+    status, revalidated, body = _request(site, "/app.js", {"If-None-Match": headers["ETag"]})
+    assert status == 304
+    assert body == b""
+    assert revalidated["ETag"] == headers["ETag"]
+
+    status, _, _ = _request(site, "/app.js", {"If-None-Match": '"stale"'})
+    assert status == 200
+
+
+def test_if_modified_since_returns_304(site):
+    _, headers, _ = _request(site, "/app.js")
+    status, _, _ = _request(site, "/app.js", {"If-Modified-Since": headers["Last-Modified"]})
+    assert status == 304
+    status, _, _ = _request(site, "/app.js", {"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"})
+    assert status == 200
+
+
+def test_gzip_variant_is_negotiated(site):
+    status, headers, body = _request(site, "/app.js", {"Accept-Encoding": "gzip"})
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(body) == b"console.log('hello');\n" * 50
+
+    # The gzip ETag also validates a conditional request for the identity body
+    status, _, _ = _request(site, "/app.js", {"If-None-Match": headers["ETag"]})
+    assert status == 304
+
+
+def test_head_sends_headers_only(site):
+    status, headers, body = _request(site, "/auth.html", method="HEAD")
+    assert status == 200
+    assert headers["Content-Length"] == str(len(b"<html>auth</html>"))
+    assert body == b""
+
+
+def test_private_and_escaping_paths_are_refused(site):
+    assert _request(site, "/backend.py")[0] == 404
+    assert _request(site, "/missing.html")[0] == 404
+    assert _request(site, "/../etc/passwd")[0] == 403
+    assert _request(site, "/%2e%2e/etc/passwd")[0] == 403
@@ -0,0 +1,112 @@
+import pytest
+
+from meeting_supervisor import (
+    END_SCREEN_SCRIPT,
+    REASON_ALONE,
+    REASON_DRIVER_CRASHED,
+    REASON_MEETING_ENDED,
+    REASON_RECORDER_STOPPED,
+    MeetingEndDetector,
+    detect_end_screen,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def detector(clock):
+    return MeetingEndDetector(alone_seconds=60, driver_failures=2, clock=clock)
+
+
+def observe(detector, end_screen=None, participants=3, recorder=True, driver=True):
+    return detector.observe(
+        end_screen=end_screen, participant_count=participants, recorder_active=recorder, driver_ok=driver
+    )
+
+
+def test_healthy_call_has_no_verdict(detector, clock):
+    for _ in range(5):
+        clock.now += 30
+        assert observe(detector) is None
+
+
+def test_end_screen_ends_the_meeting(detector):
+    verdict = observe(detector, end_screen="The meeting has ended")
+    assert verdict == {"reason": REASON_MEETING_ENDED, "detail": "The meeting has ended"}
+
+
+def test_driver_needs_consecutive_failures(detector):
+    assert observe(detector, driver=False) is None
+    # A good probe in between resets the count
+    assert observe(detector) is None
+    assert observe(detector, driver=False) is None
+    verdict = observe(detector, driver=False)
+    assert verdict["reason"] == REASON_DRIVER_CRASHED
+    assert verdict["detail"] == "2 failed browser probes"
+
+
+def test_failed_probe_ignores_stale_end_screen(detector):
+    # The end screen is only trusted when the driver answered
+    assert observe(detector, end_screen="You left the meeting", driver=False) is None
+
+
+def test_stopped_recorder(detector):
+    assert observe(detector, recorder=False)["reason"] == REASON_RECORDER_STOPPED
+    # Also reported while the driver is still within its failure budget
+    fresh = MeetingEndDetector(driver_failures=3)
+    assert observe(fresh, recorder=False, driver=False)["reason"] == REASON_RECORDER_STOPPED
+
+
+def test_alone_after_grace_period(detector, clock):
+    assert observe(detector, participants=1) is None
+    clock.now = 59
+    assert observe(detector, participants=1) is None
+    clock.now = 60
+    verdict = observe(detector, participants=1)
+    assert verdict == {"reason": REASON_ALONE, "detail": "only participant for 60s"}
+
+
+def test_someone_joining_resets_alone_timer(detector, clock):
+    observe(detector, participants=1)
+    clock.now = 50
+    observe(detector, participants=2)
+    clock.now = 70
+    assert observe(detector, participants=1) is None
+    clock.now = 129
+    assert observe(detector, participants=1) is None
+    clock.now = 130
+    assert observe(detector, participants=1)["reason"] == REASON_ALONE
+
+
+def test_unreadable_count_neither_starts_nor_resets_alone_timer(detector, clock):
+    assert observe(detector, participants=0) is None
+    assert detector.alone_since is None
+    observe(detector, participants=1)
+    clock.now = 40
+    assert observe(detector, participants=0) is None
+    clock.now = 60
+    assert observe(detector, participants=1)["reason"] == REASON_ALONE
+
+
+def test_detect_end_screen_runs_the_script():
+    class Driver:
+        def execute_script(self, script):
+            self.script = script
+            return "You left the meeting"
+
+    driver = Driver()
+    assert detect_end_screen(driver) == "You left the meeting"
+    assert driver.script == END_SCREEN_SCRIPT
+    assert '"The meeting has ended"' in END_SCREEN_SCRIPT
+    assert "Leave call" in END_SCREEN_SCRIPT
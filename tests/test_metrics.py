@@ -0,0 +1,114 @@
+import pytest
+
+from metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_counter_exposition(registry):
+    requests = registry.counter("http_requests_total", "Requests served.", ["method", "status"])
+    requests.inc(method="GET", status="200")
+    requests.inc(2, method="GET", status="200")
+    requests.inc(method="POST", status="500")
+    assert requests.value(method="GET", status="200") == 3
+    assert registry.render() == (
+        "# HELP http_requests_total Requests served.\n"
+        "# TYPE http_requests_total counter\n"
+        'http_requests_total{method="GET",status="200"} 3\n'
+        'http_requests_total{method="POST",status="500"} 1\n'
+    )
+
+
+def test_counter_cannot_decrease(registry):
+    with pytest.raises(ValueError):
+        registry.counter("c_total", "c").inc(-1)
+
+
+def test_gauge_exposition(registry):
+    sessions = registry.gauge("active_sessions", "Sessions recording.")
+    sessions.inc()
+    sessions.inc()
+    sessions.dec()
+    ratio = registry.gauge("ratio", "A ratio.", ["kind"])
+    ratio.set(0.25, kind="a")
+    assert registry.render().splitlines() == [
+        "# HELP active_sessions Sessions recording.",
+        "# TYPE active_sessions gauge",
+        "active_sessions 1",
+        "# HELP ratio A ratio.",
+        "# TYPE ratio gauge",
+        'ratio{kind="a"} 0.25',
+    ]
+
+
+def test_gauge_function_is_read_at_scrape_time(registry):
+    value = [3]
+    gauge = registry.gauge("queue_depth", "Queued items.")
+    gauge.set_function(lambda: value[0])
+    assert "queue_depth 3\n" in registry.render()
+    value[0] = 7
+    assert "queue_depth 7\n" in registry.render()
+
+    # A failing callback drops the sample instead of breaking the scrape
+    gauge.set_function(lambda: 1 / 0)
+    assert registry.render() == "# HELP queue_depth Queued items.\n# TYPE queue_depth gauge\n"
+
+    with pytest.raises(ValueError):
+        registry.gauge("labelled", "x", ["a"]).set_function(lambda: 1)
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    latency = registry.histogram("latency_seconds", "Latency.", ["route"], buckets=[1, 0.1, float("inf")])
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value, route="/x")
+    assert latency.count(route="/x") == 4
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/x",le="0.1"} 2',
+        'latency_seconds_bucket{route="/x",le="1"} 3',
+        'latency_seconds_bucket{route="/x",le="+Inf"} 4',
+        'latency_seconds_sum{route="/x"} 3.65',
+        'latency_seconds_count{route="/x"} 4',
+    ]
+
+
+def test_histogram_time_skips_blocks_that_raise(registry):
+    latency = registry.histogram("op_seconds", "Op.")
+    with latency.time():
+        pass
+    with pytest.raises(RuntimeError):
+        with latency.time():
+            raise RuntimeError
+    assert latency.count() == 1
+
+
+def test_label_values_and_help_are_escaped(registry):
+    counter = registry.counter("errors_total", 'Errors by "message".\nSecond line \\ end', ["message"])
+    counter.inc(message='bad "quote"\\path\nnext')
+    assert registry.render().splitlines() == [
+        '# HELP errors_total Errors by "message".\\nSecond line \\\\ end',
+        "# TYPE errors_total counter",
+        'errors_total{message="bad \\"quote\\"\\\\path\\nnext"} 1',
+    ]
+
+
+def test_labels_must_match_declared_names(registry):
+    counter = registry.counter("jobs_total", "Jobs.", ["status"])
+    with pytest.raises(ValueError):
+        counter.inc()
+    with pytest.raises(ValueError):
+        counter.inc(state="done")
+    with pytest.raises(ValueError):
+        counter.inc(status="done", extra="x")
+    assert registry.render() == "# HELP jobs_total Jobs.\n# TYPE jobs_total counter\n"
+
+
+def test_registry_returns_existing_metric(registry):
+    first = registry.counter("events_total", "Events.")
+    assert registry.counter("events_total", "Events.") is first
+    with pytest.raises(ValueError, match="already registered as a counter"):
+        registry.gauge("events_total", "Events.")
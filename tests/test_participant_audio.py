@@ -0,0 +1,79 @@
+import json
+import struct
+
+import pytest
+
+import participant_audio
+from participant_audio import ParticipantAudioSink
+
+
+@pytest.fixture
+def sink(tmp_path, monkeypatch):
+    monkeypatch.setattr(participant_audio, "evaluate_async", lambda driver, script: {})
+    return ParticipantAudioSink("s1", str(tmp_path), "ws://localhost")
+
+
+def events(sink):
+    sink._events.flush()
+    with open(f"{sink.out_dir}/events.jsonl", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_control_messages_are_logged_once(sink):
+    voice = json.dumps({"type": "voice", "track": 0, "t": 1500, "n": 1})
+    assert sink.record_event(voice) == {"control": 1}
+    # A resend after a reconnect is acked but not logged again
+    assert sink.record_event(voice) == {"control": 1}
+    assert sink.record_event(json.dumps({"type": "silence", "track": 0, "t": 2500, "n": 2})) == {"control": 2}
+    assert [e["t_ms"] for e in events(sink)] == [1500, 2500]
+    assert sink._tracks[0]["voiced"] == [[1500, 2500]]
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "{not json",
+    '{"type": "voice", "track": 0',
+    "[1, 2]",
+    "42",
+    '{"type": "voice", "track": 0}',
+    '{"type": "voice", "track": 0, "n": "x"}',
+    '{"type": "voice", "track": 0, "n": null}',
+])
+def test_unnumbered_garbage_gets_an_error_frame(sink, text):
+    assert sink.record_event(text) == {"error": "malformed control message"}
+    assert events(sink) == []
+
+
+@pytest.mark.parametrize("event", [
+    {"type": "voice", "n": 3},
+    {"type": "voice", "track": "left", "n": 3},
+    {"type": "voice", "track": None, "n": 3},
+    {"type": "voice", "track": 0, "t": "soon", "n": 3},
+    {"type": "voice", "track": 0, "t": [1], "n": 3},
+])
+def test_numbered_bad_message_is_acked_and_dropped(sink, event):
+    # Acking stops the page from resending a message that can never be logged
+    assert sink.record_event(json.dumps(event)) == {"control": 3}
+    assert events(sink) == []
+    assert sink._tracks == {}
+
+
+def test_non_finite_timestamp_is_dropped(sink):
+    assert sink.record_event('{"type": "voice", "track": 0, "t": Infinity, "n": 4}') == {"control": 4}
+    assert sink.record_event('{"type": "voice", "track": 0, "t": NaN, "n": 5}') == {"control": 5}
+    assert events(sink) == []
+
+
+def test_short_binary_message_is_ignored(sink):
+    assert sink.write_chunk(b"\x00\x00") == {}
+    message = struct.pack(">II", 0, 0) + b"webm"
+    assert sink.write_chunk(message) == {"track": 0, "ack": 0}
+    # Out-of-order chunk is not written and acks the last one in order
+    assert sink.write_chunk(struct.pack(">II", 0, 2) + b"late") == {"track": 0, "ack": 0}
+
+
+def test_messages_after_stop_are_acked_but_not_written(sink):
+    sink.stop(driver=None)
+    assert sink.record_event(json.dumps({"type": "voice", "track": 0, "t": 0, "n": 1})) == {"control": 1}
+    assert sink.write_chunk(struct.pack(">II", 0, 0) + b"late") == {"track": 0, "ack": -1}
+    assert sink._tracks == {}
@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+from recording_catalog import RecordingCatalog, decode_cursor, encode_cursor
+
+
+def _record(root, date, name, started_at, duration=60.0, meet_url="https://meet.google.com/abc-defg-hij", **extra):
+    day = root / date
+    day.mkdir(parents=True, exist_ok=True)
+    (day / f"{name}.mp4").write_bytes(b"\0" * 100)
+    sidecar = {"recording_started_at": started_at, "duration_seconds": duration, "meet_url": meet_url, **extra}
+    (day / f"{name}.json").write_text(json.dumps(sidecar))
+    return f"{date}/{name}.mp4"
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    root = tmp_path / "recordings"
+    root.mkdir()
+    catalog = RecordingCatalog(str(tmp_path / "catalog.db"), str(root))
+    yield catalog
+    catalog.close()
+
+
+def _paths(page):
+    return [item["path"] for item in page["recordings"]]
+
+
+def test_backfill_reads_recordings_and_sidecars(catalog, tmp_path):
+    root = tmp_path / "recordings"
+    path = _record(root, "2026-10-01", "standup", "2026-10-01T09:00:00", session_id="s1",
+                   speaker_timeline={"intervals": [1, 2, 3]})
+    (root / "2026-10-01" / "standup.captions.json").write_text("{}")
+    (root / "2026-10-01" / "standup_segments").mkdir()
+    (root / "2026-10-01" / "standup_segments" / "segment_00000.ts").write_bytes(b"x")
+    (root / "2026-10-01" / "notes.txt").write_text("not a recording")
+
+    assert catalog.backfill_if_needed()
+    assert not catalog.backfill_if_needed()
+
+    item = catalog.get(path)
+    assert _paths(catalog.query()) == [path]
+    assert item["recorded_date"] == "2026-10-01"
+    assert item["session_id"] == "s1"
+    assert item["duration_seconds"] == 60.0
+    assert item["size"] == 100
+    # Bulky extras stay in the sidecar
+    assert "speaker_timeline" not in item["metadata"]
+
+
+def test_keyset_pagination_walks_every_row_once(catalog, tmp_path):
+    root = tmp_path / "recordings"
+    # Two recordings share a start time, so the path breaks the tie
+    expected = [
+        _record(root, "2026-10-03", "c", "2026-10-03T10:00:00"),
+        _record(root, "2026-10-02", "b2", "2026-10-02T10:00:00"),
+        _record(root, "2026-10-02", "b1", "2026-10-02T10:00:00"),
+        _record(root, "2026-10-01", "a", "2026-10-01T10:00:00"),
+        _record(root, "2026-09-30", "z", "2026-09-30T10:00:00"),
+    ]
+    catalog.build()
+
+    seen, cursor = [], None
+    while True:
+        page = catalog.query(limit=2, cursor=cursor)
+        seen += _paths(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+
+    # A new, newer recording does not shift the pages after an existing cursor
+    first = catalog.query(limit=2)
+    _record(root, "2026-10-04", "d", "2026-10-04T10:00:00")
+    catalog.refresh("2026-10-04/d.mp4")
+    assert _paths(catalog.query(limit=2, cursor=first["next_cursor"])) == expected[2:4]
+
+
+def test_filters(catalog, tmp_path):
+    root = tmp_path / "recordings"
+    short = _record(root, "2026-10-01", "short", "2026-10-01T09:00:00", duration=30)
+    other = _record(root, "2026-10-02", "other", "2026-10-02T09:00:00", duration=600, meet_url="https://meet.google.com/xyz")
+    long = _record(root, "2026-10-03", "long", "2026-10-03T09:00:00", duration=3600)
+    catalog.build()
+
+    assert _paths(catalog.query(date_from="2026-10-02")) == [long, other]
+    assert _paths(catalog.query(date_to="2026-10-01")) == [short]
+    assert _paths(catalog.query(meet_url="https://meet.google.com/xyz")) == [other]
+    assert _paths(catalog.query(min_duration=60, max_duration=1000)) == [other]
+
+
+def test_refresh_follows_sidecar_changes_and_deletions(catalog, tmp_path):
+    root = tmp_path / "recordings"
+    path = _record(root, "2026-10-01", "m", "2026-10-01T09:00:00")
+    catalog.build()
+
+    (root / "2026-10-01" / "m.json").write_text(json.dumps({
+        "recording_started_at": "2026-10-01T09:00:00", "duration_seconds": 120.0, "end_reason": "meeting_ended",
+    }))
+    catalog.refresh("2026-10-01/m.json")
+    assert catalog.get(path)["duration_seconds"] == 120.0
+    assert catalog.get(path)["metadata"]["end_reason"] == "meeting_ended"
+
+    (root / "2026-10-01" / "m.mp4").unlink()
+    catalog.refresh(path)
+    assert catalog.get(path) is None
+
+    _record(root, "2026-10-02", "n", "2026-10-02T09:00:00")
+    catalog.refresh_tree("2026-10-02")
+    assert _paths(catalog.query()) == ["2026-10-02/n.mp4"]
+    catalog.remove_tree("2026-10-02")
+    assert _paths(catalog.query()) == []
+
+
+def test_build_drops_rows_for_files_that_are_gone(catalog, tmp_path):
+    root = tmp_path / "recordings"
+    keep = _record(root, "2026-10-01", "keep", "2026-10-01T09:00:00")
+    _record(root, "2026-10-01", "gone", "2026-10-01T08:00:00")
+    catalog.build()
+    (root / "2026-10-01" / "gone.mp4").unlink()
+    catalog.build()
+    assert _paths(catalog.query()) == [keep]
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    assert decode_cursor(encode_cursor("2026-10-01T09:00:00", "a/b.mp4")) == ("2026-10-01T09:00:00", "a/b.mp4")
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
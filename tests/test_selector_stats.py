@@ -0,0 +1,110 @@
+import json
+
+from selector_stats import SelectorStats, candidate_key
+
+CANDIDATES = ["#a", "#b", ("xpath", "//button"), "#d"]
+
+
+def test_candidate_key():
+    assert candidate_key("#a") == "#a"
+    assert candidate_key(("xpath", "//button")) == "xpath://button"
+
+
+def test_unseen_candidates_keep_listed_order():
+    stats = SelectorStats()
+    assert stats.ordered("join", CANDIDATES) == CANDIDATES
+    assert stats.preferred("join", CANDIDATES) == []
+
+
+def test_ordering_by_smoothed_success_rate():
+    stats = SelectorStats()
+    # "#a" always misses, the xpath always wins, "#b" and "#d" are unseen
+    for _ in range(3):
+        stats.record("join", ["#a", ("xpath", "//button")], ("xpath", "//button"))
+    assert stats.ordered("join", CANDIDATES) == [("xpath", "//button"), "#b", "#d", "#a"]
+    # Steps are tracked separately
+    assert stats.ordered("name", CANDIDATES) == CANDIDATES
+
+
+def test_preferred_only_returns_past_winners():
+    stats = SelectorStats(fast_candidates=2)
+    stats.record("join", ["#a", "#b"], "#b")
+    assert stats.preferred("join", CANDIDATES) == ["#b"]
+    stats.record("join", ["#d"], "#d")
+    stats.record("join", ["#d"], "#d")
+    stats.record("join", ["#a"], "#a")
+    assert stats.preferred("join", CANDIDATES) == ["#d", "#b"]
+
+
+def test_search_tries_fast_path_first():
+    stats = SelectorStats(fast_timeout=1.0)
+    stats.record("join", ["#b"], "#b")
+    calls = []
+
+    def probe(candidate, timeout):
+        calls.append((candidate, timeout))
+        return candidate == "#b"
+
+    assert stats.search("join", CANDIDATES, probe, full_timeout=10.0) == "#b"
+    assert calls == [("#b", 1.0)]
+
+
+def test_search_falls_back_to_full_sweep():
+    stats = SelectorStats(fast_timeout=1.0)
+    stats.record("join", ["#b"], "#b")
+    calls = []
+
+    def probe(candidate, timeout):
+        calls.append((candidate, timeout))
+        if candidate == "#a":
+            raise TimeoutError("wait timed out")
+        return candidate == "#d"
+
+    assert stats.search("join", CANDIDATES, probe, full_timeout=10.0) == "#d"
+    # The preferred candidate gets a second, full-length try in the sweep
+    assert calls == [("#b", 1.0), ("#b", 10.0), ("#a", 10.0), (("xpath", "//button"), 10.0), ("#d", 10.0)]
+    assert stats.preferred("join", CANDIDATES) == ["#d", "#b"]
+
+
+def test_search_with_no_winner_records_misses():
+    stats = SelectorStats()
+    assert stats.search("join", ["#a", "#b"], lambda candidate, timeout: False, full_timeout=1.0) is None
+    assert [row["tries"] for row in stats.snapshot()["join"]] == [1, 1]
+    assert stats.preferred("join", ["#a", "#b"]) == []
+
+
+def test_stats_persist_across_instances(tmp_path):
+    path = tmp_path / "state" / "selectors.json"
+    stats = SelectorStats(str(path))
+    stats.record("join", ["#a", ("xpath", "//button")], ("xpath", "//button"))
+
+    data = json.loads(path.read_text())
+    assert data["join"]["xpath://button"]["wins"] == 1
+    assert data["join"]["#a"] == {"wins": 0, "tries": 1}
+    assert not (tmp_path / "state" / "selectors.json.tmp").exists()
+
+    reloaded = SelectorStats(str(path))
+    assert reloaded.preferred("join", CANDIDATES) == [("xpath", "//button")]
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    path = tmp_path / "selectors.json"
+    path.write_text("{broken")
+    assert SelectorStats(str(path)).ordered("join", CANDIDATES) == CANDIDATES
+    path.write_text("[]")
+    assert SelectorStats(str(path)).snapshot() == {}
+
+
+def test_snapshot_reports_best_first():
+    stats = SelectorStats()
+    stats.record("join", ["#a", "#b"], "#b")
+    stats.record("join", ["#a", "#b"], "#b")
+    stats.record("name", ["#n"], None)
+    report = stats.snapshot()
+    assert list(report) == ["join", "name"]
+    assert [(row["selector"], row["wins"], row["tries"], row["success_rate"]) for row in report["join"]] == [
+        ("#b", 2, 2, 1.0),
+        ("#a", 0, 2, 0.0),
+    ]
+    assert "last_win" in report["join"][0]
+    assert report["name"] == [{"selector": "#n", "wins": 0, "tries": 1, "success_rate": 0.0}]
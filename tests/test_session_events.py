@@ -0,0 +1,116 @@
+import asyncio
+import json
+import threading
+
+from session_events import SessionEventBus
+
+
+def _parse(frame):
+    fields = dict(line.split(": ", 1) for line in frame.strip().splitlines())
+    return int(fields["id"]), fields["event"], json.loads(fields["data"])
+
+
+async def _collect(stream, count, timeout=2.0):
+    frames = []
+
+    async def read():
+        async for frame in stream:
+            if frame.startswith("id:"):
+                frames.append(_parse(frame))
+                if len(frames) == count:
+                    return
+
+    await asyncio.wait_for(read(), timeout)
+    return frames
+
+
+def test_replays_history_after_last_event_id():
+    async def main():
+        bus = SessionEventBus()
+        for n in range(5):
+            bus.publish("participants", "s1", count=n)
+        stream = bus.stream(last_event_id=3)
+        assert await stream.__anext__() == "retry: 3000\n\n"
+        replayed = await _collect(stream, 2)
+        await stream.aclose()
+        return replayed
+
+    replayed = asyncio.run(main())
+    assert [(event_id, data["count"]) for event_id, _, data in replayed] == [(4, 3), (5, 4)]
+
+
+def test_fresh_subscriber_gets_no_backlog_and_live_events_in_order():
+    async def main():
+        bus = SessionEventBus()
+        bus.publish("joining", "s1")
+        stream = bus.stream()
+        await stream.__anext__()
+        reader = asyncio.create_task(_collect(stream, 2))
+        await asyncio.sleep(0)
+        bus.publish("recording", "s1")
+        # Publishing from a worker thread is delivered through the subscriber's loop
+        worker = threading.Thread(target=bus.publish, args=("stopped", "s1"), kwargs={"end_reason": "requested"})
+        worker.start()
+        worker.join()
+        frames = await reader
+        await stream.aclose()
+        return frames, bus.subscriber_count
+
+    frames, subscribers = asyncio.run(main())
+    assert [(event_id, event_type) for event_id, event_type, _ in frames] == [(2, "recording"), (3, "stopped")]
+    assert frames[1][2]["end_reason"] == "requested"
+    assert subscribers == 0
+
+
+def test_session_filter_applies_to_replay_and_live_events():
+    async def main():
+        bus = SessionEventBus()
+        bus.publish("joining", "a")
+        bus.publish("joining", "b")
+        stream = bus.stream(session_id="b", last_event_id=1)
+        await stream.__anext__()
+        reader = asyncio.create_task(_collect(stream, 2))
+        await asyncio.sleep(0)
+        bus.publish("recording", "a")
+        bus.publish("recording", "b")
+        frames = await reader
+        await stream.aclose()
+        return frames
+
+    frames = asyncio.run(main())
+    assert [(event_id, data["session_id"]) for event_id, _, data in frames] == [(2, "b"), (4, "b")]
+
+
+def test_history_is_bounded_and_slow_subscribers_drop_oldest():
+    async def main():
+        bus = SessionEventBus(history_size=3, max_queue=2)
+        stream = bus.stream()
+        # Subscribed, but not reading while the events arrive
+        await stream.__anext__()
+        for n in range(6):
+            bus.publish("participants", "s1", count=n)
+        await asyncio.sleep(0)
+        live = await _collect(stream, 2)
+        await stream.aclose()
+
+        replay = bus.stream(last_event_id=1)
+        await replay.__anext__()
+        replayed = await _collect(replay, 3)
+        await replay.aclose()
+        return live, replayed
+
+    live, replayed = asyncio.run(main())
+    assert [event_id for event_id, _, _ in live] == [5, 6]
+    assert [event_id for event_id, _, _ in replayed] == [4, 5, 6]
+
+
+def test_heartbeat_when_idle():
+    async def main():
+        bus = SessionEventBus()
+        stream = bus.stream(heartbeat_seconds=0.01)
+        await stream.__anext__()
+        frame = await asyncio.wait_for(stream.__anext__(), 1.0)
+        await stream.aclose()
+        return frame
+
+    assert asyncio.run(main()) == ": keep-alive\n\n"
@@ -0,0 +1,126 @@
+import asyncio
+
+from stop_jobs import JOB_DONE, JOB_FAILED, JOB_RUNNING, StopJobRegistry
+
+
+class HTTPError(Exception):
+    def __init__(self, detail):
+        super().__init__()
+        self.detail = detail
+
+
+def test_second_stop_for_a_session_gets_the_running_job():
+    async def scenario():
+        registry = StopJobRegistry()
+        release = asyncio.Event()
+        calls = []
+
+        async def run(job):
+            calls.append(job.reason)
+            await release.wait()
+            return {"session_id": job.session_id}
+
+        first, created = registry.submit("s1", "requested", run)
+        assert created
+        again, created_again = registry.submit("s1", "alone", run)
+        assert again is first and not created_again
+        assert registry.running_for("s1") is first
+
+        other, created_other = registry.submit("s2", "requested", run)
+        assert created_other and other is not first
+
+        await asyncio.sleep(0)
+        assert first.status == JOB_RUNNING
+        release.set()
+        await asyncio.gather(first.task, other.task)
+
+        assert calls == ["requested", "requested"]
+        assert first.status == JOB_DONE and first.finished
+        assert first.result == {"session_id": "s1"}
+        assert registry.running_for("s1") is None
+        assert registry.get(first.job_id) is first
+
+        # Once finished, a new stop starts a new job
+        later, created_later = registry.submit("s1", "requested", run)
+        assert created_later and later is not first
+        await later.task
+
+    asyncio.run(scenario())
+
+
+def test_failed_job_records_the_error():
+    async def scenario():
+        registry = StopJobRegistry()
+
+        async def http_error(job):
+            raise HTTPError("Session not found")
+
+        async def plain_error(job):
+            raise RuntimeError("ffmpeg exited with 1")
+
+        job, _ = registry.submit("s1", "requested", http_error)
+        await job.task
+        assert job.status == JOB_FAILED
+        assert job.error == "Session not found"
+        assert job.finished_at is not None
+
+        job, _ = registry.submit("s2", "requested", plain_error)
+        await job.task
+        assert job.error == "ffmpeg exited with 1"
+        assert job.to_dict()["status"] == JOB_FAILED
+        assert registry.running_for("s2") is None
+
+    asyncio.run(scenario())
+
+
+def test_wait_times_out_without_cancelling():
+    async def scenario():
+        registry = StopJobRegistry()
+        release = asyncio.Event()
+
+        async def run(job):
+            await release.wait()
+            return {}
+
+        job, _ = registry.submit("s1", "requested", run)
+        assert (await registry.wait(job, 0.01)).status == JOB_RUNNING
+        assert not job.task.cancelled()
+
+        release.set()
+        assert (await registry.wait(job, 1.0)).status == JOB_DONE
+        # Waiting on a finished job returns at once
+        assert (await registry.wait(job, 0)).status == JOB_DONE
+
+    asyncio.run(scenario())
+
+
+def test_history_keeps_running_jobs():
+    async def scenario():
+        registry = StopJobRegistry(history_size=2)
+        release = asyncio.Event()
+
+        async def slow(job):
+            await release.wait()
+            return {}
+
+        async def fast(job):
+            return {}
+
+        running, _ = registry.submit("slow", "requested", slow)
+        finished = []
+        for i in range(3):
+            job, _ = registry.submit(f"s{i}", "requested", fast)
+            await job.task
+            finished.append(job)
+
+        # Over the limit, but the running job stays queryable
+        assert registry.get(running.job_id) is running
+        # The oldest finished jobs are forgotten first
+        assert registry.get(finished[0].job_id) is None
+        assert registry.get(finished[1].job_id) is None
+        assert registry.get(finished[2].job_id) is finished[2]
+
+        release.set()
+        await running.task
+
+    asyncio.run(scenario())
@@ -0,0 +1,114 @@
+import os
+
+import pytest
+
+import storage
+from recorder import SEGMENT_LIST_NAME
+from storage import LocalStorageBackend, SegmentUploader, StorageError, file_md5, part_name
+
+
+def _write_segments(segment_dir, payloads, listed=None):
+    os.makedirs(segment_dir, exist_ok=True)
+    names = []
+    for index, payload in enumerate(payloads):
+        name = f"segment_{index:05d}.ts"
+        with open(os.path.join(segment_dir, name), "wb") as f:
+            f.write(payload)
+        names.append(name)
+    listed = names if listed is None else names[:listed]
+    with open(os.path.join(segment_dir, SEGMENT_LIST_NAME), "w") as f:
+        f.writelines(f"{name},0,1\n" for name in listed)
+    return names
+
+
+def test_put_part_verifies_checksum(tmp_path):
+    backend = LocalStorageBackend(str(tmp_path / "bucket"))
+    src = tmp_path / "part.bin"
+    src.write_bytes(b"segment bytes")
+
+    backend.put_part("user/rec.ts", 0, str(src), file_md5(str(src)))
+    assert (tmp_path / "bucket" / part_name("user/rec.ts", 0)).read_bytes() == b"segment bytes"
+
+    with pytest.raises(StorageError):
+        backend.put_part("user/rec.ts", 1, str(src), "not-the-md5")
+    assert not (tmp_path / "bucket" / part_name("user/rec.ts", 1)).exists()
+
+
+def test_object_names_cannot_escape_root(tmp_path):
+    backend = LocalStorageBackend(str(tmp_path / "bucket"))
+    src = tmp_path / "part.bin"
+    src.write_bytes(b"x")
+    with pytest.raises(StorageError):
+        backend.put_part("../outside.ts", 0, str(src), file_md5(str(src)))
+
+
+def test_uploader_composes_segments_in_order(tmp_path):
+    segment_dir = str(tmp_path / "segments")
+    payloads = [bytes([i]) * (1000 + i) for i in range(4)]
+    # The last segment is not in the list yet, as while ffmpeg is still writing it
+    _write_segments(segment_dir, payloads, listed=3)
+    uploaded = []
+    uploader = SegmentUploader(
+        LocalStorageBackend(str(tmp_path / "bucket")), segment_dir, "user/rec.ts",
+        on_part_uploaded=lambda index, md5: uploaded.append(index),
+    )
+    assert uploader.completed_segments() == ["segment_00000.ts", "segment_00001.ts", "segment_00002.ts"]
+
+    result = uploader.finalize()
+
+    assert sorted(uploaded) == [0, 1, 2, 3]
+    assert result["parts"] == 4
+    assert result["size"] == sum(len(p) for p in payloads)
+    composed = tmp_path / "bucket" / "user" / "rec.ts"
+    assert composed.read_bytes() == b"".join(payloads)
+    assert result["md5"] == file_md5(str(composed))
+    assert not (tmp_path / "bucket" / "user" / "rec.ts.parts").exists()
+
+
+def test_uploader_retries_failed_parts(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage.time, "sleep", lambda seconds: None)
+
+    class FlakyBackend(LocalStorageBackend):
+        def __init__(self, root):
+            super().__init__(root)
+            self.attempts = {}
+
+        def put_part(self, object_name, index, local_path, md5):
+            self.attempts[index] = self.attempts.get(index, 0) + 1
+            if index == 1 and self.attempts[index] < 3:
+                raise OSError("connection reset")
+            super().put_part(object_name, index, local_path, md5)
+
+    segment_dir = str(tmp_path / "segments")
+    _write_segments(segment_dir, [b"a" * 10, b"b" * 10, b"c" * 10])
+    backend = FlakyBackend(str(tmp_path / "bucket"))
+
+    result = SegmentUploader(backend, segment_dir, "rec.ts", max_retries=3).finalize()
+
+    assert backend.attempts[1] == 3
+    assert result["parts"] == 3
+    assert (tmp_path / "bucket" / "rec.ts").read_bytes() == b"a" * 10 + b"b" * 10 + b"c" * 10
+
+
+def test_uploader_gives_up_after_max_retries(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage.time, "sleep", lambda seconds: None)
+
+    class BrokenBackend(LocalStorageBackend):
+        def put_part(self, object_name, index, local_path, md5):
+            raise OSError("bucket unavailable")
+
+    segment_dir = str(tmp_path / "segments")
+    _write_segments(segment_dir, [b"a", b"b"])
+    uploader = SegmentUploader(BrokenBackend(str(tmp_path / "bucket")), segment_dir, "rec.ts", max_retries=2)
+    with pytest.raises(StorageError):
+        uploader.finalize()
+    assert not (tmp_path / "bucket" / "rec.ts").exists()
+
+
+def test_uploader_rejects_gaps_in_the_segment_sequence(tmp_path):
+    segment_dir = str(tmp_path / "segments")
+    _write_segments(segment_dir, [b"a", b"b", b"c"])
+    os.remove(os.path.join(segment_dir, "segment_00001.ts"))
+    uploader = SegmentUploader(LocalStorageBackend(str(tmp_path / "bucket")), segment_dir, "rec.ts")
+    with pytest.raises(StorageError, match="gaps"):
+        uploader.finalize()
@@ -0,0 +1,65 @@
+from summarizer import ExtractiveStubModel, IncrementalSummarizer, SummaryCache
+
+
+def _caption_segments(minutes=4):
+    segments = []
+    for i in range(minutes * 6):
+        start = i * 10.0
+        text = f"Topic {i // 6} budget review point {i}."
+        if i % 7 == 0:
+            text += f" Alex will follow up on item {i}."
+        segments.append({"start": start, "end": start + 8.0, "text": text, "speaker": "Alex" if i % 2 else "Sam"})
+    return segments
+
+
+def test_incremental_summarizer_queues_closed_windows_once(tmp_path):
+    summarizer = IncrementalSummarizer(
+        ExtractiveStubModel(), SummaryCache(str(tmp_path / "summaries")), window_seconds=60.0, settle_seconds=10.0,
+    )
+    segments = _caption_segments()
+    try:
+        assert not summarizer.due(65.0)
+        assert summarizer.due(71.0)
+        assert summarizer.observe(segments, 71.0) == 1
+        assert not summarizer.due(71.0)
+        assert summarizer.observe(segments, 71.0) == 0
+        assert summarizer.observe(segments, 190.0) == 2
+    finally:
+        summarizer.close()
+
+
+def test_summary_is_deterministic_and_cached(tmp_path):
+    segments = _caption_segments()
+
+    def summarize(cache_dir):
+        summarizer = IncrementalSummarizer(ExtractiveStubModel(), SummaryCache(cache_dir), window_seconds=60.0)
+        return summarizer.finalize(segments)
+
+    first = summarize(str(tmp_path / "a"))
+    assert [w["start"] for w in first["windows"]] == [0.0, 60.0, 120.0, 180.0]
+    assert first["model"] == "extractive-stub"
+    assert first["overview"]
+    assert any("follow up" in item for item in first["action_items"])
+
+    cached_files = sorted(p.name for p in (tmp_path / "a").iterdir())
+    assert summarize(str(tmp_path / "a")) == first
+    assert sorted(p.name for p in (tmp_path / "a").iterdir()) == cached_files
+    assert summarize(str(tmp_path / "b")) == first
+
+
+def test_empty_transcript_summary(tmp_path):
+    summarizer = IncrementalSummarizer(ExtractiveStubModel(), SummaryCache(str(tmp_path / "summaries")))
+    assert summarizer.finalize([]) == {"overview": "", "key_points": [], "action_items": [], "windows": []}
+
+
+def test_finalize_picks_up_caption_revisions_in_queued_windows(tmp_path):
+    summarizer = IncrementalSummarizer(
+        ExtractiveStubModel(), SummaryCache(str(tmp_path / "summaries")), window_seconds=60.0, settle_seconds=10.0,
+    )
+    segments = _caption_segments(minutes=2)
+    summarizer.observe(segments, 71.0)
+    revised = [dict(s) for s in segments]
+    revised[0]["text"] = "Sam will send the revised budget by Friday."
+
+    summary = summarizer.finalize(revised)
+    assert "Sam: Sam will send the revised budget by Friday." in summary["windows"][0]["action_items"]
@@ -0,0 +1,116 @@
+import json
+import os
+
+import transcript_index
+from transcript_index import MERGE_FACTOR, TranscriptIndex, attach_snippets, index_directory
+
+
+def _transcript(*texts, step=5.0):
+    return {"segments": [{"start": i * step, "end": i * step + 4.0, "text": text} for i, text in enumerate(texts)]}
+
+
+def _keys(result):
+    return [hit["key"] for hit in result["hits"]]
+
+
+def test_bm25_ranks_and_points_into_the_recording(tmp_path):
+    index = TranscriptIndex(str(tmp_path / "idx"))
+    index.add("budget", _transcript("hello everyone", "the budget review", "budget numbers for the budget"))
+    index.add("standup", _transcript("quick standup", "budget is fine"))
+    index.add("retro", _transcript("what went well", "deploys were slow"))
+
+    result = index.search("budget")
+    assert result["total"] == 2
+    assert _keys(result) == ["budget", "standup"]
+    assert result["hits"][0]["matches"] == [
+        {"start_ms": 5000, "end_ms": 9000, "hits": 1},
+        {"start_ms": 10000, "end_ms": 14000, "hits": 2},
+    ]
+    assert index.search("nothing matches this")["total"] == 0
+    assert index.search("   ")["total"] == 0
+
+
+def test_phrase_query_requires_consecutive_terms(tmp_path):
+    index = TranscriptIndex(str(tmp_path / "idx"))
+    index.add("a", _transcript("the release date moved"))
+    index.add("b", _transcript("the date of the release"))
+
+    assert sorted(_keys(index.search("release date"))) == ["a", "b"]
+    assert _keys(index.search('"release date"')) == ["a"]
+    # Phrases match across transcript segment boundaries too
+    index.add("c", _transcript("we agreed on the release", "date next week"))
+    assert sorted(_keys(index.search('"release date"'))) == ["a", "c"]
+
+
+def test_readding_a_key_replaces_it(tmp_path):
+    index = TranscriptIndex(str(tmp_path / "idx"))
+    index.add("m1", _transcript("draft agenda"), {"title": "Draft"})
+    index.add("m1", _transcript("final agenda"), {"title": "Final"})
+
+    assert index.search("draft")["total"] == 0
+    hits = index.search("agenda")["hits"]
+    assert [(hit["key"], hit["title"]) for hit in hits] == [("m1", "Final")]
+    assert index.stats()["documents"] == 1
+
+
+def test_segments_merge_in_tiers_and_survive_reopening(tmp_path):
+    root = str(tmp_path / "idx")
+    index = TranscriptIndex(root)
+    for n in range(MERGE_FACTOR - 1):
+        index.add(f"m{n}", _transcript(f"meeting number {n} about planning"))
+    assert index.stats()["segments"] == MERGE_FACTOR - 1
+
+    index.add("last", _transcript("meeting about planning too"))
+    stats = index.stats()
+    assert (stats["documents"], stats["segments"]) == (MERGE_FACTOR, 1)
+    assert sorted(os.listdir(root)) == ["manifest.json", f"seg_{MERGE_FACTOR + 1:06d}"]
+
+    # Deletions recorded before the merge are dropped by it
+    index.add("m0", _transcript("renamed meeting"))
+    reopened = TranscriptIndex(root)
+    assert reopened.stats()["documents"] == MERGE_FACTOR
+    assert "m0" not in _keys(reopened.search("planning"))
+    assert _keys(reopened.search("renamed")) == ["m0"]
+
+
+def test_adds_do_not_rewrite_large_segments(tmp_path, monkeypatch):
+    written = []
+    real_write = transcript_index._write_segment
+    monkeypatch.setattr(transcript_index, "_write_segment",
+                        lambda path, docs, tokens: (written.append(len(docs)), real_write(path, docs, tokens)))
+
+    index = TranscriptIndex(str(tmp_path / "idx"))
+    index.add_many([(f"bulk{n}", _transcript("word " * 50), {}) for n in range(200)])
+    written.clear()
+    for n in range(MERGE_FACTOR * 2):
+        index.add(f"small{n}", _transcript("tiny note"))
+
+    # Small segments only merge with each other; the 200-document segment is never rewritten
+    assert max(written) < 200
+    assert index.stats()["documents"] == 200 + MERGE_FACTOR * 2
+
+
+def test_max_segments_bounds_the_segment_count(tmp_path):
+    index = TranscriptIndex(str(tmp_path / "idx"), max_segments=2)
+    # Each document is a tier bigger than the last, so only the max_segments rule merges them
+    for n in range(6):
+        index.add(f"m{n}", _transcript("word " * (MERGE_FACTOR ** n)))
+    assert index.stats()["segments"] <= 2
+    assert index.stats()["documents"] == 6
+
+
+def test_index_directory_and_snippets(tmp_path):
+    meetings = tmp_path / "recordings"
+    meetings.mkdir()
+    path = meetings / "standup.captions.json"
+    transcript = _transcript("hello", "the database migration is done")
+    transcript["segments"][1]["speaker"] = "Priya"
+    path.write_text(json.dumps(transcript))
+    (meetings / "notes.txt").write_text("database")
+
+    index = TranscriptIndex(str(tmp_path / "idx"))
+    assert index_directory(index, str(meetings)) == 1
+    hit = attach_snippets(index.search("migration")["hits"][0])
+    assert hit["source"] == str(path)
+    assert hit["matches"] == [{"start_ms": 5000, "end_ms": 9000, "hits": 1,
+                               "text": "the database migration is done", "speaker": "Priya"}]
@@ -0,0 +1,103 @@
+import threading
+
+import numpy as np
+import pytest
+
+from transcription import (
+    SAMPLE_RATE,
+    ChunkedTranscriber,
+    LocalStubEngine,
+    TranscriptCache,
+    TranscriptionError,
+)
+from vad import VoiceActivityDetector
+
+
+def _bursts(count=12, tone_seconds=0.5, gap_seconds=1.0):
+    """Tone bursts separated by silence; returns the samples and each burst's start time."""
+    rng = np.random.default_rng(7)
+    t = np.arange(int(tone_seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    gap = np.zeros(int(gap_seconds * SAMPLE_RATE), dtype=np.int16)
+    pieces, starts, position = [gap], [], gap_seconds
+    for i in range(count):
+        tone = (8000 * np.sin(2 * np.pi * (200 + 40 * i) * t) + rng.normal(0, 50, t.size)).astype(np.int16)
+        pieces += [tone, gap]
+        starts.append(position)
+        position += tone_seconds + gap_seconds
+    return np.concatenate(pieces), starts
+
+
+def _transcriber(cache=None, engine=None):
+    return ChunkedTranscriber(
+        engine or LocalStubEngine(), cache=cache, max_workers=2,
+        target_seconds=4.0, max_seconds=6.0, overlap_seconds=0.5,
+    )
+
+
+def test_chunked_transcript_has_one_segment_per_burst(tmp_path):
+    samples, starts = _bursts()
+    transcript = _transcriber().transcribe(samples)
+
+    assert transcript["chunks"] > 1
+    segments = transcript["segments"]
+    # Bursts inside the overlap between chunks are kept by exactly one chunk
+    assert len(segments) == len(starts)
+    for segment, start in zip(segments, starts):
+        assert segment["start"] == pytest.approx(start, abs=0.03)
+        assert segment["end"] - segment["start"] == pytest.approx(0.5, abs=0.05)
+
+
+def test_transcript_is_deterministic_and_cached(tmp_path):
+    samples, _ = _bursts()
+    cache = TranscriptCache(str(tmp_path / "cache"))
+
+    first = _transcriber(cache).transcribe(samples)
+    second = _transcriber(cache).transcribe(samples)
+
+    assert first["transcribed_chunks"] == first["chunks"]
+    assert second["transcribed_chunks"] == 0
+    assert first["segments"] == second["segments"]
+    assert [s["text"] for s in first["segments"]] == [s["text"] for s in _transcriber().transcribe(samples)["segments"]]
+
+
+def test_retry_only_transcribes_failed_chunks(tmp_path):
+    samples, _ = _bursts()
+    cache = TranscriptCache(str(tmp_path / "cache"))
+
+    first_call = threading.Lock()
+
+    class FailOnce(LocalStubEngine):
+        def transcribe(self, chunk_samples, sample_rate):
+            # Chunks run on two threads; only the one that gets the lock fails
+            if first_call.acquire(blocking=False):
+                raise RuntimeError("engine timeout")
+            return super().transcribe(chunk_samples, sample_rate)
+
+    with pytest.raises(TranscriptionError) as excinfo:
+        _transcriber(cache, FailOnce()).transcribe(samples)
+    assert len(excinfo.value.failed_chunks) == 1
+
+    retried = _transcriber(cache).transcribe(samples)
+    assert retried["transcribed_chunks"] == 1
+    assert retried["segments"] == _transcriber().transcribe(samples)["segments"]
+
+
+def test_no_speech_skips_the_engine(tmp_path):
+    class CountingEngine(LocalStubEngine):
+        calls = 0
+
+        def transcribe(self, chunk_samples, sample_rate):
+            CountingEngine.calls += 1
+            return super().transcribe(chunk_samples, sample_rate)
+
+    silence = np.zeros(5 * SAMPLE_RATE, dtype=np.int16)
+    transcript = _transcriber(TranscriptCache(str(tmp_path / "cache")), CountingEngine()).transcribe(
+        silence, vad=VoiceActivityDetector(),
+    )
+
+    assert CountingEngine.calls == 0
+    assert transcript["segments"] == []
+    assert transcript["chunks"] == 0
+    assert transcript["duration"] == 5.0
+    assert transcript["voiced_duration"] == 0.0
+    assert list((tmp_path / "cache").iterdir()) == []
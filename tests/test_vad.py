@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from vad import SAMPLE_RATE, TimeMap, VoiceActivityDetector, _running_sums, frame_features
+
+
+def _frames_by_hand(samples, frame_len, hop):
+    energy, zcr = [], []
+    for start in range(0, len(samples) - frame_len + 1, hop):
+        frame = samples[start:start + frame_len].astype(np.float64)
+        energy.append(10 * np.log10(np.mean(frame ** 2) / 32768.0 ** 2 + 1e-12))
+        signs = np.signbit(frame)
+        zcr.append(np.count_nonzero(signs[1:] != signs[:-1]) / (frame_len - 1))
+    return np.array(energy), np.array(zcr)
+
+
+@pytest.mark.parametrize("frame_len, hop", [(480, 160), (400, 160), (160, 160), (101, 37)])
+def test_frame_features_match_a_per_frame_computation(frame_len, hop):
+    rng = np.random.default_rng(3)
+    samples = (rng.normal(0, 4000, 12345) * (rng.random(12345) > 0.2)).astype(np.int16)
+    energy, zcr = frame_features(samples, frame_len, hop)
+    expected_energy, expected_zcr = _frames_by_hand(samples, frame_len, hop)
+    np.testing.assert_allclose(energy, expected_energy, atol=1e-6)
+    np.testing.assert_allclose(zcr, expected_zcr)
+
+
+def test_frame_features_on_short_input():
+    energy, zcr = frame_features(np.zeros(100, dtype=np.int16), 480, 160)
+    assert energy.size == 0 and zcr.size == 0
+
+
+def test_running_sums_are_exact_across_block_edges():
+    rng = np.random.default_rng(4)
+    samples = rng.integers(-32768, 32767, 5003, dtype=np.int16)
+    positions = np.arange(len(samples) + 1)
+    energy, crossings = _running_sums(samples, positions, block=97)
+
+    squares = samples.astype(np.int64) ** 2
+    assert (energy == np.concatenate(([0], np.cumsum(squares)))).all()
+    signs = np.signbit(samples)
+    changes = np.concatenate(([0], np.cumsum(signs[1:] != signs[:-1])))
+    assert (crossings[:-1] == changes).all()
+
+
+def _speech_like(rng, seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return 6000 * np.sin(2 * np.pi * 180 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t)) + rng.normal(0, 200, t.size)
+
+
+def test_detects_speech_between_silences_and_maps_time_back():
+    rng = np.random.default_rng(5)
+    noise = lambda seconds: rng.normal(0, 30, int(seconds * SAMPLE_RATE))
+    audio = np.concatenate([noise(2.0), _speech_like(rng, 1.0), noise(3.0), _speech_like(rng, 0.5), noise(1.0)]).astype(np.int16)
+
+    vad = VoiceActivityDetector()
+    segments = vad.detect(audio) / SAMPLE_RATE
+    assert len(segments) == 2
+    np.testing.assert_allclose(segments[0], [2.0, 3.0], atol=0.2)
+    np.testing.assert_allclose(segments[1], [6.0, 6.5], atol=0.2)
+
+    voiced, time_map = vad.extract(audio)
+    assert len(voiced) == time_map.voiced_samples < len(audio)
+    # The first voiced second starts at 2 s in the recording; the second stretch follows it
+    assert time_map.to_original(0.0) == pytest.approx(segments[0][0])
+    second_start = (segments[0][1] - segments[0][0])
+    assert time_map.to_original(second_start + 0.1) == pytest.approx(segments[1][0] + 0.1)
+
+
+def test_silence_and_short_blips_are_not_speech():
+    rng = np.random.default_rng(6)
+    quiet = rng.normal(0, 30, 3 * SAMPLE_RATE)
+    quiet[SAMPLE_RATE:SAMPLE_RATE + 800] += _speech_like(rng, 0.05)
+    voiced, time_map = VoiceActivityDetector().extract(quiet.astype(np.int16))
+    assert len(voiced) == 0
+    assert time_map.to_list() == []
+
+
+def test_time_map_without_segments_is_identity():
+    assert TimeMap(np.zeros((0, 2))).to_original(1.5) == 1.5
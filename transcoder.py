@@ -0,0 +1,263 @@
+# transcoder.py
+"""
+Background archival transcoding.
+
+Capture with the cheapest encoder settings (``MEET_CAPTURE_PROFILE=fast``) so
+the live meeting never competes with the encoder for CPU, then re-encode each
+finished recording here to a compact archival profile. Workers run ffmpeg at
+the lowest CPU and IO priority (nice 19, ionice idle). While any live
+recording is running the active transcode is suspended (SIGSTOP) and new jobs
+wait, so archiving only uses time the recorder does not need. Outputs are
+verified and swapped in atomically, and the recording's sidecar is updated so
+the catalog picks up the new size and path.
+"""
+
+import os
+import json
+import queue
+import shutil
+import signal
+import threading
+import subprocess
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+ARCHIVE_PROFILES = {
+    "h264": ["-c:v", "libx264", "-preset", "slow", "-crf", "28", "-pix_fmt", "yuv420p"],
+    "hevc": ["-c:v", "libx265", "-preset", "medium", "-crf", "30", "-tag:v", "hvc1", "-pix_fmt", "yuv420p"],
+}
+DURATION_TOLERANCE_SECONDS = 2.0
+
+
+class TranscodeError(Exception):
+    """Raised when a recording cannot be transcoded or the output fails verification."""
+
+
+def probe_duration(path: str) -> float:
+    cmd = [shutil.which("ffprobe") or "ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "json", path]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise TranscodeError(f"ffprobe failed for {path}: {result.stderr.strip()}")
+    return float((json.loads(result.stdout or "{}").get("format") or {}).get("duration") or 0.0)
+
+
+def _lower_priority() -> None:
+    # Runs in the child between fork and exec
+    try:
+        os.nice(19)
+    except OSError:
+        pass
+
+
+def archive_command(src: str, dest: str, profile: str = "h264") -> list:
+    cmd = []
+    ionice = shutil.which("ionice")
+    if ionice:
+        cmd += [ionice, "-c", "3"]
+    cmd += [
+        shutil.which("ffmpeg") or "ffmpeg", "-nostdin", "-y", "-v", "error",
+        "-i", src,
+        *ARCHIVE_PROFILES[profile],
+        # Speech audio is already compact; copy it rather than re-encode
+        "-c:a", "copy",
+        "-movflags", "+faststart",
+        "-f", "mp4", dest,
+    ]
+    return cmd
+
+
+def update_sidecar(recording_path: str, fields: Dict[str, Any]) -> None:
+    sidecar = os.path.splitext(recording_path)[0] + ".json"
+    try:
+        with open(sidecar) as f:
+            metadata = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        metadata = {}
+    metadata.update(fields)
+    tmp = sidecar + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp, sidecar)
+
+
+def is_archived(recording_path: str) -> bool:
+    try:
+        with open(os.path.splitext(recording_path)[0] + ".json") as f:
+            return bool(json.load(f).get("archived_at"))
+    except (OSError, json.JSONDecodeError):
+        return False
+
+
+class ArchiveTranscoder:
+    """Low-priority worker pool that re-encodes finished recordings."""
+
+    def __init__(
+        self,
+        profile: str = "h264",
+        max_workers: int = 1,
+        is_busy: Optional[Callable[[], bool]] = None,
+        poll_interval: float = 2.0,
+        max_backoff: float = 60.0,
+        on_archived: Optional[Callable[[str, str], None]] = None,
+    ):
+        if profile not in ARCHIVE_PROFILES:
+            raise ValueError(f"Unknown archive profile: {profile}")
+        self.profile = profile
+        self.max_workers = max_workers
+        self.is_busy = is_busy or (lambda: False)
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.on_archived = on_archived
+
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+        self._procs: Dict[int, subprocess.Popen] = {}
+
+    def start(self) -> "ArchiveTranscoder":
+        for i in range(self.max_workers):
+            thread = threading.Thread(target=self._worker, name=f"archive-transcode-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        """Abort running jobs (originals are left untouched) and stop the workers."""
+        self._stop.set()
+        for proc in list(self._procs.values()):
+            try:
+                proc.send_signal(signal.SIGCONT)
+                proc.kill()
+            except OSError:
+                pass
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+    def submit(self, recording_path: str) -> bool:
+        """Queue a finished recording; returns False if it is already queued or archived."""
+        path = os.path.abspath(recording_path)
+        if is_archived(path):
+            return False
+        with self._pending_lock:
+            if path in self._pending:
+                return False
+            self._pending.add(path)
+        self._queue.put(path)
+        return True
+
+    def _wait_until_idle(self) -> bool:
+        """Back off (exponentially, capped) while live recordings run; False if stopping."""
+        delay = self.poll_interval
+        while self.is_busy():
+            if self._stop.wait(delay):
+                return False
+            delay = min(delay * 2, self.max_backoff)
+        return not self._stop.is_set()
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            path = self._queue.get()
+            if path is None:
+                return
+            try:
+                if self._wait_until_idle():
+                    self.transcode(path)
+            except Exception as exc:
+                print(f"❌ Archive transcode failed for {path}: {exc}")
+            finally:
+                with self._pending_lock:
+                    self._pending.discard(path)
+
+    def _run(self, cmd: list) -> None:
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, preexec_fn=_lower_priority)
+        ident = threading.get_ident()
+        self._procs[ident] = proc
+        paused = False
+        try:
+            while proc.poll() is None:
+                busy = self.is_busy()
+                if busy and not paused:
+                    proc.send_signal(signal.SIGSTOP)
+                    paused = True
+                    print("⏸️ Live recording running; archive transcode paused")
+                elif not busy and paused:
+                    proc.send_signal(signal.SIGCONT)
+                    paused = False
+                    print("▶️ Archive transcode resumed")
+                if self._stop.wait(self.poll_interval):
+                    raise TranscodeError("Transcoder stopping")
+            stderr = proc.stderr.read().decode(errors="replace")
+            if proc.returncode != 0:
+                raise TranscodeError(f"ffmpeg exited with {proc.returncode}: {stderr.strip()}")
+        finally:
+            if proc.poll() is None:
+                proc.send_signal(signal.SIGCONT)
+                proc.kill()
+                proc.wait()
+            proc.stderr.close()
+            self._procs.pop(ident, None)
+
+    def transcode(self, recording_path: str) -> Dict[str, Any]:
+        """Re-encode one recording to ``<stem>.mp4`` and swap it in atomically."""
+        stem = os.path.splitext(recording_path)[0]
+        final_path = stem + ".mp4"
+        tmp_path = stem + ".archive.part"
+        original_size = os.path.getsize(recording_path)
+        print(f"🗜️ Archiving {recording_path} ({self.profile})")
+
+        try:
+            self._run(archive_command(recording_path, tmp_path, self.profile))
+            source_duration = probe_duration(recording_path)
+            output_duration = probe_duration(tmp_path)
+            if abs(source_duration - output_duration) > DURATION_TOLERANCE_SECONDS:
+                raise TranscodeError(
+                    f"Duration mismatch after transcode: {source_duration:.1f}s -> {output_duration:.1f}s"
+                )
+            archived_size = os.path.getsize(tmp_path)
+            if archived_size >= original_size:
+                # Nothing gained; keep the original
+                os.remove(tmp_path)
+                result = {"archived_at": datetime.now().isoformat(), "archive_profile": self.profile, "archive_skipped": "not smaller"}
+                update_sidecar(recording_path, result)
+                return result
+
+            os.replace(tmp_path, final_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if final_path != recording_path:
+            os.remove(recording_path)
+        result = {
+            "archived_at": datetime.now().isoformat(),
+            "archive_profile": self.profile,
+            "original_size": original_size,
+            "archived_size": archived_size,
+            "output_path": final_path,
+        }
+        update_sidecar(final_path, result)
+        print(f"✅ Archived {final_path}: {original_size / 1e6:.1f} MB -> {archived_size / 1e6:.1f} MB")
+        if self.on_archived:
+            self.on_archived(recording_path, final_path)
+        return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Re-encode finished recordings to the archival profile")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--profile", default="h264", choices=sorted(ARCHIVE_PROFILES))
+    args = parser.parse_args()
+
+    transcoder = ArchiveTranscoder(profile=args.profile)
+    for path in args.paths:
+        if is_archived(path):
+            print(f"⏭️ Already archived: {path}")
+            continue
+        transcoder.transcode(path)
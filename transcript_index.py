@@ -0,0 +1,452 @@
+# transcript_index.py
+"""
+Full-text search across meeting transcripts.
+
+Transcripts are indexed into a BM25 inverted index with positional postings.
+The index is a set of immutable index segments, each holding a lexicon plus
+flat int32/int64 arrays that are memory-mapped at query time, so opening
+thousands of meetings costs page-cache reads rather than Python objects. Every
+finalized transcript is committed as a small new segment (incremental, no
+rebuild). Segments are merged in tiers: once MERGE_FACTOR segments of a similar
+size exist they are merged into one of the next size up, so each document is
+rewritten O(log n) times and an add never rewrites the whole index. Search hits
+point back into the recording in milliseconds.
+
+Segment layout (one directory per segment):
+
+    meta.json      docs + lexicon {term: [postings_offset, doc_freq]}
+    postings.i32   (doc, term_freq, positions_offset) triples
+    positions.i32  token positions within each document
+    seg_tokens.i32 first token position of every transcript segment
+    seg_times.i64  (start_ms, end_ms) of every transcript segment
+"""
+
+import os
+import re
+import json
+import math
+import shutil
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+MANIFEST_NAME = "manifest.json"
+MAX_SEGMENTS = 16
+# Segments whose live token counts share a power of this factor form one merge tier
+MERGE_FACTOR = 4
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _load_array(path: str, dtype: str) -> np.ndarray:
+    # np.memmap refuses empty files
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+class IndexSegment:
+    """A read-only, memory-mapped slice of the index."""
+
+    def __init__(self, path: str):
+        self.name = os.path.basename(path)
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.docs: List[Dict[str, Any]] = meta["docs"]
+        self.terms: Dict[str, List[int]] = meta["terms"]
+        self.postings = _load_array(os.path.join(path, "postings.i32"), "<i4").reshape(-1, 3)
+        self.positions = _load_array(os.path.join(path, "positions.i32"), "<i4")
+        self.seg_tokens = _load_array(os.path.join(path, "seg_tokens.i32"), "<i4")
+        self.seg_times = _load_array(os.path.join(path, "seg_times.i64"), "<i8").reshape(-1, 2)
+
+    def postings_for(self, term: str) -> np.ndarray:
+        entry = self.terms.get(term)
+        if entry is None:
+            return self.postings[:0]
+        offset, df = entry
+        return self.postings[offset:offset + df]
+
+    def term_positions(self, term: str) -> Dict[int, np.ndarray]:
+        """{local_doc: positions} for one term."""
+        rows = self.postings_for(term)
+        out = {}
+        for doc, tf, offset in rows:
+            out[int(doc)] = self.positions[int(offset):int(offset) + int(tf)]
+        return out
+
+    def segment_at(self, doc: int, position: int) -> int:
+        """Index (into seg_times) of the transcript segment containing a token position."""
+        info = self.docs[doc]
+        starts = self.seg_tokens[info["seg_offset"]:info["seg_offset"] + info["seg_count"]]
+        local = int(np.searchsorted(starts, position, side="right")) - 1
+        return info["seg_offset"] + max(local, 0)
+
+
+def _write_segment(path: str, docs: List[Dict[str, Any]], doc_tokens: List[Tuple[List[str], List[int], List[Tuple[int, int]]]]) -> None:
+    """Write one segment from ``(tokens, segment_token_starts, segment_times_ms)`` per doc."""
+    tmp = path + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    inverted: Dict[str, Dict[int, List[int]]] = defaultdict(dict)
+    seg_tokens: List[int] = []
+    seg_times: List[Tuple[int, int]] = []
+    for doc_id, (tokens, starts, times) in enumerate(doc_tokens):
+        for position, token in enumerate(tokens):
+            inverted[token].setdefault(doc_id, []).append(position)
+        docs[doc_id]["length"] = len(tokens)
+        docs[doc_id]["seg_offset"] = len(seg_tokens)
+        docs[doc_id]["seg_count"] = len(starts)
+        seg_tokens.extend(starts)
+        seg_times.extend(times)
+
+    terms: Dict[str, List[int]] = {}
+    postings: List[Tuple[int, int, int]] = []
+    positions: List[int] = []
+    for term in sorted(inverted):
+        by_doc = inverted[term]
+        terms[term] = [len(postings), len(by_doc)]
+        for doc_id in sorted(by_doc):
+            plist = by_doc[doc_id]
+            postings.append((doc_id, len(plist), len(positions)))
+            positions.extend(plist)
+
+    np.asarray(postings, dtype="<i4").reshape(-1, 3).tofile(os.path.join(tmp, "postings.i32"))
+    np.asarray(positions, dtype="<i4").tofile(os.path.join(tmp, "positions.i32"))
+    np.asarray(seg_tokens, dtype="<i4").tofile(os.path.join(tmp, "seg_tokens.i32"))
+    np.asarray(seg_times, dtype="<i8").reshape(-1, 2).tofile(os.path.join(tmp, "seg_times.i64"))
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump({"docs": docs, "terms": terms}, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _tokens_from_transcript(transcript: Dict[str, Any]) -> Tuple[List[str], List[int], List[Tuple[int, int]]]:
+    tokens: List[str] = []
+    starts: List[int] = []
+    times: List[Tuple[int, int]] = []
+    for segment in transcript.get("segments") or []:
+        words = tokenize(str(segment.get("text", "")))
+        if not words:
+            continue
+        starts.append(len(tokens))
+        times.append((int(round(float(segment["start"]) * 1000)), int(round(float(segment["end"]) * 1000))))
+        tokens.extend(words)
+    return tokens, starts, times
+
+
+class TranscriptIndex:
+    """BM25 search over all indexed transcripts; safe to search while adding."""
+
+    def __init__(self, root: str, max_segments: int = MAX_SEGMENTS):
+        self.root = root
+        self.max_segments = max_segments
+        self._lock = threading.RLock()
+        self._manifest = self._read_manifest()
+        self._segments: Dict[str, IndexSegment] = {
+            name: IndexSegment(os.path.join(root, name)) for name in self._manifest["segments"]
+        }
+
+    # -- manifest -----------------------------------------------------------
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.root, MANIFEST_NAME)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"segments": [], "deleted": {}, "next": 1}
+
+    def _write_manifest(self) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, MANIFEST_NAME)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp, path)
+
+    def _snapshot(self) -> Tuple[List[IndexSegment], Dict[str, set]]:
+        with self._lock:
+            segments = [self._segments[name] for name in self._manifest["segments"]]
+            deleted = {name: set(docs) for name, docs in self._manifest["deleted"].items()}
+        return segments, deleted
+
+    def _live_docs(self, snapshot=None):
+        segments, deleted = snapshot or self._snapshot()
+        for segment in segments:
+            dead = deleted.get(segment.name, set())
+            for local, doc in enumerate(segment.docs):
+                if local not in dead:
+                    yield segment, local, doc
+
+    # -- writing ------------------------------------------------------------
+
+    def add_many(self, items: Iterable[Tuple[str, Dict[str, Any], Dict[str, Any]]]) -> int:
+        """Index ``(key, transcript, info)`` triples as one new segment; re-adding a key replaces it."""
+        docs: List[Dict[str, Any]] = []
+        doc_tokens = []
+        for key, transcript, info in items:
+            docs.append({"key": key, **(info or {})})
+            doc_tokens.append(_tokens_from_transcript(transcript))
+        if not docs:
+            return 0
+
+        with self._lock:
+            name = f"seg_{self._manifest['next']:06d}"
+            self._manifest["next"] += 1
+            _write_segment(os.path.join(self.root, name), docs, doc_tokens)
+            keys = {doc["key"] for doc in docs}
+            self._delete_keys(keys)
+            self._segments[name] = IndexSegment(os.path.join(self.root, name))
+            self._manifest["segments"].append(name)
+            self._write_manifest()
+            names = self._merge_candidates()
+            while names:
+                self.merge(names)
+                names = self._merge_candidates()
+        return len(docs)
+
+    def add(self, key: str, transcript: Dict[str, Any], info: Optional[Dict[str, Any]] = None) -> None:
+        self.add_many([(key, transcript, info or {})])
+
+    def add_transcript_file(self, path: str, info: Optional[Dict[str, Any]] = None) -> None:
+        with open(path) as f:
+            transcript = json.load(f)
+        self.add(os.path.abspath(path), transcript, {"source": os.path.abspath(path), **(info or {})})
+
+    def _delete_keys(self, keys: set) -> None:
+        # Called with the lock held
+        for name in self._manifest["segments"]:
+            segment = self._segments[name]
+            dead = set(self._manifest["deleted"].get(name, []))
+            for local, doc in enumerate(segment.docs):
+                if doc["key"] in keys:
+                    dead.add(local)
+            if dead:
+                self._manifest["deleted"][name] = sorted(dead)
+
+    def _live_tokens(self, name: str) -> int:
+        dead = set(self._manifest["deleted"].get(name, []))
+        return sum(doc["length"] for local, doc in enumerate(self._segments[name].docs) if local not in dead)
+
+    def _merge_candidates(self) -> Optional[List[str]]:
+        """Segments to merge next, or None (called with the lock held).
+
+        The smallest tier holding MERGE_FACTOR segments is merged first. Past ``max_segments``
+        the smallest segments are merged regardless of tier, which is cheap because they are small.
+        """
+        names = list(self._manifest["segments"])
+        sizes = {name: self._live_tokens(name) for name in names}
+        tiers: Dict[int, List[str]] = defaultdict(list)
+        for name in names:
+            tiers[int(math.log(max(sizes[name], 1), MERGE_FACTOR))].append(name)
+        for tier in sorted(tiers):
+            if len(tiers[tier]) >= MERGE_FACTOR:
+                return tiers[tier][:MERGE_FACTOR]
+        if len(names) > self.max_segments:
+            return sorted(names, key=lambda name: sizes[name])[:len(names) - self.max_segments + 1]
+        return None
+
+    def merge(self, names: Optional[List[str]] = None) -> None:
+        """Rewrite the live documents of ``names`` (default: every segment) into one new segment."""
+        with self._lock:
+            old = [name for name in self._manifest["segments"] if names is None or name in names]
+            if not old:
+                return
+            deleted = {name: set(docs) for name, docs in self._manifest["deleted"].items()}
+            segments = [self._segments[name] for name in old]
+            docs: List[Dict[str, Any]] = []
+            doc_tokens = []
+            for segment in segments:
+                dead = deleted.get(segment.name, set())
+                for local, rebuilt in sorted(self._reconstruct(segment, dead).items()):
+                    doc = segment.docs[local]
+                    docs.append({k: v for k, v in doc.items() if k not in ("length", "seg_offset", "seg_count")})
+                    doc_tokens.append(rebuilt)
+
+            name = f"seg_{self._manifest['next']:06d}"
+            self._manifest["next"] += 1
+            _write_segment(os.path.join(self.root, name), docs, doc_tokens)
+            self._segments[name] = IndexSegment(os.path.join(self.root, name))
+            self._manifest["segments"] = [s for s in self._manifest["segments"] if s not in old] + [name]
+            for stale in old:
+                self._manifest["deleted"].pop(stale, None)
+            self._write_manifest()
+
+            for stale in old:
+                self._segments.pop(stale, None)
+                shutil.rmtree(os.path.join(self.root, stale), ignore_errors=True)
+
+    @staticmethod
+    def _reconstruct(segment: IndexSegment, dead: set) -> Dict[int, Tuple[List[str], List[int], List[Tuple[int, int]]]]:
+        """Token streams of every live document in a segment, from one pass over its postings."""
+        tokens = {
+            local: [""] * doc["length"]
+            for local, doc in enumerate(segment.docs)
+            if local not in dead
+        }
+        for term, (offset, df) in segment.terms.items():
+            for doc, tf, pos_offset in segment.postings[offset:offset + df]:
+                stream = tokens.get(int(doc))
+                if stream is None:
+                    continue
+                for position in segment.positions[int(pos_offset):int(pos_offset) + int(tf)]:
+                    stream[int(position)] = term
+
+        rebuilt = {}
+        for local, stream in tokens.items():
+            doc = segment.docs[local]
+            start, count = doc["seg_offset"], doc["seg_count"]
+            starts = [int(x) for x in segment.seg_tokens[start:start + count]]
+            times = [(int(a), int(b)) for a, b in segment.seg_times[start:start + count]]
+            rebuilt[local] = (stream, starts, times)
+        return rebuilt
+
+    # -- searching ----------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        live = list(self._live_docs())
+        return {
+            "documents": len(live),
+            "segments": len(self._manifest["segments"]),
+            "tokens": sum(doc["length"] for _, _, doc in live),
+        }
+
+    def search(self, query: str, limit: int = 20, matches_per_doc: int = 3) -> Dict[str, Any]:
+        """BM25-ranked meetings for ``query``; a quoted query must match as an exact phrase."""
+        phrase = len(query) >= 2 and query[0] == query[-1] == '"'
+        terms = tokenize(query)
+        if not terms:
+            return {"query": query, "total": 0, "hits": []}
+        unique_terms = list(dict.fromkeys(terms))
+
+        segments, deleted = self._snapshot()
+        live = list(self._live_docs((segments, deleted)))
+        n_docs = len(live)
+        if n_docs == 0:
+            return {"query": query, "total": 0, "hits": []}
+        avgdl = sum(d["length"] for _, _, d in live) / n_docs
+
+        df = {term: 0 for term in unique_terms}
+        per_segment = []
+        for segment in segments:
+            dead = deleted.get(segment.name, set())
+            term_pos = {}
+            for term in unique_terms:
+                found = {doc: pos for doc, pos in segment.term_positions(term).items() if doc not in dead}
+                df[term] += len(found)
+                term_pos[term] = found
+            per_segment.append((segment, term_pos))
+
+        idf = {t: math.log(1 + (n_docs - df[t] + 0.5) / (df[t] + 0.5)) for t in unique_terms}
+
+        scored = []
+        for segment, term_pos in per_segment:
+            candidates = set()
+            for found in term_pos.values():
+                candidates.update(found)
+            for doc in candidates:
+                if phrase:
+                    hit_positions = self._phrase_positions(terms, term_pos, doc)
+                    if hit_positions.size == 0:
+                        continue
+                else:
+                    hit_positions = np.concatenate([term_pos[t][doc] for t in unique_terms if doc in term_pos[t]])
+                length = segment.docs[doc]["length"]
+                score = 0.0
+                for term in unique_terms:
+                    positions = term_pos[term].get(doc)
+                    if positions is None:
+                        continue
+                    tf = len(positions)
+                    score += idf[term] * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avgdl))
+                scored.append((score, segment, doc, hit_positions))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        hits = [self._hit(segment, doc, score, positions, matches_per_doc) for score, segment, doc, positions in scored[:limit]]
+        return {"query": query, "total": len(scored), "hits": hits}
+
+    @staticmethod
+    def _phrase_positions(terms: List[str], term_pos: Dict[str, Dict[int, np.ndarray]], doc: int) -> np.ndarray:
+        """Start positions where ``terms`` occur consecutively in ``doc``."""
+        if any(doc not in term_pos[t] for t in terms):
+            return np.zeros(0, dtype=np.int64)
+        starts = np.asarray(term_pos[terms[0]][doc], dtype=np.int64)
+        for offset, term in enumerate(terms[1:], start=1):
+            starts = starts[np.isin(starts + offset, term_pos[term][doc])]
+            if starts.size == 0:
+                break
+        return starts
+
+    @staticmethod
+    def _hit(segment: IndexSegment, doc: int, score: float, positions: np.ndarray, limit: int) -> Dict[str, Any]:
+        info = segment.docs[doc]
+        counts: Dict[int, int] = defaultdict(int)
+        for position in positions:
+            counts[segment.segment_at(doc, int(position))] += 1
+        best = sorted(counts, key=lambda s: (-counts[s], s))[:limit]
+        matches = [
+            {"start_ms": int(segment.seg_times[s, 0]), "end_ms": int(segment.seg_times[s, 1]), "hits": counts[s]}
+            for s in sorted(best)
+        ]
+        result = {k: v for k, v in info.items() if k not in ("length", "seg_offset", "seg_count")}
+        result.update({"score": round(score, 4), "matches": matches})
+        return result
+
+
+def attach_snippets(hit: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in text/speaker for a hit's matches from its source transcript, if still on disk."""
+    source = hit.get("source")
+    if not source:
+        return hit
+    try:
+        with open(source) as f:
+            segments = json.load(f).get("segments") or []
+    except (OSError, json.JSONDecodeError):
+        return hit
+    by_start = {int(round(float(s["start"]) * 1000)): s for s in segments}
+    for match in hit["matches"]:
+        segment = by_start.get(match["start_ms"])
+        if segment:
+            match["text"] = segment.get("text", "")
+            if segment.get("speaker"):
+                match["speaker"] = segment["speaker"]
+    return hit
+
+
+def index_directory(index: TranscriptIndex, root: str, suffixes=(".captions.json", ".transcript.json")) -> int:
+    """Backfill: index every transcript under ``root`` in one segment."""
+    items = []
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if filename.endswith(suffixes):
+                path = os.path.abspath(os.path.join(dirpath, filename))
+                try:
+                    with open(path) as f:
+                        items.append((path, json.load(f), {"source": path}))
+                except (OSError, json.JSONDecodeError) as exc:
+                    print(f"⚠️ Skipping unreadable transcript {path}: {exc}")
+    return index.add_many(items)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or query the transcript search index")
+    parser.add_argument("index_dir")
+    parser.add_argument("--add", metavar="DIR", help="index every transcript under DIR")
+    parser.add_argument("--search", metavar="QUERY")
+    args = parser.parse_args()
+
+    idx = TranscriptIndex(args.index_dir)
+    if args.add:
+        print(f"📚 Indexed {index_directory(idx, args.add)} transcript(s)")
+    if args.search:
+        print(json.dumps(idx.search(args.search), indent=2))
+    print(json.dumps(idx.stats()))
@@ -0,0 +1,385 @@
+# transcription.py
+"""
+Parallel chunked transcription.
+
+A meeting's 16 kHz mono speech audio is cut into overlapping chunks at the
+quietest points near a target length, the chunks are transcribed in parallel
+by a pluggable engine, and the results are merged into one timestamped
+transcript. Each chunk's result is cached under a hash of its audio, so a
+re-run or a retry after a partial failure only transcribes the chunks that
+are still missing.
+"""
+
+import os
+import json
+import wave
+import hashlib
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.02
+
+
+class TranscriptionError(Exception):
+    """Raised when one or more chunks could not be transcribed."""
+
+    def __init__(self, message: str, failed_chunks: List[int]):
+        super().__init__(message)
+        self.failed_chunks = failed_chunks
+
+
+class AudioChunk:
+    def __init__(self, index: int, start: int, end: int, keep_start: int, keep_end: int):
+        self.index = index
+        # Sample range transcribed, including overlap with neighbouring chunks
+        self.start = start
+        self.end = end
+        # Sample range this chunk is authoritative for when merging
+        self.keep_start = keep_start
+        self.keep_end = keep_end
+
+
+def load_wav(path: str) -> np.ndarray:
+    """Read a 16-bit PCM WAV into a mono int16 array (channels are averaged)."""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"Expected 16-bit PCM WAV, got {wav.getsampwidth() * 8}-bit")
+        if wav.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"Expected {SAMPLE_RATE} Hz audio, got {wav.getframerate()} Hz")
+        channels = wav.getnchannels()
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples
+
+
+def frame_energy(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    """Mean-square energy per non-overlapping frame."""
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float64)
+    frames = samples[:n_frames * frame_len].astype(np.float32).reshape(n_frames, frame_len)
+    return np.einsum("ij,ij->i", frames, frames) / frame_len
+
+
+def split_on_silence(
+    samples: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    target_seconds: float = 30.0,
+    max_seconds: float = 45.0,
+    overlap_seconds: float = 1.0,
+) -> List[AudioChunk]:
+    """Cut audio into overlapping chunks, placing each cut at the quietest frame
+    between the target and maximum chunk length."""
+    total = len(samples)
+    frame_len = int(sample_rate * FRAME_SECONDS)
+    energy = frame_energy(samples, frame_len)
+    target = int(target_seconds * sample_rate)
+    longest = int(max_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+
+    cuts = []
+    position = 0
+    while total - position > longest:
+        lo = (position + target) // frame_len
+        hi = min((position + longest) // frame_len, len(energy))
+        if hi <= lo:
+            cut = position + longest
+        else:
+            cut = (lo + int(np.argmin(energy[lo:hi]))) * frame_len + frame_len // 2
+        cuts.append(cut)
+        position = cut
+
+    bounds = [0] + cuts + [total]
+    chunks = []
+    for index in range(len(bounds) - 1):
+        keep_start, keep_end = bounds[index], bounds[index + 1]
+        start = max(0, keep_start - overlap)
+        end = min(total, keep_end + overlap)
+        chunks.append(AudioChunk(index, start, end, keep_start, keep_end))
+    return chunks
+
+
+class TranscriptionEngine:
+    """Interface for speech recognizers. Engines must be picklable for process pools."""
+
+    name = "base"
+
+    def cache_key(self) -> str:
+        """Identifies the engine configuration; part of every chunk's cache key."""
+        return self.name
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int) -> List[Dict[str, Any]]:
+        """Return segments ``{"start", "end", "text", "confidence"}`` with times in
+        seconds relative to the start of ``samples``."""
+        raise NotImplementedError
+
+
+class LocalStubEngine(TranscriptionEngine):
+    """Deterministic stand-in for tests: one segment per loud region, text derived
+    from a hash of that region's audio."""
+
+    name = "local-stub"
+
+    def __init__(self, threshold_db: float = -40.0, min_gap_seconds: float = 0.3):
+        self.threshold_db = threshold_db
+        self.min_gap_seconds = min_gap_seconds
+
+    def cache_key(self) -> str:
+        return f"{self.name}:{self.threshold_db}:{self.min_gap_seconds}"
+
+    def transcribe(self, samples, sample_rate):
+        frame_len = int(sample_rate * FRAME_SECONDS)
+        energy = frame_energy(samples, frame_len)
+        if energy.size == 0:
+            return []
+        threshold = (32768.0 ** 2) * 10 ** (self.threshold_db / 10)
+        loud = energy > threshold
+
+        segments = []
+        gap_frames = int(self.min_gap_seconds / FRAME_SECONDS)
+        idx = np.flatnonzero(loud)
+        if idx.size == 0:
+            return []
+        breaks = np.flatnonzero(np.diff(idx) > gap_frames)
+        starts = np.concatenate(([idx[0]], idx[breaks + 1]))
+        ends = np.concatenate((idx[breaks], [idx[-1]])) + 1
+        for start, end in zip(starts, ends):
+            region = samples[start * frame_len:end * frame_len]
+            digest = hashlib.sha1(region.tobytes()).hexdigest()[:8]
+            segments.append({
+                "start": round(float(start) * FRAME_SECONDS, 3),
+                "end": round(float(end) * FRAME_SECONDS, 3),
+                "text": f"utterance {digest}",
+                "confidence": 1.0,
+            })
+        return segments
+
+
+class GoogleSpeechEngine(TranscriptionEngine):
+    """Google Cloud Speech-to-Text using synchronous recognize per chunk (<= 60 s)."""
+
+    name = "google-speech"
+
+    def __init__(self, credentials_file: str = "credentials.json", language_code: str = "en-US", model: Optional[str] = None):
+        self.credentials_file = credentials_file
+        self.language_code = language_code
+        self.model = model
+        self._client = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_client"] = None  # clients are per-process
+        return state
+
+    def cache_key(self) -> str:
+        return f"{self.name}:{self.language_code}:{self.model}"
+
+    def transcribe(self, samples, sample_rate):
+        from google.cloud import speech  # imported lazily; only needed for this engine
+
+        if self._client is None:
+            self._client = speech.SpeechClient.from_service_account_json(self.credentials_file)
+
+        config = speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=sample_rate,
+            language_code=self.language_code,
+            enable_word_time_offsets=True,
+            enable_automatic_punctuation=True,
+            **({"model": self.model} if self.model else {}),
+        )
+        audio = speech.RecognitionAudio(content=samples.astype("<i2").tobytes())
+        response = self._client.recognize(config=config, audio=audio)
+
+        segments = []
+        for result in response.results:
+            alternative = result.alternatives[0]
+            words = list(alternative.words)
+            start = words[0].start_time.total_seconds() if words else 0.0
+            end = words[-1].end_time.total_seconds() if words else len(samples) / sample_rate
+            segments.append({
+                "start": start,
+                "end": end,
+                "text": alternative.transcript.strip(),
+                "confidence": alternative.confidence,
+            })
+        return segments
+
+
+class TranscriptCache:
+    """One JSON file per chunk result, keyed by audio + engine hash."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, segments: List[Dict[str, Any]]) -> None:
+        tmp = self._path(key) + f".{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(segments, f)
+        os.replace(tmp, self._path(key))
+
+
+def chunk_hash(samples: np.ndarray, sample_rate: int, engine: TranscriptionEngine) -> str:
+    digest = hashlib.sha256()
+    digest.update(engine.cache_key().encode())
+    digest.update(str(sample_rate).encode())
+    digest.update(np.ascontiguousarray(samples, dtype="<i2").tobytes())
+    return digest.hexdigest()
+
+
+def _transcribe_chunk(engine: TranscriptionEngine, samples: np.ndarray, sample_rate: int) -> List[Dict[str, Any]]:
+    return engine.transcribe(samples, sample_rate)
+
+
+def merge_chunk_segments(
+    chunks: List[AudioChunk],
+    results: Dict[int, List[Dict[str, Any]]],
+    sample_rate: int,
+) -> List[Dict[str, Any]]:
+    """Shift chunk-relative segments to absolute time and drop overlap duplicates:
+    a segment is kept only by the chunk whose authoritative range holds its midpoint."""
+    merged = []
+    for chunk in chunks:
+        offset = chunk.start / sample_rate
+        keep_start = chunk.keep_start / sample_rate
+        keep_end = chunk.keep_end / sample_rate
+        for segment in results.get(chunk.index, []):
+            start = segment["start"] + offset
+            end = segment["end"] + offset
+            midpoint = (start + end) / 2
+            if not (keep_start <= midpoint < keep_end):
+                continue
+            merged.append({**segment, "start": round(start, 3), "end": round(end, 3), "chunk": chunk.index})
+    merged.sort(key=lambda s: s["start"])
+    return merged
+
+
+class ChunkedTranscriber:
+    """Splits audio, transcribes chunks in a pool, and merges a timestamped transcript."""
+
+    def __init__(
+        self,
+        engine: TranscriptionEngine,
+        cache: Optional[TranscriptCache] = None,
+        max_workers: int = 4,
+        use_processes: bool = False,
+        target_seconds: float = 30.0,
+        max_seconds: float = 45.0,
+        overlap_seconds: float = 1.0,
+    ):
+        self.engine = engine
+        self.cache = cache
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.target_seconds = target_seconds
+        self.max_seconds = max_seconds
+        self.overlap_seconds = overlap_seconds
+
+    def _executor(self) -> Executor:
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="transcribe")
+
+    def transcribe(self, samples: np.ndarray, sample_rate: int = SAMPLE_RATE, vad=None) -> Dict[str, Any]:
+        """Transcribe ``samples``; with a ``vad.VoiceActivityDetector`` only voiced audio
+        is sent to the engine and timestamps are mapped back to the original recording."""
+        duration = len(samples) / sample_rate
+        time_map = None
+        if vad is not None:
+            samples, time_map = vad.extract(samples)
+
+        # No audio (or no speech once the VAD is done) means no chunks; an empty chunk
+        # would still be hashed and sent to the engine
+        chunks = split_on_silence(
+            samples, sample_rate,
+            target_seconds=self.target_seconds,
+            max_seconds=self.max_seconds,
+            overlap_seconds=self.overlap_seconds,
+        ) if len(samples) else []
+
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        keys: Dict[int, str] = {}
+        pending: List[AudioChunk] = []
+        for chunk in chunks:
+            key = chunk_hash(samples[chunk.start:chunk.end], sample_rate, self.engine)
+            keys[chunk.index] = key
+            cached = self.cache.get(key) if self.cache else None
+            if cached is not None:
+                results[chunk.index] = cached
+            else:
+                pending.append(chunk)
+
+        failed: List[int] = []
+        errors: List[str] = []
+        if pending:
+            with self._executor() as pool:
+                futures = {
+                    pool.submit(_transcribe_chunk, self.engine, samples[c.start:c.end], sample_rate): c
+                    for c in pending
+                }
+                for future in as_completed(futures):
+                    chunk = futures[future]
+                    try:
+                        segments = future.result()
+                    except Exception as exc:
+                        failed.append(chunk.index)
+                        errors.append(f"chunk {chunk.index}: {exc}")
+                        continue
+                    results[chunk.index] = segments
+                    # Cache as each chunk lands so a later retry skips it
+                    if self.cache:
+                        self.cache.put(keys[chunk.index], segments)
+
+        if failed:
+            raise TranscriptionError(
+                f"{len(failed)} of {len(chunks)} chunks failed: " + "; ".join(errors),
+                sorted(failed),
+            )
+
+        segments = merge_chunk_segments(chunks, results, sample_rate)
+        transcript = {
+            "engine": self.engine.name,
+            "sample_rate": sample_rate,
+            "duration": round(duration, 3),
+            "chunks": len(chunks),
+            "transcribed_chunks": len(pending),
+            "segments": segments,
+        }
+        if time_map is not None:
+            if segments:
+                starts = time_map.to_original(np.array([s["start"] for s in segments]))
+                ends = time_map.to_original(np.array([s["end"] for s in segments]))
+                for segment, start, end in zip(segments, starts, ends):
+                    segment["start"] = round(float(start), 3)
+                    segment["end"] = round(float(end), 3)
+            transcript["voiced_duration"] = round(time_map.voiced_samples / sample_rate, 3)
+            transcript["time_map"] = time_map.to_list()
+        return transcript
+
+    def transcribe_recording(self, path: str, vad=None) -> Dict[str, Any]:
+        """Decode a recording's audio in memory (no intermediate WAV) and transcribe it."""
+        from audio_extract import read_pcm
+
+        return self.transcribe(read_pcm(path, SAMPLE_RATE, channels=1), SAMPLE_RATE, vad=vad)
+
+
+def write_transcript(transcript: Dict[str, Any], path: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(transcript, f, indent=2)
+    os.replace(tmp, path)
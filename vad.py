@@ -0,0 +1,185 @@
+# vad.py
+"""
+Vectorized voice-activity detection for 16 kHz PCM.
+
+Per-frame energy and zero-crossing rate decide which frames carry speech.
+Both come from running sums over the samples, read off at the frame edges, so
+overlapping frames cost nothing extra and no (frames x samples) matrix is ever
+built; the running sums are taken one block at a time, which keeps memory flat
+for hour-long recordings. The voiced stretches are concatenated for
+transcription and a ``TimeMap`` translates times in that voiced-only audio
+back to the original recording.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+# Samples per block when accumulating the running sums
+FEATURE_BLOCK = 1 << 18
+
+
+def _running_sums(samples: np.ndarray, positions: np.ndarray, block: int = FEATURE_BLOCK) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum of ``samples[:p] ** 2`` and count of sign changes between ``samples[j]`` and
+    ``samples[j + 1]`` for ``j < p``, at each of the sorted ``positions``."""
+    # Integer audio is summed exactly in int64 (an hour of full-scale int16 stays far below its limit)
+    dtype = np.int64 if np.issubdtype(samples.dtype, np.integer) else np.float64
+    energy = np.zeros(len(positions), dtype=dtype)
+    crossings = np.zeros(len(positions), dtype=np.int64)
+    energy_total, crossings_total = dtype(0), 0
+    n = len(samples)
+    for b0 in range(0, n, block):
+        b1 = min(b0 + block, n)
+        squares = samples[b0:b1].astype(dtype)
+        np.multiply(squares, squares, out=squares)
+        np.cumsum(squares, out=squares)
+        # One sample of lookahead so the change at the block edge is counted
+        signs = np.signbit(samples[b0:min(b1 + 1, n)])
+        changes = np.cumsum(signs[1:] != signs[:-1])
+        if len(changes) < b1 - b0:
+            changes = np.append(changes, changes[-1] if len(changes) else 0)
+
+        lo, hi = np.searchsorted(positions, [b0 + 1, b1 + 1])
+        local = positions[lo:hi] - b0 - 1
+        energy[lo:hi] = energy_total + squares[local]
+        crossings[lo:hi] = crossings_total + changes[local]
+        energy_total += squares[-1]
+        crossings_total += int(changes[-1])
+    return energy, crossings
+
+
+def frame_features(samples: np.ndarray, frame_len: int, hop: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-frame log energy (dBFS) and zero-crossing rate (crossings per sample)."""
+    if len(samples) < frame_len:
+        return np.zeros(0), np.zeros(0)
+    starts = np.arange((len(samples) - frame_len) // hop + 1, dtype=np.int64) * hop
+    ends = starts + frame_len
+
+    positions = np.union1d(np.union1d(starts, ends), ends - 1)
+    energy, crossings = _running_sums(samples, positions)
+    at_start = np.searchsorted(positions, starts)
+    at_end = np.searchsorted(positions, ends)
+    # A frame's neighbour pairs are (j, j + 1) for start <= j < end - 1
+    at_last = np.searchsorted(positions, ends - 1)
+
+    power = (energy[at_end] - energy[at_start]) / frame_len
+    energy_db = 10.0 * np.log10(power / (32768.0 ** 2) + 1e-12)
+    zcr = (crossings[at_last] - crossings[at_start]) / (frame_len - 1)
+    return energy_db, zcr
+
+
+def _runs(mask: np.ndarray) -> np.ndarray:
+    """(start, end) index pairs of consecutive True runs in a boolean array."""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges.reshape(-1, 2)
+
+
+class TimeMap:
+    """Maps positions in concatenated voiced audio back to the original recording."""
+
+    def __init__(self, segments: np.ndarray, sample_rate: int = SAMPLE_RATE):
+        # segments: (n, 2) original sample ranges, in order
+        self.segments = np.asarray(segments, dtype=np.int64).reshape(-1, 2)
+        self.sample_rate = sample_rate
+        lengths = self.segments[:, 1] - self.segments[:, 0]
+        self.voiced_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(lengths) else np.zeros(0, np.int64)
+        self.voiced_samples = int(lengths.sum())
+
+    def to_original(self, seconds):
+        """Convert voiced-audio time(s) in seconds to original-recording time(s)."""
+        t = np.asarray(seconds, dtype=np.float64)
+        if len(self.segments) == 0:
+            return t
+        pos = t * self.sample_rate
+        idx = np.clip(np.searchsorted(self.voiced_starts, pos, side="right") - 1, 0, len(self.segments) - 1)
+        original = self.segments[idx, 0] + (pos - self.voiced_starts[idx])
+        result = original / self.sample_rate
+        return float(result) if result.ndim == 0 else result
+
+    def to_list(self) -> List[dict]:
+        return [
+            {
+                "voiced_start": round(int(v) / self.sample_rate, 3),
+                "original_start": round(int(s) / self.sample_rate, 3),
+                "original_end": round(int(e) / self.sample_rate, 3),
+            }
+            for v, (s, e) in zip(self.voiced_starts, self.segments)
+        ]
+
+
+class VoiceActivityDetector:
+    """Energy + zero-crossing VAD with an adaptive noise floor and hangover smoothing."""
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        frame_ms: float = 30.0,
+        hop_ms: float = 10.0,
+        energy_margin_db: float = 12.0,
+        min_energy_db: float = -55.0,
+        max_threshold_db: float = -35.0,
+        max_zcr: float = 0.35,
+        min_speech_ms: float = 150.0,
+        min_silence_ms: float = 300.0,
+        padding_ms: float = 150.0,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self.hop = int(sample_rate * hop_ms / 1000)
+        self.energy_margin_db = energy_margin_db
+        self.min_energy_db = min_energy_db
+        self.max_threshold_db = max_threshold_db
+        self.max_zcr = max_zcr
+        self.min_speech_frames = max(1, int(min_speech_ms / hop_ms))
+        self.min_silence_frames = max(1, int(min_silence_ms / hop_ms))
+        self.padding = int(sample_rate * padding_ms / 1000)
+
+    def frame_decisions(self, samples: np.ndarray) -> np.ndarray:
+        energy_db, zcr = frame_features(samples, self.frame_len, self.hop)
+        if energy_db.size == 0:
+            return np.zeros(0, dtype=bool)
+
+        noise_floor = np.percentile(energy_db, 10)
+        # The cap keeps speech detectable when a recording is almost all talk and the
+        # 10th percentile is itself speech rather than background noise
+        threshold = min(max(noise_floor + self.energy_margin_db, self.min_energy_db), self.max_threshold_db)
+        loud = energy_db > threshold
+        # Very high ZCR at modest energy is hiss/fricative noise rather than voiced speech
+        noisy = (zcr > self.max_zcr) & (energy_db < threshold + self.energy_margin_db)
+        return loud & ~noisy
+
+    def detect(self, samples: np.ndarray) -> np.ndarray:
+        """Speech segments as an (n, 2) array of original sample ranges."""
+        voiced = self.frame_decisions(samples)
+        if not voiced.any():
+            return np.zeros((0, 2), dtype=np.int64)
+
+        # Close short gaps (hangover), then discard blips that are too short to be speech
+        gaps = _runs(~voiced)
+        short_gaps = gaps[(gaps[:, 1] - gaps[:, 0]) < self.min_silence_frames]
+        interior = short_gaps[(short_gaps[:, 0] > 0) & (short_gaps[:, 1] < len(voiced))]
+        for start, end in interior:
+            voiced[start:end] = True
+        runs = _runs(voiced)
+        runs = runs[(runs[:, 1] - runs[:, 0]) >= self.min_speech_frames]
+        if len(runs) == 0:
+            return np.zeros((0, 2), dtype=np.int64)
+
+        starts = np.maximum(runs[:, 0] * self.hop - self.padding, 0)
+        ends = np.minimum((runs[:, 1] - 1) * self.hop + self.frame_len + self.padding, len(samples))
+
+        # Padding can make neighbours overlap; merge them
+        keep = np.concatenate(([True], starts[1:] > ends[:-1]))
+        merged_starts = starts[keep]
+        merged_ends = np.maximum.reduceat(ends, np.flatnonzero(keep))
+        return np.stack([merged_starts, merged_ends], axis=1).astype(np.int64)
+
+    def extract(self, samples: np.ndarray) -> Tuple[np.ndarray, TimeMap]:
+        """Concatenate voiced audio and return it with its map back to the original."""
+        segments = self.detect(samples)
+        if len(segments) == 0:
+            return samples[:0], TimeMap(segments, self.sample_rate)
+        voiced = np.concatenate([samples[s:e] for s, e in segments])
+        return voiced, TimeMap(segments, self.sample_rate)